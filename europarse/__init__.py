@@ -1,2 +1,11 @@
 # -*- coding: utf-8 -*-
 __version__ = "1.0.0"
+
+
+def __getattr__(name):
+    # infer_format is imported on first use, so that importing europarse.tz
+    # or europarse.zoneinfo doesn't load the parser
+    if name == "infer_format":
+        from .infer import infer_format
+        return infer_format
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+Normalize the date/time stamps of a file from the command line::
+
+    python -m europarse [options] [file ...]
+
+Each line of the files (or of the standard input) is parsed as
+:func:`europarse.parser.parse` would parse it, and written to the standard
+output as an ISO 8601 string, or with ``--epoch``, as the time since the
+Unix epoch. With ``--column``, the files are read as CSV (or, with
+``--delimiter``, TSV and the like), and that column of each row is
+replaced. For instance::
+
+    $ printf '25/09/2003 10:49\\n26/09/2003 08:15\\n' | \\
+    >     python -m europarse --dayfirst --tz Europe/London
+    2003-09-25T10:49:00+01:00
+    2003-09-26T08:15:00+01:00
+
+The input is read and written in chunks, which ``--workers`` spreads over a
+pool of processes, each with its own copy of one configured parser.
+"""
+import argparse
+import collections
+import csv
+import itertools
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from . import parser as _parser
+from . import tz as _tz
+
+# The normalizer of a worker process, set up by _init_worker()
+_worker_normalizer = None
+
+
+def _init_worker(normalizer):
+    global _worker_normalizer
+    _worker_normalizer = normalizer
+
+
+def _normalize_chunk(timestrs):
+    return _worker_normalizer(timestrs)
+
+
+class _normalizer(object):
+    """
+    Turns a chunk of date/time strings into a list of the strings to write
+    for them, with the error in place of a string which can't be parsed.
+    """
+    def __init__(self, parser, default, tzinfo, epoch, kwargs):
+        self.parser = parser
+        self.default = default
+        self.tzinfo = tzinfo
+        self.epoch = epoch
+        self.kwargs = kwargs
+
+    def __call__(self, timestrs):
+        if self.epoch is not None:
+            return self._epochs(timestrs)
+
+        tzinfo = self.tzinfo
+        results = self.parser.parse_many(timestrs, default=self.default,
+                                         errors="return", **self.kwargs)
+        for i, dt in enumerate(results):
+            if dt is None:
+                # A null value
+                results[i] = ""
+            elif not isinstance(dt, Exception):
+                try:
+                    if tzinfo is not None:
+                        if dt.tzinfo is None:
+                            dt = dt.replace(tzinfo=tzinfo)
+                        else:
+                            dt = dt.astimezone(tzinfo)
+                    results[i] = dt.isoformat()
+                except (ValueError, OverflowError) as e:
+                    results[i] = e
+
+        return results
+
+    def _epochs(self, timestrs):
+        parse_epoch = self.parser.parse_epoch
+        results = []
+        for timestr in timestrs:
+            try:
+                ret = parse_epoch(timestr, self.epoch, default=self.default,
+                                  assume_tz=self.tzinfo, **self.kwargs)
+            except (ValueError, OverflowError) as e:
+                results.append(e)
+            else:
+                results.append("" if ret is None else str(ret))
+
+        return results
+
+
+def _arguments():
+    """
+    The command line arguments :func:`main` takes.
+    """
+    arguments = argparse.ArgumentParser(
+        prog="python -m europarse",
+        description="Normalize the date/time stamps of each line of the "
+                    "files, or of a column of their rows, to ISO 8601 or "
+                    "Unix epoch values.")
+    arguments.add_argument("files", nargs="*", metavar="file",
+                           help="files to read, by default the standard "
+                                "input ('-')")
+    arguments.add_argument("--dayfirst", action="store_true",
+                           help="read ambiguous dates such as 01/05/09 day "
+                                "first")
+    arguments.add_argument("--yearfirst", action="store_true",
+                           help="read ambiguous dates such as 01/05/09 year "
+                                "first")
+    arguments.add_argument("--fuzzy", action="store_true",
+                           help="skip the words which aren't part of a date")
+    arguments.add_argument("--tz", metavar="ZONE",
+                           help="the time zone of times without one, and to "
+                                "convert times with one to, such as UTC or "
+                                "Europe/Paris")
+    arguments.add_argument("--epoch", choices=("s", "ms", "us", "ns"),
+                           help="write the time since the Unix epoch in "
+                                "this unit instead of ISO 8601; times "
+                                "without a time zone are taken to be in UTC "
+                                "unless --tz is given")
+    arguments.add_argument("--column", type=int, metavar="N",
+                           help="read the files as CSV, and normalize the "
+                                "Nth column (counting from 0) of each row")
+    arguments.add_argument("--delimiter", default=",",
+                           help="the column delimiter for --column, by "
+                                "default ','; use '\\t' for TSV")
+    arguments.add_argument("--header", action="store_true",
+                           help="copy the first row of each file as it is")
+    arguments.add_argument("--on-error", default="fail",
+                           choices=("skip", "empty", "keep", "fail"),
+                           help="what to do with a value which can't be "
+                                "parsed: leave out its line, write an empty "
+                                "value, write it as it is, or stop with an "
+                                "error (the default)")
+    arguments.add_argument("--workers", type=int, default=0, metavar="N",
+                           help="the number of processes to parse in, by "
+                                "default none besides this one")
+    arguments.add_argument("--chunksize", type=int, default=10000,
+                           metavar="N",
+                           help="the number of lines read, and sent to a "
+                                "worker, at a time (default 10000)")
+    return arguments
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+    """
+    Run the command line tool with the arguments ``argv`` (by default those
+    of the process), returning its exit status.
+    """
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+    stderr = sys.stderr if stderr is None else stderr
+
+    arguments = _arguments()
+    options = arguments.parse_args(argv)
+
+    tzinfo = None
+    if options.tz is not None:
+        tzinfo = _tz.gettz(options.tz)
+        if tzinfo is None:
+            arguments.error("unknown time zone %r" % (options.tz,))
+
+    if options.chunksize < 1:
+        arguments.error("--chunksize must be at least 1")
+
+    delimiter = options.delimiter
+    if delimiter == "\\t":
+        delimiter = "\t"
+    if len(delimiter) != 1:
+        arguments.error("--delimiter must be a single character")
+
+    kwargs = {}
+    for name in ("dayfirst", "yearfirst", "fuzzy"):
+        if getattr(options, name):
+            kwargs[name] = True
+
+    parser = _parser.parser()
+    normalizer = _normalizer(parser, parser._today(), tzinfo, options.epoch,
+                             kwargs)
+
+    executor = None
+    if options.workers > 0:
+        executor = ProcessPoolExecutor(options.workers,
+                                       initializer=_init_worker,
+                                       initargs=(normalizer,))
+
+    try:
+        for name in options.files or ["-"]:
+            if name == "-":
+                status = _run(stdin, stdout, stderr, name, options,
+                              delimiter, normalizer, executor)
+            else:
+                with open(name, newline="") as f:
+                    status = _run(f, stdout, stderr, name, options,
+                                  delimiter, normalizer, executor)
+            if status:
+                return status
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return 0
+
+
+def _run(infile, outfile, stderr, name, options, delimiter, normalizer,
+         executor):
+    """
+    Normalize one input file, returning the exit status.
+    """
+    column = options.column
+    if column is None:
+        rows = (line.rstrip("\r\n") for line in infile)
+        write = outfile.writelines
+    else:
+        rows = csv.reader(infile, delimiter=delimiter)
+        write = csv.writer(outfile, delimiter=delimiter,
+                           lineterminator="\n").writerows
+
+    if options.header:
+        header = next(rows, None)
+        if header is not None:
+            write([header if column is not None else header + "\n"])
+
+    on_error = options.on_error
+    lineno = 1 if options.header else 0
+    for chunk, results in _chunks(rows, column, options.chunksize,
+                                  normalizer, executor, options.workers):
+        lines = []
+        for row, result in zip(chunk, results):
+            lineno += 1
+            if isinstance(result, Exception):
+                if on_error == "skip":
+                    continue
+                elif on_error == "empty":
+                    result = ""
+                elif on_error == "keep":
+                    result = row if column is None else None
+                else:
+                    write(lines)
+                    stderr.write("europarse: %s:%d: %s\n" %
+                                 (name, lineno, result))
+                    return 1
+
+            if column is None:
+                lines.append(result + "\n")
+            else:
+                if result is not None:
+                    if len(row) <= column:
+                        # A row without the column, with --on-error=empty
+                        row.extend([""] * (column + 1 - len(row)))
+                    row[column] = result
+                lines.append(row)
+
+        write(lines)
+
+    return 0
+
+
+def _chunks(rows, column, chunksize, normalizer, executor, workers):
+    """
+    Read ``rows`` a chunk at a time, yielding each chunk with the results
+    for it, in order. With an ``executor``, a few chunks are parsed at once.
+    """
+    def read():
+        chunk = list(itertools.islice(rows, chunksize))
+        if column is None:
+            return chunk, [row.strip() for row in chunk]
+
+        timestrs = []
+        for row in chunk:
+            try:
+                timestrs.append(row[column].strip())
+            except IndexError:
+                timestrs.append(None)
+        return chunk, timestrs
+
+    def present(timestrs):
+        return [timestr for timestr in timestrs if timestr is not None]
+
+    def merge(timestrs, results):
+        # Rows without the column can't be parsed
+        if len(results) == len(timestrs):
+            return results
+
+        results = iter(results)
+        return [ValueError("Row has no column %d" % column)
+                if timestr is None else next(results)
+                for timestr in timestrs]
+
+    if executor is None:
+        while True:
+            chunk, timestrs = read()
+            if not chunk:
+                break
+            yield chunk, merge(timestrs, normalizer(present(timestrs)))
+        return
+
+    # Enough chunks in flight to keep the workers busy, without reading the
+    # whole input ahead of the output
+    pending = collections.deque()
+    while True:
+        while len(pending) < 2 * workers:
+            chunk, timestrs = read()
+            if not chunk:
+                break
+            pending.append((chunk, timestrs,
+                            executor.submit(_normalize_chunk,
+                                            present(timestrs))))
+
+        if not pending:
+            break
+
+        chunk, timestrs, future = pending.popleft()
+        yield chunk, merge(timestrs, future.result())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
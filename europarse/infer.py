@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+"""
+This module offers inference of the format of a column of date/time strings
+from a sample of it, and a parser compiled for that format.
+
+The sample is parsed as :func:`europarse.parser.parse` would parse it, and
+the most common shape of string which could be parsed (the string but for
+its digits, the names of its month and weekday, and the like) is kept, with
+the steps the parser took to read it. Strings of that shape are then read
+straight from the positions of their fields; any other strings are parsed in
+full:
+
+.. doctest::
+
+    >>> from europarse import infer_format
+    >>> fmt = infer_format(["25/09/2003 10:36", "26/09/2003 11:02", "junk"],
+    ...                    dayfirst=True)
+    >>> fmt.shape, fmt.order, round(fmt.matched, 2)
+    ('00/00/0000 00:00', 'DMY', 0.67)
+    >>> fmt.parse_many(["27/09/2003 09:15", "Sep 28 2003"])
+    [datetime.datetime(2003, 9, 27, 9, 15), datetime.datetime(2003, 9, 28, 0, 0)]
+"""
+import collections
+
+from . import parser as _parser
+
+__all__ = ["infer_format", "compiledformat"]
+
+# The keyword arguments of _parse() which infer_format() takes
+_FORMAT_KWARGS = frozenset(["dayfirst", "yearfirst", "fuzzy"])
+
+# The steps of a parse plan which gather values for _ymd.resolve_ymd()
+_YMD_OPS = frozenset([_parser._OP_YMD, _parser._OP_YMD_NUMBER,
+                      _parser._OP_YMD_CONST])
+
+# Each digit of a shape is 0
+_SHAPE_DIGITS = str.maketrans("123456789", "000000000")
+
+# The most shapes of string (which differ in their words, such as the names
+# of their months) a compiledformat keeps the plan of
+_MAX_PLANS = 1024
+
+
+def infer_format(sample, parserinfo=None, parser=None, **kwargs):
+    """
+    Infer the format of a column of date/time strings from a sample of it.
+
+    :param sample:
+        An iterable of date/time strings.
+
+    :param parserinfo:
+        A :class:`europarse.parser.parserinfo` object containing parameters
+        for the parser. If ``None``, the default arguments to the
+        :class:`europarse.parser.parserinfo` constructor are used.
+
+    :param parser:
+        A :class:`europarse.parser.parser` object to parse with, as an
+        alternative to ``parserinfo``.
+
+    The ``**kwargs`` parameter takes the ``dayfirst``, ``yearfirst`` and
+    ``fuzzy`` keyword arguments of :func:`europarse.parser.parse`, which the
+    returned object parses with.
+
+    :return:
+        Returns a :class:`compiledformat`.
+
+    :raises TypeError:
+        Raised for an unknown keyword argument.
+    """
+    if parser is None:
+        parser = _parser.parser(parserinfo)
+    elif parserinfo is not None:
+        raise TypeError("Only one of parserinfo and parser can be given")
+
+    for name in kwargs:
+        if name not in _FORMAT_KWARGS:
+            raise TypeError("infer_format() got an unexpected keyword "
+                            "argument %r" % (name,))
+
+    info = parser.info
+    dayfirst = kwargs.get("dayfirst")
+    yearfirst = kwargs.get("yearfirst")
+    # Whether the caller says how to read an ambiguous date
+    explicit = (dayfirst is not None or yearfirst is not None or
+                info.dayfirst or info.yearfirst)
+    if dayfirst is None:
+        dayfirst = info.dayfirst
+    if yearfirst is None:
+        yearfirst = info.yearfirst
+    fuzzy = kwargs.get("fuzzy", False)
+
+    # A parser of its own, which keeps the plan of every shape in the sample
+    sample = list(sample)
+    sampler = _parser.parser(info, plan_cache_size=max(len(sample), 1))
+
+    shapes = collections.Counter()
+    parsed = collections.Counter()
+    examples = {}
+    rows = collections.defaultdict(list)
+    for timestr in sample:
+        shape = _format_shape(info, timestr)
+        if shape is None:
+            continue
+
+        shapes[shape] += 1
+        if sampler.try_parse(timestr, **kwargs)[0] is not None:
+            parsed[shape] += 1
+            examples.setdefault(shape, timestr)
+            rows[shape].append(timestr)
+
+    for shape, _ in parsed.most_common():
+        # The plans of the strings of that shape, which differ in their
+        # words, such as the names of their months
+        plans = {}
+        for timestr in rows[shape]:
+            key = sampler._plan_key(timestr, dayfirst, yearfirst, fuzzy)
+            plan = sampler._plans.get(key)
+            if plan is not None:
+                plans.setdefault(key, (plan, timestr))
+        iso = parser._iso_format.match(examples[shape]) is not None
+        if plans or iso:
+            break
+    else:
+        return compiledformat(parser, None, None, None, False, None, 0.0,
+                              kwargs)
+
+    order, slots, default = _infer_order(plans, rows[shape], sampler,
+                                         dayfirst, yearfirst, fuzzy)
+    # The order of the sample is only imposed on strings whose numbers
+    # could be in another order when the caller hasn't said which to take
+    compile = slots is not None and (not explicit or slots == default)
+
+    compiled = {}
+    for key, (plan, timestr) in plans.items():
+        compiled[key] = _compile_plan(plan, timestr, slots if compile
+                                      else None)
+
+    matched = shapes[shape] / len(sample)
+    return compiledformat(parser, sampler, (shape, dayfirst, yearfirst, fuzzy),
+                          (compiled, slots if compile else None), iso, order,
+                          matched, kwargs)
+
+
+def _format_shape(info, timestr):
+    """
+    The shape of ``timestr`` which :func:`infer_format` groups a sample by:
+    the string with each digit as ``0``, each month name as ``%b``, weekday
+    name as ``%a`` and AM/PM marker as ``%p``, and the sign of a time zone
+    offset as ``±``. Returns ``None`` for a string which isn't plain ASCII,
+    which the parser doesn't keep the plans of.
+    """
+    if (not isinstance(timestr, str) or not timestr.isascii() or
+            '\x00' in timestr):
+        return None
+
+    tokens, kinds, _, lowered = _parser._timelex.split_typed(timestr)
+    shape = []
+    seen_time = False
+    for token, kind, entry in zip(tokens, kinds, info.lookup_all(lowered)):
+        if kind == _parser._WORD:
+            if entry.month is not None:
+                token = "%b"
+            elif entry.weekday is not None:
+                token = "%a"
+            elif entry.ampm is not None:
+                token = "%p"
+        elif token == ":":
+            seen_time = True
+        elif token == "+" or (token == "-" and seen_time):
+            # A minus before the time separates the date
+            token = "\u00b1"
+        shape.append(token.translate(_SHAPE_DIGITS))
+
+    return "".join(shape)
+
+
+class _slot(int):
+    """
+    A year, month or day value which remembers where in the string it was.
+    """
+    def __new__(cls, value, slot):
+        self = int.__new__(cls, value)
+        self.slot = slot
+        return self
+
+
+def _ymd_slots(plan, timestr):
+    """
+    The steps of a parse plan which gather year, month and day values for
+    ``_ymd.resolve_ymd()``, or ``None`` if there are none or they aren't all
+    read straight from ``timestr``, a string of the plan's shape.
+    """
+    ops, spans, commas, mstridx = plan
+    example = [timestr[start:stop] for start, stop in spans]
+
+    slots = []
+    for op in ops:
+        if op[0] == _parser._OP_YMD_YEAR or (
+                op[0] == _parser._OP_YMD_NUMBER and
+                not example[op[1]].isdigit()):
+            # Not read straight from the string
+            return None
+        if op[0] in _YMD_OPS:
+            slots.append(op)
+
+    return slots or None
+
+
+def _gather(plan, slots, timestr, probe=False):
+    """
+    The ``_ymd`` of the values the steps ``slots`` of ``plan`` read from
+    ``timestr``, each a :class:`_slot`. With ``probe``, the numbers of up to
+    two digits are taken to be 1, 2 and 3, which could be any of a year, a
+    month and a day.
+    """
+    ops, spans, commas, mstridx = plan
+    tokens = [timestr[start:stop] for start, stop in spans]
+    for k in commas:
+        tokens[k] = tokens[k].replace(',', '.')
+
+    ymd = _parser._ymd(timestr, tokens=tokens)
+    for slot, op in enumerate(slots):
+        if op[0] == _parser._OP_YMD_CONST:
+            value = op[1]
+        else:
+            if op[0] == _parser._OP_YMD:
+                value = tokens[op[1]][op[2]:op[3]]
+            else:
+                value = tokens[op[1]]
+            if probe and len(value) <= 2:
+                value = slot + 1
+        list.append(ymd, _slot(value, slot))
+
+    return ymd
+
+
+def _resolved(ymd, mstridx, yearfirst, dayfirst):
+    """
+    The slots ``_ymd.resolve_ymd()`` takes the year, month and day from.
+    """
+    fields = ymd.copy().resolve_ymd(mstridx, yearfirst, dayfirst)
+    return tuple(None if field is None else field.slot for field in fields)
+
+
+def _infer_order(plans, rows, sampler, dayfirst, yearfirst, fuzzy):
+    """
+    Work out the order of the year, month and day of the sample ``rows`` of
+    one shape, whose ``plans`` are those of each string of that shape in the
+    sample, as a tuple of the order (e.g. ``"DMY"``), the slots it takes the
+    year, month and day from, and the slots ``_ymd.resolve_ymd()`` takes them
+    from with ``dayfirst`` and ``yearfirst`` when the numbers could be in any
+    order. The order is the one most of the rows can only be read in, or if
+    none can only be read in one order, the latter. The order and slots are
+    ``None`` if the plans can't be compiled.
+    """
+    slots = {}
+    for key, (plan, timestr) in plans.items():
+        slots[key] = _ymd_slots(plan, timestr)
+        if slots[key] is None:
+            return None, None, None
+
+    if not slots or len(set(map(len, slots.values()))) != 1:
+        return None, None, None
+
+    key, (plan, timestr) = next(iter(plans.items()))
+    try:
+        default = _resolved(_gather(plan, slots[key], timestr, probe=True),
+                            plan[3], yearfirst, dayfirst)
+    except (ValueError, IndexError):
+        default = None
+
+    forced = collections.Counter()
+    for timestr in rows:
+        key = sampler._plan_key(timestr, dayfirst, yearfirst, fuzzy)
+        if key not in plans:
+            continue
+
+        plan = plans[key][0]
+        try:
+            ymd = _gather(plan, slots[key], timestr)
+            orders = set(_resolved(ymd, plan[3], settings[1], settings[0])
+                         for settings in _parser._SETTINGS)
+        except (ValueError, IndexError):
+            continue
+
+        if len(orders) == 1:
+            forced[orders.pop()] += 1
+
+    order = forced.most_common(1)[0][0] if forced else default
+    if order is None:
+        return None, None, None
+
+    letters = sorted((slot, letter) for letter, slot in zip("YMD", order)
+                     if slot is not None)
+    return "".join(letter for _, letter in letters), order, default
+
+
+def _compile_plan(plan, timestr, order):
+    """
+    Turn the steps of a parse plan which gather year, month and day values
+    for ``_ymd.resolve_ymd()`` into ones setting each field directly, from
+    the slots ``order`` gives (see :func:`_infer_order`). ``timestr`` is a
+    string of the plan's shape. The plan is returned as it is if ``order``
+    is ``None``, or its steps can't be compiled.
+    """
+    if order is None:
+        return plan
+
+    slots = _ymd_slots(plan, timestr)
+    if slots is None or len(slots) != len([s for s in order
+                                           if s is not None]):
+        return plan
+
+    ops, spans, commas, mstridx = plan
+    attrs = {}
+    for attr, slot in zip(("year", "month", "day"), order):
+        if slot is not None:
+            attrs[slot] = attr
+
+    compiled = []
+    century_specified = False
+    slot = 0
+    for op in ops:
+        if op[0] in _YMD_OPS:
+            attr = attrs.get(slot)
+            slot += 1
+            if op[0] == _parser._OP_YMD:
+                start, stop = spans[op[1]]
+                token = timestr[start:stop][op[2]:op[3]]
+                if token.isdigit() and len(token) > 2:
+                    century_specified = True
+            if attr is None:
+                continue
+            if op[0] == _parser._OP_YMD:
+                op = (_parser._OP_INT, op[1], op[2], op[3], attr)
+            elif op[0] == _parser._OP_YMD_NUMBER:
+                # Whose century is only specified if it is over 100,
+                # which is when convertyear() keeps it anyway
+                op = (_parser._OP_INT, op[1], 0, None, attr)
+            else:
+                op = (_parser._OP_SET, attr, op[1])
+        compiled.append(op)
+
+    if order[0] is not None:
+        compiled.append((_parser._OP_SET, "century_specified",
+                         century_specified))
+
+    # No values are left for resolve_ymd(), which then does nothing
+    return (tuple(compiled), spans, commas, mstridx)
+
+
+class compiledformat(object):
+    """
+    A parser for the strings of one shape, as returned by
+    :func:`infer_format`, which reads them as
+    :meth:`europarse.parser.parser.parse` would. If neither ``dayfirst`` nor
+    ``yearfirst`` was given, a date whose numbers could be in more than one
+    order is read in the order the sample shows, where ``parse()`` would
+    fall back on its defaults; given either, it is read as ``parse()`` reads
+    it. Strings of another shape are passed on to ``parse()``.
+
+    It has the attributes:
+
+    - ``shape``: the shape of string it reads, with each digit as ``0``, each
+      month name as ``%b``, weekday name as ``%a`` and AM/PM marker as
+      ``%p``, and the sign of a time zone offset as ``±``, or ``None`` if no
+      string of the sample could be parsed.
+    - ``order``: the order of the year, month and day in that shape, such as
+      ``"DMY"``: the one most of the sample can only be read in, or if none of
+      it can only be read in one order, the one ``parse()`` reads it in. It
+      is ``None`` if their order is left to ``parse()``, as it is for ISO 8601
+      strings.
+    - ``matched``: the share of the sample of that shape.
+    """
+    def __init__(self, parser, sampler, key, plans, iso, order, matched,
+                 kwargs):
+        self._parser = parser
+        # Which records the plans of strings of the shape with other words
+        self._sampler = sampler
+        self._key = key
+        self._plans, self._slots = plans if plans is not None else ({}, None)
+        self._iso = iso
+        self._kwargs = kwargs
+        self._screened = bool(parser._null_values or
+                              parser._max_length is not None)
+        self.shape = None if key is None else key[0]
+        self.order = order
+        self.matched = matched
+
+    def __repr__(self):
+        return "%s(%r, matched=%r)" % (self.__class__.__name__, self.shape,
+                                       self.matched)
+
+    def parse(self, timestr, default=None, ignoretz=False, tzinfos=None):
+        """
+        Parse the date/time string as :meth:`europarse.parser.parser.parse`
+        does, with the same arguments and those given to
+        :func:`infer_format`.
+        """
+        parser = self._parser
+        if default is None:
+            default = parser._today()
+
+        ret = self._read(timestr, default, ignoretz, tzinfos)
+        if ret is None:
+            ret = parser._parse_default(timestr, default, ignoretz, tzinfos,
+                                        self._kwargs)
+
+        return ret
+
+    def parse_many(self, timestrs, default=None, ignoretz=False,
+                   tzinfos=None, errors="raise"):
+        """
+        Parse each of the date/time strings in ``timestrs`` as
+        :meth:`europarse.parser.parser.parse_many` does, with the same
+        arguments and those given to :func:`infer_format`.
+
+        :return:
+            Returns a list of the results, in the order of ``timestrs``.
+        """
+        parser = self._parser
+        parser._check_many(errors, {})
+
+        if default is None:
+            default = parser._today()
+
+        kwargs = self._kwargs
+        read = self._read
+        results = []
+        for timestr in timestrs:
+            ret = read(timestr, default, ignoretz, tzinfos)
+            if ret is None:
+                if errors == "raise":
+                    ret = parser._parse_default(timestr, default, ignoretz,
+                                                tzinfos, kwargs)
+                elif errors == "coerce":
+                    ret = parser._try_parse_default(timestr, default,
+                                                    ignoretz, tzinfos,
+                                                    kwargs)[0]
+                else:
+                    try:
+                        ret = parser._parse_default(timestr, default,
+                                                    ignoretz, tzinfos, kwargs)
+                    except (ValueError, OverflowError) as e:
+                        ret = e
+            results.append(ret)
+
+        return results
+
+    def _read(self, timestr, default, ignoretz, tzinfos):
+        """
+        Read ``timestr`` if it is of the compiled shape, or return ``None``.
+        """
+        if self._key is None:
+            return None
+
+        parser = self._parser
+        key = parser._plan_key(timestr, *self._key[1:])
+        if key is None:
+            return None
+
+        try:
+            plan = self._plans[key]
+        except KeyError:
+            plan = self._learn(timestr, key)
+        if plan is False:
+            return None
+
+        if self._screened and parser._screen_out(timestr,
+                                                 self._kwargs) is not None:
+            return None
+
+        # The ISO 8601 strings parse() reads directly are read the same way
+        res = None
+        if self._iso:
+            res = parser._parse_iso(timestr)
+        if res is None and plan is not None:
+            res = parser._run_plan(plan, timestr, *key[1:])[0]
+        if not res:
+            return None
+
+        try:
+            ret = parser._build(res, default)
+        except (ValueError, OverflowError):
+            return None
+
+        if not ignoretz:
+            ret = parser._build_tz(ret, res, tzinfos)
+
+        return ret
+
+    def _learn(self, timestr, key):
+        """
+        Find the plan for ``timestr``, whose shape (as the parser caches
+        plans by) isn't one of those of the sample: ``False`` if it isn't of
+        the compiled shape either, or ``None`` if it has no plan.
+        """
+        plans = self._plans
+        if _format_shape(self._parser.info, timestr) != self._key[0]:
+            plan = False
+        elif self._iso and self._parser._parse_iso(timestr) is not None:
+            plan = None
+        else:
+            sampler = self._sampler
+            sampler.try_parse(timestr, **self._kwargs)
+            plan = sampler._plans.get(key)
+            if plan is None:
+                # Not parsed, which another string of the shape may be
+                return None
+            plan = _compile_plan(plan, timestr, self._slots)
+
+        if len(plans) < _MAX_PLANS:
+            plans[key] = plan
+        return plan
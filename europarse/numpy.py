@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+This module offers parsing of date/time strings straight into NumPy
+``datetime64`` arrays, without keeping a :class:`datetime.datetime` object
+for each of them. It needs NumPy.
+
+Columns of strings which share a fixed-width ISO 8601 layout, such as
+``2003-09-25T10:49:41.502+03:00``, are read with vectorized operations on
+their characters; any other strings are parsed one at a time as
+:func:`europarse.parser.parse` would. Strings which can't be parsed become
+``NaT``:
+
+.. doctest::
+
+    >>> from europarse.numpy import parse_datetime64
+    >>> parse_datetime64(["2003-09-25T10:49:41", "junk", "25 Sep 2003"])
+    array(['2003-09-25T10:49:41.000000',                        'NaT',
+           '2003-09-25T00:00:00.000000'], dtype='datetime64[us]')
+"""
+import datetime
+import re
+import time
+
+import numpy as np
+
+from . import parser as _parser
+
+__all__ = ["parse_datetime64"]
+
+# The number of units per microsecond
+_UNITS = {"us": 1, "ns": 1000}
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_NAT = np.iinfo(np.int64).min
+
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# A fraction of a second finer than a microsecond, which a datetime drops
+_SUBMICROSECOND = re.compile(r"\d[.,]\d{7}")
+
+
+def parse_datetime64(timestrs, unit="us", utc=False, out=None,
+                     parserinfo=None, default=None, ignoretz=False,
+                     tzinfos=None, **kwargs):
+    """
+    Parse date/time strings into a ``datetime64`` array.
+
+    :param timestrs:
+        A sequence or array of date/time strings. Elements which aren't
+        strings become ``NaT``.
+
+    :param unit:
+        The unit of the array, ``"us"`` (the default) or ``"ns"``.
+
+    :param utc:
+        If ``True``, times with a time zone are converted to UTC; times
+        without one are taken to be in UTC already. Otherwise, each time is
+        stored as written, and its time zone dropped.
+
+    :param out:
+        A ``datetime64`` array of ``unit``, and of the shape of
+        ``timestrs``, to fill instead of a new one.
+
+    :param parserinfo:
+        A :class:`europarse.parser.parserinfo` object containing parameters
+        for the parser. If ``None``, the default arguments to the
+        :class:`europarse.parser.parserinfo` constructor are used.
+
+    The ``default``, ``ignoretz`` and ``tzinfos`` parameters, and the
+    ``**kwargs`` parameter, take the keyword arguments of
+    :func:`europarse.parser.parse`, except for ``fuzzy_with_tokens``.
+
+    :return:
+        Returns the filled array, which is ``out`` if given.
+
+    :raises ValueError:
+        Raised for an unknown ``unit``, or an ``out`` array which doesn't fit.
+    """
+    if unit not in _UNITS:
+        raise ValueError("unit must be 'us' or 'ns', not %r" % (unit,))
+
+    if kwargs.get("fuzzy_with_tokens"):
+        raise TypeError("fuzzy_with_tokens isn't supported")
+
+    p = _parser.parser(parserinfo) if parserinfo else _parser.DEFAULTPARSER
+    p._check_many("coerce", kwargs)
+
+    if default is None:
+        default = p._today()
+
+    values = np.asarray(timestrs)
+    dtype = np.dtype("datetime64[%s]" % unit)
+    if out is None:
+        out = np.empty(values.shape, dtype)
+    elif out.dtype != dtype or out.shape != values.shape:
+        raise ValueError("out must be a %s array of shape %r" %
+                         (dtype, values.shape))
+
+    shape = values.shape
+    values = values.ravel()
+    result = np.empty(len(values), np.int64)
+    todo = np.ones(len(values), bool)
+
+    layout = _iso_layout(p, values, default, ignoretz, tzinfos, kwargs)
+    if layout is not None:
+        _fill_iso(values, layout, default, ignoretz, utc, _UNITS[unit],
+                  result, todo)
+
+    scale = _UNITS[unit]
+    for i in np.flatnonzero(todo):
+        timestr = values[i]
+        dt = None
+        if isinstance(timestr, (str, bytes)):
+            dt = p.try_parse(timestr, default=default, ignoretz=ignoretz,
+                             tzinfos=tzinfos, **kwargs)[0]
+        if dt is None:
+            result[i] = _NAT
+            continue
+
+        value = _to_int(dt, utc, scale)
+        if (scale != 1 and value != _NAT and isinstance(timestr, str) and
+                _SUBMICROSECOND.search(timestr)):
+            value += _nanosecond(p, timestr, kwargs)
+            if value > -_NAT:
+                value = _NAT
+        result[i] = value
+
+    out[...] = result.view(dtype).reshape(shape)
+    return out
+
+
+def _to_int(dt, utc, scale):
+    """
+    The ``datetime64`` value of ``dt`` in units of ``1/scale`` of a
+    microsecond, or ``NaT`` if it can't be represented.
+    """
+    if dt.tzinfo is not None:
+        if utc:
+            try:
+                offset = dt.utcoffset()
+                if offset is not None:
+                    dt = dt - offset
+            except (ValueError, OverflowError):
+                # e.g. an offset of a day or more
+                return _NAT
+        dt = dt.replace(tzinfo=None)
+
+    value = (dt - _EPOCH) // _MICROSECOND * scale
+    if not _NAT < value <= -_NAT:
+        return _NAT
+
+    return value
+
+
+def _nanosecond(p, timestr, kwargs):
+    """
+    The nanoseconds past the microseconds of the time parsed from
+    ``timestr``, which its ``datetime`` doesn't keep.
+    """
+    try:
+        res = p._parse_res(timestr, kwargs)[0]
+    except (ValueError, OverflowError):
+        return 0
+
+    if res.microsecond is None:
+        return 0
+    return res.nanosecond or 0
+
+
+def _iso_layout(p, values, default, ignoretz, tzinfos, kwargs):
+    """
+    Look for the layout of an ISO 8601 string which the parser reads
+    directly (see ``parser._parse_iso()``) in the first element of
+    ``values``. Returns a dictionary of the positions of its fields, or
+    ``None`` if there is none, or if a string in that layout may not be read
+    as ``_parse_iso()`` reads it with these arguments.
+    """
+    if not len(values) or not isinstance(values[0], str):
+        return None
+
+    if not p._iso_kwargs.issuperset(kwargs) or tzinfos:
+        return None
+
+    # Fields missing from the string come from default, as long as they are
+    # plain numbers
+    if default.tzinfo is not None:
+        return None
+
+    info = p.info
+    for name in ("validate", "convertyear", "tzoffset"):
+        if getattr(type(info), name) is not getattr(_parser.parserinfo, name):
+            return None
+
+    first = values[0]
+    m = p._iso_format.match(first)
+    if m is None:
+        return None
+
+    if m.group(4) is not None and not info.lookup(m.group(4).lower()).jump:
+        return None
+
+    if m.group(9) is not None and "UTC" in time.tzname:
+        # "Z" gets tzlocal()
+        return None
+
+    layout = {"length": len(first)}
+    for name, group in (("year", 1), ("month", 2), ("day", 3), ("sep", 4),
+                        ("hour", 5), ("minute", 6), ("second", 7),
+                        ("fraction", 8), ("utc", 9), ("sign", 10),
+                        ("tzhour", 11), ("tzminute", 12)):
+        if m.group(group) is not None:
+            layout[name] = m.span(group)
+
+    return layout
+
+
+def _fill_iso(values, layout, default, ignoretz, utc, scale, result, todo):
+    """
+    Fill ``result`` with the values of the strings in ``values`` which have
+    the ISO 8601 ``layout`` found by ``_iso_layout()``, clearing them in
+    ``todo``. Strings with fields out of range are left to the parser.
+    """
+    length = layout["length"]
+    chars = values.astype("U%d" % max(length, 1)) if values.dtype.kind != "U" \
+        else values
+    width = chars.dtype.itemsize // 4
+    if width < length:
+        return
+
+    codes = np.ascontiguousarray(chars).view(np.uint32)
+    codes = codes.reshape(len(values), width).astype(np.int64)
+
+    if values.dtype.kind == "U":
+        ok = np.char.str_len(chars) == length
+    else:
+        # The cast above cut longer strings down to the layout's length, so
+        # measure the original objects instead
+        ok = np.fromiter((isinstance(x, str) and len(x) == length
+                          for x in values), bool, len(values))
+
+    first = values[0]
+    digits = set()
+    for name in ("year", "month", "day", "hour", "minute", "second",
+                 "fraction", "tzhour", "tzminute"):
+        if name in layout:
+            digits.update(range(*layout[name]))
+
+    for pos in range(length):
+        column = codes[:, pos]
+        if pos in digits:
+            ok &= (column >= 48) & (column <= 57)
+        elif "sign" in layout and pos == layout["sign"][0]:
+            ok &= (column == 43) | (column == 45)
+        else:
+            ok &= column == ord(first[pos])
+
+    def number(name, size=None):
+        start, stop = layout[name]
+        if size is not None:
+            stop = min(stop, start + size)
+        n = np.zeros(len(values), np.int64)
+        for pos in range(start, stop):
+            n = n*10 + (codes[:, pos] - 48)
+        return n, stop - start
+
+    year = number("year")[0]
+    month = number("month")[0]
+    day = number("day")[0]
+
+    ok &= year > 31
+    ok &= (month >= 1) & (month <= 12)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = (_DAYS_IN_MONTH[np.clip(month, 1, 12)] +
+                     (leap & (month == 2)))
+    ok &= (day >= 1) & (day <= days_in_month)
+
+    if "sep" in layout:
+        hour = number("hour")[0]
+        minute = number("minute")[0]
+        ok &= (hour <= 23) & (minute <= 59)
+
+        if "second" in layout:
+            second = number("second")[0]
+            ok &= second <= 59
+
+            # The fraction in units of the array: to the microsecond, or
+            # the nanosecond
+            if "fraction" in layout:
+                digits = 6 if scale == 1 else 9
+                subsecond, size = number("fraction", digits)
+                subsecond *= 10**(digits - size)
+            else:
+                subsecond = 0
+        else:
+            second = default.second
+            subsecond = default.microsecond*scale
+    else:
+        hour = default.hour
+        minute = default.minute
+        second = default.second
+        subsecond = default.microsecond*scale
+
+    offset = 0
+    if "tzhour" in layout and utc and not ignoretz:
+        offset = number("tzhour")[0]*3600
+        if "tzminute" in layout:
+            offset = offset + number("tzminute")[0]*60
+        offset = np.where(codes[:, layout["sign"][0]] == 45, -offset, offset)
+        # datetime refuses offsets of a day or more
+        ok &= np.abs(offset) < 86400
+
+    ok &= todo
+    rows = np.flatnonzero(ok)
+    if not len(rows):
+        return
+
+    # Days since 1970-01-01 of the proleptic Gregorian calendar
+    y = year[rows] - (month[rows] <= 2)
+    era = y // 400
+    yoe = y - era*400
+    doy = (153*((month[rows] + 9) % 12) + 2)//5 + day[rows] - 1
+    doe = yoe*365 + yoe//4 - yoe//100 + doy
+    days = era*146097 + doe - 719468
+
+    def pick(field):
+        return field[rows] if isinstance(field, np.ndarray) else field
+
+    seconds = days*86400 + pick(hour)*3600 + pick(minute)*60 + pick(second)
+    if utc:
+        seconds = seconds - pick(offset)
+
+    value = seconds*1000000*scale + pick(subsecond)
+    if scale != 1:
+        # Outside of about 1678-2261, nanoseconds overflow
+        limit = -_NAT // scale
+        fits = np.abs(seconds) < limit // 1000000 - 1
+        rows = rows[fits]
+        value = value[fits]
+
+    result[rows] = value
+    todo[rows] = False
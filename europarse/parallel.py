@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+This module offers a pool of worker processes to parse large batches of
+date/time strings in parallel, on all the cores of a machine rather than the
+one the GIL lets a single process use.
+
+The parser and the options to parse with are sent to each worker once, when
+it starts; after that only the strings and the results travel between the
+processes, a chunk at a time:
+
+.. doctest::
+
+    >>> from europarse.parallel import parsepool
+    >>> with parsepool(4, dayfirst=True) as pool:
+    ...     pool.parse_many(["25/09/2003", "26/09/2003"])
+    [datetime.datetime(2003, 9, 25, 0, 0), datetime.datetime(2003, 9, 26, 0, 0)]
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import parser as _parser
+
+__all__ = ["parsepool"]
+
+# The parser and parse_many() keyword arguments of a worker process, set up
+# by _init_worker()
+_worker_parser = None
+_worker_kwargs = None
+
+
+def _init_worker(parser, kwargs):
+    global _worker_parser, _worker_kwargs
+    _worker_parser = parser
+    _worker_kwargs = kwargs
+
+
+def _parse_chunk(timestrs, default):
+    return _worker_parser.parse_many(timestrs, default=default,
+                                     **_worker_kwargs)
+
+
+class parsepool(object):
+    """
+    A pool of worker processes which parse strings as
+    :meth:`europarse.parser.parser.parse_many` does. The processes are kept
+    for the life of the pool, so only its first batch pays for starting
+    them; close the pool with :meth:`close`, or use it as a context manager.
+
+    :param workers:
+        The number of worker processes, by default the number of CPUs.
+
+    :param parserinfo:
+        A :class:`europarse.parser.parserinfo` object containing parameters
+        for the parser. If ``None``, the default arguments to the
+        :class:`europarse.parser.parserinfo` constructor are used.
+
+    :param parser:
+        A :class:`europarse.parser.parser` object to parse with, as an
+        alternative to ``parserinfo``. The workers get a copy of it.
+
+    :param chunksize:
+        The number of strings sent to a worker at a time. By default, each
+        batch is split into about four chunks per worker, of at most 10000
+        strings.
+
+    The ``**kwargs`` parameter takes the keyword arguments of
+    :meth:`europarse.parser.parser.parse_many`, which apply to every batch.
+    They, and the parser, must be picklable: for instance, ``tzinfos`` can be
+    a dictionary or a module level function, but not a lambda.
+    """
+    def __init__(self, workers=None, parserinfo=None, parser=None,
+                 chunksize=None, **kwargs):
+        if parser is None:
+            parser = _parser.parser(parserinfo)
+        elif parserinfo is not None:
+            raise TypeError("Only one of parserinfo and parser can be given")
+
+        errors = kwargs.pop("errors", "raise")
+        options = {}
+        for name in ("default", "ignoretz", "tzinfos"):
+            if name in kwargs:
+                options[name] = kwargs.pop(name)
+        parser._check_many(errors, kwargs)
+        kwargs.update(options, errors=errors)
+
+        if chunksize is not None and chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        # Without a default, each batch gets today's midnight, worked out here
+        # so that all of its chunks agree
+        self._default = kwargs.pop("default", None)
+        self._chunksize = chunksize
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(self._workers,
+                                             initializer=_init_worker,
+                                             initargs=(parser, kwargs))
+
+    def parse_many(self, timestrs):
+        """
+        Parse each of the date/time strings in ``timestrs``.
+
+        :param timestrs:
+            An iterable of date/time strings.
+
+        :return:
+            Returns a list of the results, in the order of ``timestrs``.
+        """
+        if not isinstance(timestrs, (list, tuple)):
+            timestrs = list(timestrs)
+
+        chunksize = self._chunksize
+        if chunksize is None:
+            chunksize = -(-len(timestrs) // (4 * self._workers))
+            chunksize = max(1, min(chunksize, 10000))
+
+        default = self._default
+        if default is None:
+            default = _parser.parser._today()
+
+        chunks = [timestrs[i:i+chunksize]
+                  for i in range(0, len(timestrs), chunksize)]
+
+        results = []
+        for chunk in self._executor.map(_parse_chunk, chunks,
+                                        itertools.repeat(default)):
+            results.extend(chunk)
+
+        return results
+
+    def close(self):
+        """
+        Stop the worker processes, once they have finished their work.
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -30,11 +30,14 @@ Additional resources about date/time string formats can be found below:
 from __future__ import unicode_literals
 
 import datetime
+import itertools
 import string
 import time
 import re
+from array import array
 from io import StringIO
 from calendar import monthrange
+from collections import namedtuple, OrderedDict
 
 try:
     from collections.abc import Callable
@@ -44,13 +47,79 @@ except ImportError:
 from . import relativedelta
 from . import tz
 
-__all__ = ["parse", "parserinfo"]
+__all__ = ["parse", "parse_many", "parse_column", "parse_detect",
+           "parse_candidates", "parse_iter", "parse_epoch", "parse_fields",
+           "try_parse", "parserinfo", "parseddate"]
+
+# Token kinds reported by _timelex.split_typed()
+_NUMBER, _WORD, _SEPARATOR, _SPACE = range(4)
+
+# What parser.parse_epoch() counts from
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_MAX_ORDINAL = datetime.date.max.toordinal()
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_SECOND = datetime.timedelta(seconds=1)
+
+# What parser.parse_fields() returns, and the array type code of each field
+_fieldarrays = namedtuple("FieldArrays", ["year", "month", "day", "hour",
+                                          "minute", "second", "microsecond",
+                                          "tzoffset", "aware", "valid"])
+_FIELD_TYPECODES = _fieldarrays("h", "b", "b", "b", "b", "b", "l", "l", "b",
+                                "b")
+
+# What parser.parse_detect() returns
+_detection = namedtuple("Detection", ["results", "dayfirst", "conflicts"])
+
+# What parser.parse_candidates() returns, and each of its results
+_candidates = namedtuple("Candidates", ["results", "ambiguous"])
+_candidate = namedtuple("Candidate", ["datetime", "settings"])
+
+# The (dayfirst, yearfirst) settings parser.parse_candidates() tries
+_SETTINGS = ((False, False), (True, False), (False, True), (True, True))
+
+# What parser._offset() gives for a time zone object
+_TZOBJECT = object()
+
+# Words that float() accepts, and which have always been read as numbers
+_FLOAT_WORDS = frozenset(["nan", "inf", "infinity"])
+
+# Steps of a parse plan, which parser._scan() records as it assigns each
+# field of its result and parser._replay() replays on strings of the same
+# shape (from _scan() itself, on a hit in the plan cache, or from
+# _run_plan()). The first ones read a number token, whose index follows the
+# opcode.
+(_OP_INT, _OP_TRUNC, _OP_HOUR, _OP_MINUTE, _OP_SECONDS, _OP_AMPM_HOUR,
+ _OP_YMD, _OP_YMD_NUMBER, _OP_YMD_YEAR, _OP_TZOFFSET,
+ _OP_YMD_CONST, _OP_AMPM, _OP_SET) = range(13)
+_TOKEN_OPS = frozenset(range(_OP_TZOFFSET + 1))
+
+# The shape of an ASCII string is the string with each digit replaced by 0
+_SHAPE_DIGITS = bytes.maketrans(b"123456789", b"000000000")
+
+_cacheinfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
 
 
 class _timelex(object):
     # Fractional seconds are sometimes split by a comma
     _split_decimal = re.compile("([\.,])")
 
+    # The tokens get_token() reads before the decimal splitting rules are
+    # applied: a word or a number, either of which may carry on through
+    # dot separators (a number may also take a comma after its first two
+    # digits), or else any single character.
+    _split_tokens = re.compile(r"""
+        [^\W\d_]+ (?:\.+(?:[^\W\d_]+|\d+))* \.*
+      | \d+ (?:(?<=\d\d),\d*)? (?:\.+(?:[^\W\d_]+|\d+))* \.*
+      | .
+    """, re.VERBOSE | re.DOTALL)
+    _split_spaces = re.compile(r"[^\S ]")
+
+    # Lexing engine used by split(): "regex" tokenizes the whole string in a
+    # single pass with _split_tokens, "legacy" drives get_token() one
+    # character at a time. Both produce the same tokens.
+    engine = "regex"
+
     def __init__(self, instream):
         if isinstance(instream, bytes):
             instream = instream.decode()
@@ -184,8 +253,107 @@ class _timelex(object):
 
     @classmethod
     def split(cls, s):
+        if cls.engine == "regex":
+            tokens = cls._split_regex(s)
+            if tokens is not None:
+                return tokens
         return list(cls(s))
 
+    @classmethod
+    def _split_regex(cls, s):
+        """
+        Single pass equivalent of ``list(_timelex(s))``. Returns ``None`` for
+        input it cannot handle (streams, or characters such as superscript
+        digits which ``isdigit()`` and the regex character classes disagree
+        about), in which case the caller falls back to ``get_token()``.
+        """
+        if isinstance(s, bytes):
+            s = s.decode()
+        elif not isinstance(s, str):
+            return None
+
+        if '\x00' in s:
+            s = s.replace('\x00', '')
+
+        if not s.isascii() and any(c.isnumeric() and not c.isdecimal() and
+                                   not c.isalpha() for c in s):
+            return None
+
+        # Every whitespace character is a token of its own, read as ' '
+        s = cls._split_spaces.sub(' ', s)
+        tokens = cls._split_tokens.findall(s)
+        if '.' not in s and ',' not in s:
+            return tokens
+
+        # Apply the same decimal splitting rules as get_token(), back to
+        # front so that split tokens can be spliced in place.
+        last = len(tokens) - 1
+        for i in range(last, -1, -1):
+            token = tokens[i]
+            if len(token) == 1 or ('.' not in token and ',' not in token):
+                continue
+
+            if token[0].isdigit():
+                seenletters = not _isdigits(token)
+                # get_token() only notices letters once it has read past
+                # the first one, which it never does if that is the last
+                # character of the input.
+                if (seenletters and i == last and token[-1].isalpha() and
+                        _isdigits(token[:-1])):
+                    seenletters = False
+            else:
+                seenletters = True
+
+            if seenletters or token.count('.') > 1 or token[-1] in '.,':
+                tokens[i:i+1] = [x for x in cls._split_decimal.split(token)
+                                 if x]
+            elif '.' not in token:
+                # 12,5
+                tokens[i] = token.replace(',', '.')
+
+        return tokens
+
+    @classmethod
+    def split_typed(cls, s):
+        """
+        Split ``s`` as :meth:`split` does, also classifying each token.
+
+        Returns four parallel lists: the tokens; their kinds (``_NUMBER``,
+        ``_WORD``, ``_SEPARATOR`` or ``_SPACE``); their values, which is the
+        ``float()`` of the token for numbers and ``None`` otherwise; and their
+        lowercased forms.
+        """
+        tokens = cls.split(s)
+        kinds = []
+        values = []
+        lowered = []
+        for token in tokens:
+            c = token[0]
+            if c.isdigit():
+                if token.replace('.', '', 1).isdecimal():
+                    kinds.append(_NUMBER)
+                    values.append(float(token))
+                else:
+                    # e.g. "10.a" at the end of the input
+                    kinds.append(_WORD)
+                    values.append(None)
+                lowered.append(token.lower())
+            elif c.isalpha():
+                token = token.lower()
+                if token in _FLOAT_WORDS:
+                    kinds.append(_NUMBER)
+                    values.append(float(token))
+                else:
+                    kinds.append(_WORD)
+                    values.append(None)
+                lowered.append(token)
+            else:
+                kinds.append(_SPACE if token == ' ' else _SEPARATOR)
+                values.append(None)
+                lowered.append(token)
+
+        return tokens, kinds, values, lowered
+
     @classmethod
     def isword(cls, nextchar):
         """ Whether or not the next character is part of a word """
@@ -224,6 +392,13 @@ class _resultbase(object):
         return self._repr(self.__class__.__name__)
 
 
+# What parserinfo knows about a (lowercased) token, and the methods of
+# parserinfo which say so
+_vocabentry = namedtuple("_vocabentry", ["jump", "weekday", "month", "hms",
+                                         "ampm", "pertain", "utczone"])
+_NOVOCAB = _vocabentry(False, None, None, None, None, False, False)
+
+
 class parserinfo(object):
     """
     Class which handles what inputs are accepted. Subclass this to customize
@@ -283,6 +458,12 @@ class parserinfo(object):
         self._ampm = self._convert(self.AMPM)
         self._utczone = self._convert(self.UTCZONE)
         self._pertain = self._convert(self.PERTAIN)
+        self._vocab = self._build_vocab()
+        # A subclass which overrides the methods the vocabulary comes from
+        # may know words which aren't in its lists
+        self._vocab_methods = any(
+            getattr(type(self), name) is not getattr(parserinfo, name)
+            for name in _vocabentry._fields)
 
         self.dayfirst = dayfirst
         self.yearfirst = yearfirst
@@ -300,6 +481,50 @@ class parserinfo(object):
                 dct[v.lower()] = i
         return dct
 
+    def _build_vocab(self):
+        # Everything jump(), weekday(), month(), hms(), ampm(), pertain() and
+        # utczone() know about, so that a token can be classified with a
+        # single lookup of its lowercased form.
+        names = set()
+        for dct in (self._jump, self._weekdays, self._months, self._hms,
+                    self._ampm, self._utczone, self._pertain):
+            names.update(dct)
+
+        return dict((name, self._vocab_entry(name)) for name in names)
+
+    def _vocab_entry(self, name):
+        return _vocabentry(
+            jump=self.jump(name),
+            weekday=self.weekday(name),
+            month=self.month(name),
+            hms=self.hms(name),
+            ampm=self.ampm(name),
+            pertain=self.pertain(name),
+            utczone=self.utczone(name))
+
+    def lookup(self, name):
+        """
+        Return the vocabulary entry for a lowercased token. Tokens that are
+        not in the vocabulary get an entry with every field false or ``None``,
+        unless a subclass overrides :meth:`jump`, :meth:`weekday`,
+        :meth:`month`, :meth:`hms`, :meth:`ampm`, :meth:`pertain` or
+        :meth:`utczone`, which are then asked about them.
+        """
+        entry = self._vocab.get(name)
+        if entry is None:
+            if self._vocab_methods:
+                return self._vocab_entry(name)
+            return _NOVOCAB
+        return entry
+
+    def lookup_all(self, names):
+        """ :meth:`lookup` each of a sequence of lowercased tokens. """
+        if self._vocab_methods:
+            return [self.lookup(name) for name in names]
+
+        get = self._vocab.get
+        return [get(name, _NOVOCAB) for name in names]
+
     def jump(self, name):
         return name.lower() in self._jump
 
@@ -368,16 +593,15 @@ class parserinfo(object):
 
 class _ymd(list):
     def __init__(self, tzstr, *args, **kwargs):
+        # The tokens of tzstr, if the caller has already split it
+        self.tokens = kwargs.pop('tokens', None)
         super(self.__class__, self).__init__(*args, **kwargs)
         self.century_specified = False
         self.tzstr = tzstr
 
     @staticmethod
     def token_could_be_year(token, year):
-        try:
-            return int(token) == year
-        except ValueError:
-            return False
+        return token.isdecimal() and int(token) == year
 
     @staticmethod
     def find_potential_year_tokens(year, tokens):
@@ -402,6 +626,38 @@ class _ymd(list):
 
         super(self.__class__, self).append(int(val))
 
+    def copy(self):
+        other = _ymd(self.tzstr, self, tokens=self.tokens)
+        other.century_specified = self.century_specified
+        return other
+
+    def dayfirst_vote(self, mstridx, yearfirst):
+        """
+        Whether the members show the day to come before the month (``True``)
+        or after it (``False``), where ``resolve_ymd()`` would otherwise go by
+        ``dayfirst``, or ``None`` if they don't show either.
+        """
+        if mstridx != -1 or len(self) not in (2, 3) or self[0] > 31:
+            return None
+
+        if 12 < self[0] and self[1] <= 12:
+            vote = True
+        elif self[0] <= 12 < self[1] <= 31:
+            vote = False
+        else:
+            return None
+
+        if len(self) == 3:
+            tokens = self.tokens
+            if tokens is None:
+                tokens = _timelex.split(self.tzstr)
+
+            if (self.find_probable_year_index(tokens) == 0 or
+                    (yearfirst and self[1] <= 12 and self[2] <= 31)):
+                return None
+
+        return vote
+
     def resolve_ymd(self, mstridx, yearfirst, dayfirst):
         len_ymd = len(self)
         year, month, day = (None, None, None)
@@ -459,8 +715,12 @@ class _ymd(list):
                     year, day, month = self
 
             else:
+                tokens = self.tokens
+                if tokens is None:
+                    tokens = _timelex.split(self.tzstr)
+
                 if self[0] > 31 or \
-                    self.find_probable_year_index(_timelex.split(self.tzstr)) == 0 or \
+                    self.find_probable_year_index(tokens) == 0 or \
                    (yearfirst and self[1] <= 12 and self[2] <= 31):
                     # 99-01-01
                     year, month, day = self
@@ -474,11 +734,193 @@ class _ymd(list):
         return year, month, day
 
 
+class parseddate(object):
+    """
+    A parsed date/time which stands in for the :class:`datetime.datetime`
+    :meth:`parser.parse` would return, as returned with ``lazy=True``.
+
+    Its fields (``year`` to ``microsecond``), :meth:`date` and :meth:`time`
+    are read from the parsed string. Anything else, such as ``tzinfo``,
+    :meth:`isoformat` or comparisons, builds the
+    :class:`datetime.datetime` (once) and defers to it; :meth:`datetime`
+    returns it. It compares and hashes as the :class:`datetime.datetime`
+    does, but isn't an instance of it.
+
+    It isn't meant to be created directly.
+    """
+    __slots__ = ["year", "month", "day", "hour", "minute", "second",
+                 "microsecond", "_parser", "_res", "_default", "_ignoretz",
+                 "_tzinfos", "_datetime"]
+
+    def __init__(self, parser, res, default, ignoretz, tzinfos):
+        # Which checks the fields as building the datetime would
+        (self.year, self.month, self.day, self.hour, self.minute,
+         self.second, self.microsecond) = parser._fields_of(res, default)[:7]
+        self._parser = parser
+        self._res = res
+        self._default = default
+        self._ignoretz = ignoretz
+        self._tzinfos = tzinfos
+        self._datetime = None
+
+    def datetime(self):
+        """
+        The :class:`datetime.datetime` this stands in for.
+        """
+        if self._datetime is None:
+            parser = self._parser
+            ret = parser._build(self._res, self._default)
+            if not self._ignoretz:
+                ret = parser._build_tz(ret, self._res, self._tzinfos)
+            self._datetime = ret
+
+            # Only needed to build it
+            self._parser = self._res = self._default = self._tzinfos = None
+
+        return self._datetime
+
+    def date(self):
+        return datetime.date(self.year, self.month, self.day)
+
+    def time(self):
+        return datetime.time(self.hour, self.minute, self.second,
+                             self.microsecond)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            # e.g. a slot not yet set while copying
+            raise AttributeError(name)
+        return getattr(self.datetime(), name)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.datetime())
+
+    def __str__(self):
+        return str(self.datetime())
+
+    def __format__(self, format_spec):
+        return format(self.datetime(), format_spec)
+
+    def __hash__(self):
+        return hash(self.datetime())
+
+    def __eq__(self, other):
+        if isinstance(other, parseddate):
+            other = other.datetime()
+        return self.datetime() == other
+
+    def __ne__(self, other):
+        if isinstance(other, parseddate):
+            other = other.datetime()
+        return self.datetime() != other
+
+    def __lt__(self, other):
+        if isinstance(other, parseddate):
+            other = other.datetime()
+        return self.datetime() < other
+
+    def __le__(self, other):
+        if isinstance(other, parseddate):
+            other = other.datetime()
+        return self.datetime() <= other
+
+    def __gt__(self, other):
+        if isinstance(other, parseddate):
+            other = other.datetime()
+        return self.datetime() > other
+
+    def __ge__(self, other):
+        if isinstance(other, parseddate):
+            other = other.datetime()
+        return self.datetime() >= other
+
+    def __add__(self, other):
+        return self.datetime() + other
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, parseddate):
+            other = other.datetime()
+        return self.datetime() - other
+
+    def __rsub__(self, other):
+        return other - self.datetime()
+
+
+
 class parser(object):
-    def __init__(self, info=None):
+    # YYYY-MM-DD[THH:MM[:SS[.ffffff]]][Z|+HH[[:]MM]], which parse() reads
+    # directly instead of going through _parse()
+    _iso_format = re.compile(r"""
+        (\d{4})-(\d{2})-(\d{2})
+        (?:([T ])(\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?
+            (?:(Z)|([+-])(\d{2})(?::?(\d{2}))?)?)?
+        \Z""", re.VERBOSE | re.ASCII)
+
+    # _parse() keyword arguments which don't change how _parse_iso() reads
+    # a string
+    _iso_kwargs = frozenset(["dayfirst", "yearfirst", "fuzzy"])
+
+    # What _screen() splits a string without numbers into: the tokens
+    # _timelex would give, less their decimal splitting, which needs digits
+    _screen_tokens = re.compile(r"[^\W\d_]+|.", re.DOTALL)
+    _screen_digit = re.compile(r"\d")
+
+    # All of _parse()'s keyword arguments
+    _parse_kwargs = frozenset(["dayfirst", "yearfirst", "fuzzy",
+                               "fuzzy_with_tokens"])
+
+    def __init__(self, info=None, plan_cache_size=128, cache_size=0,
+                 screen=False, max_length=None, null_values=()):
+        """
+        :param info:
+            The :class:`parserinfo` object to use, a default one if ``None``.
+
+        :param plan_cache_size:
+            The number of parse plans to keep. The first time the parser reads
+            a string, it records where in it each field was found; strings of
+            the same shape (the same but for their digits) parsed with the
+            same options are then read straight from those positions. ``0``
+            disables the cache.
+
+        :param cache_size:
+            The number of results of :meth:`parse` to keep, ``0`` (the
+            default) for none. Results are cached under the string and every
+            argument they depend on: ``default`` (today's date when omitted),
+            ``ignoretz``, ``tzinfos``, ``dayfirst``, ``yearfirst``, ``fuzzy``
+            and ``fuzzy_with_tokens``. ``tzinfos`` is compared by identity, so
+            call :meth:`cache_clear` after changing a ``tzinfos`` dictionary
+            in place.
+
+        :param screen:
+            Whether to look over strings without any numbers for a month or
+            weekday name before parsing them. Strings with neither are
+            rejected without being parsed, with the same error parsing them
+            would give.
+
+        :param max_length:
+            If not ``None``, strings longer than this are rejected with a
+            :class:`ValueError` without being parsed.
+
+        :param null_values:
+            Strings which stand for a missing value, such as ``"N/A"``, for
+            which :meth:`parse` returns ``None``. They are matched ignoring
+            case and surrounding whitespace.
+        """
         self.info = info or parserinfo()
-
-    def parse(self, timestr, default=None, ignoretz=False, tzinfos=None, **kwargs):
+        self._plan_cache_size = plan_cache_size
+        self._plans = OrderedDict()
+        self._plan_hits = self._plan_misses = 0
+        self._cache_size = cache_size
+        self._results = OrderedDict()
+        self._hits = self._misses = 0
+        self._screen = screen
+        self._max_length = max_length
+        self._null_values = frozenset(x.strip().lower() for x in null_values)
+
+    def parse(self, timestr, default=None, ignoretz=False, tzinfos=None,
+              lazy=False, **kwargs):
         """
         Parse the date/time string into a :class:`datetime.datetime` object.
 
@@ -519,6 +961,12 @@ class parser(object):
 
             This parameter is ignored if ``ignoretz`` is set.
 
+        :param lazy:
+            If ``True``, return a :class:`parseddate` in place of the
+            :class:`datetime.datetime`, which builds it, and looks up its time
+            zone, only when it is first needed. Errors in the time zone are
+            then raised at that point.
+
         :param **kwargs:
             Keyword arguments as passed to ``_parse()``.
 
@@ -539,13 +987,658 @@ class parser(object):
         """
 
         if default is None:
-            effective_dt = datetime.datetime.now()
-            default = datetime.datetime.now().replace(hour=0, minute=0,
-                                                      second=0, microsecond=0)
+            default = self._today()
+
+        if lazy:
+            return self._parse_lazy(timestr, default, ignoretz, tzinfos,
+                                    kwargs)
+
+        return self._parse_default(timestr, default, ignoretz, tzinfos,
+                                   kwargs)
+
+    def parse_many(self, timestrs, default=None, ignoretz=False, tzinfos=None,
+                   errors="raise", workers=None, chunksize=None, **kwargs):
+        """
+        Parse each of the date/time strings in ``timestrs`` as :meth:`parse`
+        does, with the same arguments. The arguments are checked and the
+        ``default`` is worked out once for the whole batch.
+
+        :param timestrs:
+            An iterable of date/time strings.
+
+        :param errors:
+            What to do with a string which can't be parsed: ``"raise"`` (the
+            default) raises the error, ``"coerce"`` gives ``None`` in its
+            place, and ``"return"`` gives the exception object.
+
+        :param workers:
+            If not ``None``, the number of processes to parse the strings in,
+            in chunks of ``chunksize`` strings. See
+            :class:`europarse.parallel.parsepool`, which also keeps its
+            processes for later batches.
+
+        :return:
+            Returns a list of the results, in the order of ``timestrs``.
+
+        :raises ValueError:
+            Raised if ``errors`` is unknown, if ``chunksize`` is given
+            without ``workers``, or as :meth:`parse` does if ``errors`` is
+            ``"raise"``.
+
+        :raises TypeError:
+            Raised for an unknown keyword argument.
+        """
+        self._check_many(errors, kwargs)
+
+        if chunksize is not None and workers is None:
+            raise ValueError("chunksize can only be given with workers")
+
+        if default is None:
+            default = self._today()
+
+        if workers is not None:
+            # parallel imports this module
+            from . import parallel
+
+            with parallel.parsepool(workers, parser=self, chunksize=chunksize,
+                                    default=default, ignoretz=ignoretz,
+                                    tzinfos=tzinfos, errors=errors,
+                                    **kwargs) as pool:
+                return pool.parse_many(timestrs)
+
+        parse = self._parse_default
+        if errors == "raise":
+            return [parse(timestr, default, ignoretz, tzinfos, kwargs)
+                    for timestr in timestrs]
+
+        if errors == "coerce":
+            try_parse = self._try_parse_default
+            return [try_parse(timestr, default, ignoretz, tzinfos, kwargs)[0]
+                    for timestr in timestrs]
+
+        results = []
+        for timestr in timestrs:
+            try:
+                results.append(parse(timestr, default, ignoretz, tzinfos,
+                                     kwargs))
+            except (ValueError, OverflowError) as e:
+                results.append(e)
+
+        return results
+
+    def parse_column(self, values, **kwargs):
+        """
+        Parse a column of date/time strings as :meth:`parse_many` does, with
+        the same arguments, parsing each distinct string only once. Suits
+        columns which repeat their values, such as timestamps to the second
+        of a large log; the strings which are equal share one result.
+
+        :param values:
+            An iterable of date/time strings.
+
+        :return:
+            Returns a list of the results, in the order of ``values``.
+        """
+        # Each string's index in the (ordered) table of distinct strings
+        index = {}
+        codes = [index.setdefault(value, len(index)) for value in values]
+
+        results = self.parse_many(list(index), **kwargs)
+        return list(map(results.__getitem__, codes))
+
+    def parse_detect(self, timestrs, default=None, ignoretz=False,
+                     tzinfos=None, errors="raise", **kwargs):
+        """
+        Parse a column of date/time strings as :meth:`parse_many` does, with
+        the same arguments, working out from the column itself whether its
+        ambiguous dates (e.g. 01/05/09) put the day or the month first.
+
+        Each string is read once, up to the point where its year, month and
+        day are placed. A date whose first number is over 12 (e.g. 25/09/03)
+        votes for the day first, one whose second number is over 12 (e.g.
+        09/25/03) for the month first; the whole column is then read with the
+        setting with more votes, or with ``dayfirst`` (by default
+        :attr:`parserinfo.dayfirst`) if neither has more.
+
+        :param timestrs:
+            An iterable of date/time strings.
+
+        :return:
+            Returns a named tuple of:
+
+            - ``results``: the list of the results, in the order of
+              ``timestrs``.
+            - ``dayfirst``: the setting the column was read with.
+            - ``conflicts``: the list of the indices of the strings which
+              voted for the other setting. They are still read as their
+              numbers allow, but suggest a column of mixed formats.
+
+        :raises ValueError:
+            Raised if ``errors`` is unknown, or as :meth:`parse` does if
+            ``errors`` is ``"raise"``.
+
+        :raises TypeError:
+            Raised for an unknown keyword argument.
+        """
+        self._check_many(errors, kwargs)
+        if kwargs.get("fuzzy_with_tokens"):
+            raise TypeError("fuzzy_with_tokens isn't supported")
+
+        if default is None:
+            default = self._today()
+
+        info = self.info
+        dayfirst = kwargs.get("dayfirst")
+        if dayfirst is None:
+            dayfirst = info.dayfirst
+        yearfirst = kwargs.get("yearfirst")
+        if yearfirst is None:
+            yearfirst = info.yearfirst
+        fuzzy = kwargs.get("fuzzy", False)
+        iso = self._iso_kwargs.issuperset(kwargs)
+
+        # Read each string up to its year, month and day, which are held
+        # back until the vote is in. A row is the scanned string, None for a
+        # null value, or the error for a string which can't be parsed.
+        rows = []
+        votes = {True: [], False: []}
+        for timestr in timestrs:
+            if isinstance(timestr, str):
+                reason = self._screen_out(timestr, kwargs)
+                if reason is not None:
+                    if reason == "null":
+                        rows.append(None)
+                    else:
+                        rows.append(ValueError(self._screen_errors[reason]))
+                    continue
+
+                if iso:
+                    res = self._parse_iso(timestr)
+                    if res is not None:
+                        rows.append((res, None, -1))
+                        continue
+
+            try:
+                scanned, reason = self._scan(timestr, dayfirst, yearfirst,
+                                             fuzzy, False)
+            except OverflowError as e:
+                rows.append(e)
+                continue
+
+            if scanned is None:
+                rows.append(ValueError("Unknown string format"))
+                continue
+
+            res, ymd, mstridx, _, pending = scanned
+            if pending is not None:
+                # The plan doesn't depend on how the date is resolved
+                self._store_plan(*pending)
+
+            vote = ymd.dayfirst_vote(mstridx, yearfirst)
+            if vote is not None:
+                votes[vote].append(len(rows))
+            rows.append((res, ymd, mstridx))
+
+        if len(votes[not dayfirst]) > len(votes[dayfirst]):
+            dayfirst = not dayfirst
+
+        results = []
+        for row in rows:
+            try:
+                if isinstance(row, tuple):
+                    ret = self._detect_row(row, dayfirst, yearfirst, default,
+                                           ignoretz, tzinfos)
+                elif row is None:
+                    ret = None
+                else:
+                    raise row
+            except (ValueError, OverflowError) as e:
+                if errors == "raise":
+                    raise
+                ret = None if errors == "coerce" else e
+            results.append(ret)
+
+        return _detection(results, dayfirst, votes[not dayfirst])
+
+    def _detect_row(self, row, dayfirst, yearfirst, default, ignoretz,
+                    tzinfos):
+        """
+        Private method which finishes reading a string scanned by
+        :meth:`parse_detect`, as :meth:`parse` would with ``dayfirst``.
+        """
+        res, ymd, mstridx = row
+        if ymd is not None and self._resolve(res, ymd, mstridx, dayfirst,
+                                             yearfirst) is not None:
+            raise ValueError("Unknown string format")
+
+        if len(res) == 0:
+            raise ValueError("String does not contain a date.")
+
+        ret = self._build(res, default)
+        if not ignoretz:
+            ret = self._build_tz(ret, res, tzinfos)
+
+        return ret
+
+    def parse_candidates(self, timestr, default=None, ignoretz=False,
+                         tzinfos=None, fuzzy=False):
+        """
+        Parse the date/time string as :meth:`parse` does, with the same
+        arguments, giving what it would read with each of the ``dayfirst``
+        and ``yearfirst`` settings. The string is read once, up to the point
+        where its year, month and day are placed, which is then tried for
+        each setting.
+
+        :return:
+            Returns a named tuple of:
+
+            - ``results``: a list of the distinct results, each a named tuple
+              of the ``datetime``, and the ``settings`` which give it, a
+              tuple of ``(dayfirst, yearfirst)`` pairs. They are in the order
+              of the first of their settings, out of ``(False, False)``,
+              ``(True, False)``, ``(False, True)`` and ``(True, True)``.
+            - ``ambiguous``: whether there is more than one result.
+
+            A string in ``null_values`` gives ``None``.
+
+        :raises ValueError:
+            Raised as :meth:`parse` raises it, if the string can't be parsed
+            with any of the settings.
+
+        :raises OverflowError:
+            Raised as :meth:`parse` raises it.
+        """
+        if default is None:
+            default = self._today()
+
+        if isinstance(timestr, str):
+            reason = self._screen_out(timestr, {"fuzzy": fuzzy})
+            if reason is not None:
+                if reason == "null":
+                    return None
+                raise ValueError(self._screen_errors[reason])
+
+        # ISO 8601 strings read directly are read the same with any setting
+        res = None
+        if isinstance(timestr, str):
+            res = self._parse_iso(timestr)
+
+        if res is not None:
+            ret = self._build(res, default)
+            if not ignoretz:
+                ret = self._build_tz(ret, res, tzinfos)
+            return _candidates([_candidate(ret, _SETTINGS)], False)
+
+        info = self.info
+        scanned, reason = self._scan(timestr, info.dayfirst, info.yearfirst,
+                                     fuzzy, False)
+        if scanned is None:
+            raise ValueError("Unknown string format")
+
+        res, ymd, mstridx, _, pending = scanned
+        if pending is not None:
+            # The plan doesn't depend on how the date is resolved
+            self._store_plan(*pending)
+
+        # Each setting resolves the year, month and day values left by the
+        # scan, and the distinct dates they give are read into the result
+        error = ValueError("Unknown string format")
+        results = []
+        built = {}
+        for setting in _SETTINGS:
+            dayfirst, yearfirst = setting
+            try:
+                fields = ymd.copy().resolve_ymd(mstridx, yearfirst, dayfirst)
+            except (IndexError, ValueError, AssertionError):
+                continue
+
+            if fields not in built:
+                built[fields] = self._candidate(res, fields, ymd, default,
+                                                ignoretz, tzinfos)
+            ret = built[fields]
+            if isinstance(ret, Exception):
+                error = ret
+                continue
+
+            # The time zone is read the same way for each setting (and an
+            # aware comparison would check its offset)
+            for i, (other, settings) in enumerate(results):
+                if other.replace(tzinfo=None) == ret.replace(tzinfo=None):
+                    results[i] = _candidate(other, settings + (setting,))
+                    break
+            else:
+                results.append(_candidate(ret, (setting,)))
+
+        if not results:
+            raise error
+
+        return _candidates(results, len(results) > 1)
+
+    def _candidate(self, res, fields, ymd, default, ignoretz, tzinfos):
+        """
+        Private method which builds the result of :meth:`parse_candidates`
+        for the year, month and day ``fields`` resolved from ``ymd``, or
+        returns the error for a date which can't be built.
+        """
+        year, month, day = fields
+        res.year, res.month, res.day = year, month, day
+        if year is not None:
+            res.century_specified = ymd.century_specified
+
+        if not self.info.validate(res):
+            return ValueError("Unknown string format")
+
+        if len(res) == 0:
+            raise ValueError("String does not contain a date.")
+
+        try:
+            ret = self._build(res, default)
+        except (ValueError, OverflowError) as e:
+            return e
+
+        if not ignoretz:
+            ret = self._build_tz(ret, res, tzinfos)
+
+        return ret
+
+    def parse_iter(self, lines, field=None, delimiter=None, default=None,
+                   ignoretz=False, tzinfos=None, errors="raise", batchsize=1000,
+                   **kwargs):
+        """
+        Parse the date/time stamp in each of ``lines`` as :meth:`parse` does,
+        with the same arguments, yielding the results as the lines are read.
+        Lines are read ``batchsize`` at a time, so only a batch is held in
+        memory, and the arguments are checked and the ``default`` is worked
+        out once for all of them.
+
+        :param lines:
+            An iterable of lines, such as a file object, in either text or
+            binary mode. Binary lines are decoded as UTF-8.
+
+        :param field:
+            Where the date/time stamp is in each line. If ``None`` (the
+            default) it is the whole line; if an integer, it is that column of
+            the line split on ``delimiter``; otherwise it is a regular
+            expression (as a string or compiled), and the stamp is its first
+            group, or the whole match if it has no groups. Lines without the
+            field are treated as strings which can't be parsed.
+
+        :param delimiter:
+            The column separator for an integer ``field``, by default runs of
+            whitespace, as with :meth:`str.split`.
+
+        :param errors:
+            What to do with a line which can't be parsed, as for
+            :meth:`parse_many`.
+
+        :return:
+            Returns a generator of the results, in the order of ``lines``.
+        """
+        self._check_many(errors, kwargs)
+
+        if default is None:
+            default = self._today()
+
+        if not (field is None or isinstance(field, int) or
+                hasattr(field, "search")):
+            field = re.compile(field)
+
+        return self._parse_lines(lines, field, delimiter, default, ignoretz,
+                                 tzinfos, errors, batchsize, kwargs)
+
+    def _parse_lines(self, lines, field, delimiter, default, ignoretz, tzinfos,
+                     errors, batchsize, kwargs):
+        """
+        Private generator which does the work of :meth:`parse_iter` once its
+        arguments are checked.
+        """
+        parse = self._parse_default
+        try_parse = self._try_parse_default
+
+        lines = iter(lines)
+        while True:
+            batch = list(itertools.islice(lines, batchsize))
+            if not batch:
+                break
+
+            for timestr in self._fields(batch, field, delimiter):
+                if timestr is None:
+                    if errors == "coerce":
+                        yield None
+                        continue
+
+                    e = ValueError("Line has no date/time field")
+                    if errors == "raise":
+                        raise e
+                    yield e
+                elif errors == "raise":
+                    yield parse(timestr, default, ignoretz, tzinfos, kwargs)
+                elif errors == "coerce":
+                    yield try_parse(timestr, default, ignoretz, tzinfos,
+                                    kwargs)[0]
+                else:
+                    try:
+                        ret = parse(timestr, default, ignoretz, tzinfos,
+                                    kwargs)
+                    except (ValueError, OverflowError) as e:
+                        ret = e
+                    yield ret
+
+    @staticmethod
+    def _fields(lines, field, delimiter):
+        """
+        Private method which picks the ``field`` of :meth:`parse_iter` out of
+        each of ``lines``, giving ``None`` for a line without it.
+        """
+        if lines and isinstance(lines[0], bytes):
+            lines = [line.decode() for line in lines]
+
+        if field is None:
+            return [line.strip() for line in lines]
+
+        fields = []
+        if isinstance(field, int):
+            for line in lines:
+                columns = line.split(delimiter)
+                try:
+                    fields.append(columns[field].strip())
+                except IndexError:
+                    fields.append(None)
         else:
-            effective_dt = default
+            group = 1 if field.groups else 0
+            for line in lines:
+                m = field.search(line)
+                fields.append(None if m is None else m.group(group))
+
+        return fields
 
-        res, skipped_tokens = self._parse(timestr, **kwargs)
+    def _check_many(self, errors, kwargs):
+        """
+        Private method which checks the ``errors`` and ``_parse()`` keyword
+        arguments to :meth:`parse_many`.
+        """
+        if errors not in ("raise", "coerce", "return"):
+            raise ValueError("errors must be one of 'raise', 'coerce' or "
+                             "'return', not %r" % (errors,))
+
+        for name in kwargs:
+            if name not in self._parse_kwargs:
+                raise TypeError("parse_many() got an unexpected keyword "
+                                "argument %r" % (name,))
+
+    def __getstate__(self):
+        # A copy of the parser, e.g. in another process, starts with empty
+        # caches
+        state = self.__dict__.copy()
+        state["_plans"] = OrderedDict()
+        state["_plan_hits"] = state["_plan_misses"] = 0
+        state["_results"] = OrderedDict()
+        state["_hits"] = state["_misses"] = 0
+        return state
+
+    @staticmethod
+    def _today():
+        """
+        Midnight of today, which the fields missing from a string default to.
+        """
+        return datetime.datetime.combine(datetime.date.today(),
+                                         datetime.time())
+
+    def _parse_default(self, timestr, default, ignoretz, tzinfos, kwargs):
+        """
+        Private method which does the work of :meth:`parse` once ``default``
+        is known.
+        """
+        if isinstance(timestr, str):
+            reason = self._screen_out(timestr, kwargs)
+            if reason is not None:
+                if reason == "null":
+                    return None
+                raise ValueError(self._screen_errors[reason])
+
+        key = self._cache_key(timestr, default, ignoretz, tzinfos, kwargs)
+        if key is not None:
+            ret = self._cache_get(key, tzinfos)
+            if ret is not None:
+                return ret
+
+        res, skipped_tokens = self._parse_res(timestr, kwargs)
+        ret = self._build(res, default)
+
+        if not ignoretz:
+            ret = self._build_tz(ret, res, tzinfos)
+
+        if kwargs.get('fuzzy_with_tokens', False):
+            ret = ret, skipped_tokens
+
+        if key is not None:
+            self._cache_put(key, tzinfos, ret)
+
+        return ret
+
+    def _parse_lazy(self, timestr, default, ignoretz, tzinfos, kwargs):
+        """
+        Private method which does the work of :meth:`parse` for ``lazy``.
+        """
+        if isinstance(timestr, str):
+            reason = self._screen_out(timestr, kwargs)
+            if reason is not None:
+                if reason == "null":
+                    return None
+                raise ValueError(self._screen_errors[reason])
+
+        res, skipped_tokens = self._parse_res(timestr, kwargs)
+        ret = parseddate(self, res, default, ignoretz, tzinfos)
+
+        if kwargs.get('fuzzy_with_tokens', False):
+            ret = ret, skipped_tokens
+
+        return ret
+
+    def try_parse(self, timestr, default=None, ignoretz=False, tzinfos=None,
+                  **kwargs):
+        """
+        Parse the date/time string as :meth:`parse` does, but report a string
+        which can't be parsed instead of raising an error for it.
+
+        :return:
+            Returns a tuple of what :meth:`parse` would return and ``None``,
+            or of ``None`` and the reason the string can't be parsed, one of:
+
+            - ``"unknown-token"``: a word which isn't part of a date, or of
+              the words to skip (see ``fuzzy``).
+            - ``"unexpected-number"``: a number which can't be placed.
+            - ``"bad-time"``: an ``HH:`` not followed by the minutes.
+            - ``"bad-tzoffset"``: a ``+``/``-`` not followed by an offset.
+            - ``"truncated"``: the string ends part way through a field.
+            - ``"invalid"``: fields which can't be read together, such as an
+              AM/PM flag without an hour, or more than three date values.
+            - ``"no-date"``: nothing was read from the string.
+            - ``"out-of-range"``: the date doesn't exist, e.g. February 30.
+            - ``"overflow"``: the year can't be represented.
+            - ``"too-long"``: the string is longer than ``max_length``.
+
+            A string in ``null_values`` gives ``(None, None)``.
+
+        :raises ValueError:
+            Raised if ``tzinfos`` gives an invalid time zone.
+        """
+        if default is None:
+            default = self._today()
+
+        return self._try_parse_default(timestr, default, ignoretz, tzinfos,
+                                       kwargs)
+
+    def _try_parse_default(self, timestr, default, ignoretz, tzinfos,
+                           kwargs):
+        """
+        Private method which does the work of :meth:`try_parse` once
+        ``default`` is known.
+        """
+        if isinstance(timestr, str):
+            reason = self._screen_out(timestr, kwargs)
+            if reason is not None:
+                if reason == "null":
+                    return None, None
+                return None, reason
+
+        key = self._cache_key(timestr, default, ignoretz, tzinfos, kwargs)
+        if key is not None:
+            ret = self._cache_get(key, tzinfos)
+            if ret is not None:
+                return ret, None
+
+        res = None
+        if isinstance(timestr, str) and self._iso_kwargs.issuperset(kwargs):
+            res = self._parse_iso(timestr)
+            skipped_tokens = None
+
+        if res is None:
+            try:
+                res, skipped_tokens = self._parse(timestr, **kwargs)
+            except OverflowError:
+                # e.g. "inf" read as a year
+                return None, "overflow"
+
+            if res is None:
+                # which is then the reason
+                return None, skipped_tokens
+
+        if len(res) == 0:
+            return None, "no-date"
+
+        try:
+            ret = self._build(res, default)
+        except ValueError:
+            return None, "out-of-range"
+        except OverflowError:
+            return None, "overflow"
+
+        if not ignoretz:
+            ret = self._build_tz(ret, res, tzinfos)
+
+        if kwargs.get('fuzzy_with_tokens', False):
+            ret = ret, skipped_tokens
+
+        if key is not None:
+            self._cache_put(key, tzinfos, ret)
+
+        return ret, None
+
+    def _parse_res(self, timestr, kwargs):
+        """
+        Private method which reads ``timestr`` into a ``_result``, directly if
+        it is an ISO 8601 string ``_parse()`` would read the same way, and
+        returns it with the skipped tokens, raising ``ValueError`` as
+        :meth:`parse` does if there isn't one.
+        """
+        res = None
+        if isinstance(timestr, str) and self._iso_kwargs.issuperset(kwargs):
+            res = self._parse_iso(timestr)
+            skipped_tokens = None
+
+        if res is None:
+            res, skipped_tokens = self._parse(timestr, **kwargs)
 
         if res is None:
             raise ValueError("Unknown string format")
@@ -553,6 +1646,280 @@ class parser(object):
         if len(res) == 0:
             raise ValueError("String does not contain a date.")
 
+        return res, skipped_tokens
+
+    # Nanoseconds per unit of parse_epoch()
+    _epoch_units = {"s": 1000000000, "ms": 1000000, "us": 1000, "ns": 1}
+
+    def parse_epoch(self, timestr, unit="us", default=None, assume_tz=None,
+                    ignoretz=False, tzinfos=None, **kwargs):
+        """
+        Parse the date/time string into the number of ``unit`` since the Unix
+        epoch, 1970-01-01T00:00:00 UTC, for the time :meth:`parse` would
+        give. Unless a time zone object is involved (from ``tzinfos``,
+        ``assume_tz`` or ``default``), this is worked out from the parsed
+        fields and offset, without building the aware
+        :class:`datetime.datetime` and converting it.
+
+        :param timestr:
+            Any date/time string using the supported formats.
+
+        :param unit:
+            ``"s"``, ``"ms"``, ``"us"`` (the default) or ``"ns"``. Fractions
+            of seconds are kept to nine digits for ``"ns"``; the result is
+            rounded down to the ``unit``.
+
+        :param assume_tz:
+            The :class:`datetime.tzinfo` of a time which has no time zone, by
+            default UTC.
+
+        The other parameters are those of :meth:`parse`.
+
+        :return:
+            Returns an integer or, if the ``fuzzy_with_tokens`` option is
+            ``True``, a tuple of an integer and the fuzzy tokens. A string in
+            ``null_values`` gives ``None``.
+
+        :raises ValueError:
+            Raised as :meth:`parse` raises it, and for an unknown ``unit``.
+
+        :raises OverflowError:
+            Raised as :meth:`parse` raises it.
+        """
+        try:
+            scale = self._epoch_units[unit]
+        except KeyError:
+            raise ValueError("unit must be one of 's', 'ms', 'us' or 'ns', "
+                             "not %r" % (unit,))
+
+        if default is None:
+            default = self._today()
+
+        if isinstance(timestr, str):
+            reason = self._screen_out(timestr, kwargs)
+            if reason is not None:
+                if reason == "null":
+                    return None
+                raise ValueError(self._screen_errors[reason])
+
+        res, skipped_tokens = self._parse_res(timestr, kwargs)
+        ret = self._epoch(res, default, assume_tz, ignoretz, tzinfos) // scale
+
+        if kwargs.get('fuzzy_with_tokens', False):
+            ret = ret, skipped_tokens
+
+        return ret
+
+    def _epoch(self, res, default, assume_tz, ignoretz, tzinfos):
+        """
+        Private method which works out the nanoseconds since the epoch of the
+        time :meth:`_build` and :meth:`_build_tz` would build for ``res``.
+        """
+        offset = self._offset(res, ignoretz, tzinfos)
+        if offset is None:
+            if default.tzinfo is None and assume_tz is None:
+                offset = 0
+            else:
+                offset = _TZOBJECT
+
+        if offset is _TZOBJECT:
+            return self._epoch_slow(res, default, assume_tz, ignoretz,
+                                    tzinfos)
+
+        (_, _, _, hour, minute, second, microsecond, nanosecond,
+         days) = self._fields_of(res, default)
+
+        seconds = ((days - _EPOCH_ORDINAL)*86400 + hour*3600 + minute*60 +
+                   second - offset)
+        return (seconds*1000000 + microsecond)*1000 + nanosecond
+
+    def _offset(self, res, ignoretz, tzinfos):
+        """
+        Private method which gives the UTC offset in seconds
+        :meth:`_build_tz` would set for ``res``, ``None`` if it would leave
+        the time naive, or ``_TZOBJECT`` if it would set a time zone object,
+        whose offset may depend on the time.
+        """
+        if ignoretz or res.tzoffset is None and res.tzname is None:
+            return None
+
+        if (isinstance(tzinfos, Callable) or
+                tzinfos and res.tzname in tzinfos or
+                res.tzname and res.tzname in time.tzname):
+            return _TZOBJECT
+
+        offset = res.tzoffset
+        if offset is not None and not -86400 < offset < 86400:
+            raise ValueError("offset must be a timedelta strictly "
+                             "between -timedelta(hours=24) and "
+                             "timedelta(hours=24)")
+
+        return offset
+
+    def _fields_of(self, res, default):
+        """
+        Private method which gives the fields of the naive time
+        :meth:`_build` would build for ``res`` (year, month, day, hour,
+        minute, second, microsecond, and nanosecond), and its day ordinal,
+        without building it.
+        """
+        year = default.year if res.year is None else res.year
+        month = default.month if res.month is None else res.month
+        day = res.day
+        if day is None:
+            day = min(default.day, monthrange(year, month)[1])
+
+        hour = default.hour if res.hour is None else res.hour
+        minute = default.minute if res.minute is None else res.minute
+        second = default.second if res.second is None else res.second
+        if res.microsecond is None:
+            microsecond, nanosecond = default.microsecond, 0
+        else:
+            microsecond, nanosecond = res.microsecond, res.nanosecond or 0
+
+        # A naive datetime checks the fields as default.replace() in _build()
+        # does, and gives the day number
+        days = datetime.datetime(year, month, day, hour, minute, second,
+                                 microsecond).toordinal()
+        if res.weekday is not None and not res.day:
+            shift = (res.weekday - days + 1) % 7
+            if shift:
+                days += shift
+                if days > _MAX_ORDINAL:
+                    raise OverflowError("date value out of range")
+                date = datetime.date.fromordinal(days)
+                year, month, day = date.year, date.month, date.day
+
+        return (year, month, day, hour, minute, second, microsecond,
+                nanosecond, days)
+
+    def _epoch_slow(self, res, default, assume_tz, ignoretz, tzinfos):
+        """
+        Private method which does the work of :meth:`_epoch` for a time zone
+        object, by building the time.
+        """
+        ret = self._build(res, default)
+        if not ignoretz:
+            ret = self._build_tz(ret, res, tzinfos)
+        if ret.tzinfo is None and assume_tz is not None:
+            ret = ret.replace(tzinfo=assume_tz)
+
+        offset = ret.utcoffset()
+        ret = ret.replace(tzinfo=None)
+        if offset is not None:
+            ret -= offset
+
+        nanosecond = 0
+        if res.microsecond is not None:
+            nanosecond = res.nanosecond or 0
+
+        return (ret - _EPOCH) // _MICROSECOND * 1000 + nanosecond
+
+    def parse_fields(self, timestrs, default=None, ignoretz=False,
+                     tzinfos=None, **kwargs):
+        """
+        Parse each of the date/time strings in ``timestrs`` as :meth:`parse`
+        does, with the same arguments, into compact parallel arrays of the
+        fields of the results rather than a list of
+        :class:`datetime.datetime` objects.
+
+        :param timestrs:
+            An iterable of date/time strings.
+
+        :return:
+            Returns a named tuple of :class:`array.array` objects, with an
+            element for each string:
+
+            - ``year`` (type ``'h'``), ``month``, ``day``, ``hour``,
+              ``minute`` and ``second`` (type ``'b'``), and ``microsecond``
+              (type ``'l'``), the fields of the naive time.
+            - ``tzoffset`` (type ``'l'``), the UTC offset of the time in
+              seconds, or 0 if it has no time zone.
+            - ``aware`` (type ``'b'``), 1 if the time has a time zone.
+            - ``valid`` (type ``'b'``), 0 for a string which can't be parsed,
+              as :meth:`try_parse` reports, or is in ``null_values``; its
+              other fields are 0.
+
+        :raises ValueError:
+            Raised if ``tzinfos`` gives an invalid time zone.
+
+        :raises TypeError:
+            Raised for an unknown keyword argument.
+        """
+        self._check_many("coerce", kwargs)
+        if kwargs.get("fuzzy_with_tokens"):
+            raise TypeError("fuzzy_with_tokens isn't supported")
+
+        if default is None:
+            default = self._today()
+
+        columns = _fieldarrays(*[array(typecode)
+                                 for typecode in _FIELD_TYPECODES])
+        (years, months, days, hours, minutes, seconds, microseconds,
+         tzoffsets, aware, valid) = columns
+        invalid = (0,)*10
+
+        for timestr in timestrs:
+            fields = invalid
+            if (not isinstance(timestr, str) or
+                    self._screen_out(timestr, kwargs) is None):
+                fields = self._fields_row(timestr, default, ignoretz,
+                                          tzinfos, kwargs)
+
+            years.append(fields[0])
+            months.append(fields[1])
+            days.append(fields[2])
+            hours.append(fields[3])
+            minutes.append(fields[4])
+            seconds.append(fields[5])
+            microseconds.append(fields[6])
+            tzoffsets.append(fields[7])
+            aware.append(fields[8])
+            valid.append(fields[9])
+
+        return columns
+
+    def _fields_row(self, timestr, default, ignoretz, tzinfos, kwargs):
+        """
+        Private method which gives the elements of the arrays of
+        :meth:`parse_fields` for ``timestr``.
+        """
+        invalid = (0,)*10
+        try:
+            res = self._parse_res(timestr, kwargs)[0]
+            offset = self._offset(res, ignoretz, tzinfos)
+            if default.tzinfo is None and offset is not _TZOBJECT:
+                fields = self._fields_of(res, default)[:7]
+                if offset is None:
+                    return fields + (0, 0, 1)
+                return fields + (offset, 1, 1)
+
+            ret = self._build(res, default)
+        except (ValueError, OverflowError):
+            return invalid
+
+        # With a time zone object, the offset comes from the time
+        if not ignoretz:
+            ret = self._build_tz(ret, res, tzinfos)
+
+        offset = None
+        if ret.tzinfo is not None:
+            try:
+                offset = ret.utcoffset()
+            except ValueError:
+                return invalid
+
+        fields = (ret.year, ret.month, ret.day, ret.hour, ret.minute,
+                  ret.second, ret.microsecond)
+        if offset is None:
+            return fields + (0, 0, 1)
+        return fields + (offset // _SECOND, 1, 1)
+
+    def _build(self, res, default):
+        """
+        Private method which builds the naive :class:`datetime.datetime` for
+        a ``_parse()`` result, taking any missing fields from ``default``.
+        """
         repl = {}
         for attr in ("year", "month", "day", "hour",
                      "minute", "second", "microsecond"):
@@ -575,41 +1942,229 @@ class parser(object):
         if res.weekday is not None and not res.day:
             ret = ret+relativedelta.relativedelta(weekday=res.weekday)
 
-        if not ignoretz:
-            if (isinstance(tzinfos, Callable) or
-                    tzinfos and res.tzname in tzinfos):
+        return ret
 
-                if isinstance(tzinfos, Callable):
-                    tzdata = tzinfos(res.tzname, res.tzoffset)
-                else:
-                    tzdata = tzinfos.get(res.tzname)
-
-                if isinstance(tzdata, datetime.tzinfo):
-                    tzinfo = tzdata
-                elif isinstance(tzdata, str):
-                    tzinfo = tz.tzstr(tzdata)
-                elif isinstance(tzdata, int):
-                    tzinfo = tz.tzoffset(res.tzname, tzdata)
-                else:
-                    raise ValueError("Offset must be tzinfo subclass, "
-                                     "tz string, or int offset.")
-                ret = ret.replace(tzinfo=tzinfo)
-            elif res.tzname and res.tzname in time.tzname:
-                ret = ret.replace(tzinfo=tz.tzlocal())
-            elif res.tzoffset == 0:
-                ret = ret.replace(tzinfo=tz.tzutc())
-            elif res.tzoffset:
-                ret = ret.replace(tzinfo=tz.tzoffset(res.tzname, res.tzoffset))
+    def _build_tz(self, ret, res, tzinfos):
+        """
+        Private method which sets the time zone of ``ret`` from the one found
+        by ``_parse()``, looking it up in ``tzinfos`` first.
+        """
+        if (isinstance(tzinfos, Callable) or
+                tzinfos and res.tzname in tzinfos):
 
-        if kwargs.get('fuzzy_with_tokens', False):
-            return ret, skipped_tokens
-        else:
-            return ret
+            if isinstance(tzinfos, Callable):
+                tzdata = tzinfos(res.tzname, res.tzoffset)
+            else:
+                tzdata = tzinfos.get(res.tzname)
+
+            if isinstance(tzdata, datetime.tzinfo):
+                tzinfo = tzdata
+            elif isinstance(tzdata, str):
+                tzinfo = tz.tzstr(tzdata)
+            elif isinstance(tzdata, int):
+                tzinfo = tz.tzoffset(res.tzname, tzdata)
+            else:
+                raise ValueError("Offset must be tzinfo subclass, "
+                                 "tz string, or int offset.")
+            ret = ret.replace(tzinfo=tzinfo)
+        elif res.tzname and res.tzname in time.tzname:
+            ret = ret.replace(tzinfo=tz.tzlocal())
+        elif res.tzoffset == 0:
+            ret = ret.replace(tzinfo=tz.tzutc())
+        elif res.tzoffset:
+            ret = ret.replace(tzinfo=tz.tzoffset(res.tzname,
+                                                 res.tzoffset))
+
+        return ret
+
+    # The errors parse() raises for what _screen_out() finds
+    _screen_errors = {
+        "too-long": "String is too long",
+        "unknown-token": "Unknown string format",
+        "invalid": "Unknown string format",
+        "no-date": "String does not contain a date.",
+    }
+
+    def _screen_out(self, timestr, kwargs):
+        """
+        Private method which rules out strings without parsing them. Returns
+        ``None`` for a string to parse, ``"null"`` for one of the
+        ``null_values``, or the reason :meth:`try_parse` gives for a string
+        which can't be parsed.
+
+        A string without numbers, month or weekday names can at most be made
+        of words to skip, so it is enough to read the words in it as
+        ``_parse()`` would, without lexing it.
+        """
+        if self._null_values and timestr.strip().lower() in self._null_values:
+            return "null"
+
+        if self._max_length is not None and len(timestr) > self._max_length:
+            return "too-long"
+
+        if not self._screen or self._screen_digit.search(timestr):
+            return None
+
+        if not timestr.isascii():
+            # e.g. superscript digits, which are numbers but not \d
+            for c in timestr:
+                if c.isnumeric():
+                    return None
+
+        info = self.info
+        fuzzy = kwargs.get("fuzzy", False) or kwargs.get("fuzzy_with_tokens",
+                                                           False)
+        if '\x00' in timestr:
+            timestr = timestr.replace('\x00', '')
+
+        for token in self._screen_tokens.findall(timestr):
+            if token.isspace():
+                token = ' '
+            else:
+                token = token.lower()
+
+            if token in _FLOAT_WORDS:
+                return None
+
+            vocab = info.lookup(token)
+            if vocab.weekday is not None or vocab.month is not None:
+                return None
+
+            if fuzzy or vocab.jump:
+                continue
+
+            if vocab.ampm is not None:
+                # With no hour to go with it
+                return "invalid"
+            return "unknown-token"
+
+        if not info.validate(self._result()):
+            return "invalid"
+
+        return "no-date"
+
+    def _cache_key(self, timestr, default, ignoretz, tzinfos, kwargs):
+        """
+        Private method which returns the key under which the result for
+        these arguments is cached, or ``None`` if it isn't.
+        """
+        if (not self._cache_size or not isinstance(timestr, (str, bytes)) or
+                not self._parse_kwargs.issuperset(kwargs)):
+            return None
+
+        # Equal datetimes may still differ in tzinfo and fold, both of which
+        # carry through to the result
+        return (timestr, default, id(default.tzinfo), default.fold, ignoretz,
+                id(tzinfos), kwargs.get("dayfirst"), kwargs.get("yearfirst"),
+                kwargs.get("fuzzy", False),
+                kwargs.get("fuzzy_with_tokens", False))
+
+    def _cache_get(self, key, tzinfos):
+        """
+        Private method which returns the cached result for ``key``, or
+        ``None``.
+        """
+        cached = self._results.get(key)
+        # The tzinfos object is kept with the result, so its id can't be
+        # reused while the result is cached
+        if cached is None or cached[0] is not tzinfos:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        try:
+            self._results.move_to_end(key)
+        except KeyError:
+            pass
+        return cached[1]
+
+    def _cache_put(self, key, tzinfos, ret):
+        """
+        Private method which caches the result ``ret`` under ``key``.
+        """
+        results = self._results
+        results[key] = (tzinfos, ret)
+        while len(results) > self._cache_size:
+            try:
+                results.popitem(last=False)
+            except KeyError:
+                break
+
+    def cache_info(self):
+        """
+        Report on the cache of :meth:`parse` results, as a named tuple of
+        ``hits``, ``misses``, ``maxsize`` and ``currsize``.
+        """
+        return _cacheinfo(self._hits, self._misses, self._cache_size,
+                          len(self._results))
+
+    def cache_clear(self):
+        """
+        Empty the cache of :meth:`parse` results, and reset its statistics.
+        """
+        self._results.clear()
+        self._hits = self._misses = 0
 
     class _result(_resultbase):
         __slots__ = ["year", "month", "day", "weekday",
                      "hour", "minute", "second", "microsecond",
-                     "tzname", "tzoffset", "ampm"]
+                     "nanosecond", "tzname", "tzoffset", "ampm"]
+
+    def _parse_iso(self, timestr):
+        """
+        Private method which reads an ISO 8601 ``timestr`` matching
+        ``_iso_format`` into the same result ``_parse()`` would give for it,
+        without lexing it first. Returns ``None`` if ``timestr`` is in any
+        other format, or is one ``_parse()`` might read differently.
+        """
+        m = self._iso_format.match(timestr)
+        if m is None:
+            return None
+
+        (year, month, day, sep, hour, minute, second, fraction,
+         utc, sign, tzhour, tzminute) = m.groups()
+
+        # _ymd.resolve_ymd() only takes the first of three numbers to be the
+        # year (whatever dayfirst says) once it can't be a day.
+        year = int(year)
+        if year <= 31:
+            return None
+
+        info = self.info
+        res = self._result()
+        res.year = year
+        res.month = int(month)
+        res.day = int(day)
+        res.century_specified = True
+
+        if sep is not None:
+            if not info.lookup(sep.lower()).jump:
+                return None
+
+            res.hour = int(hour)
+            res.minute = int(minute)
+            if second is not None:
+                res.second = int(second)
+                if fraction is None:
+                    res.microsecond = res.nanosecond = 0
+                else:
+                    res.microsecond = int(fraction.ljust(6, "0")[:6])
+                    res.nanosecond = int(fraction[6:9].ljust(3, "0"))
+
+            if utc is not None:
+                res.tzname = utc
+                res.tzoffset = info.tzoffset(utc)
+            elif sign is not None:
+                res.tzoffset = int(tzhour)*3600
+                if tzminute is not None:
+                    res.tzoffset += int(tzminute)*60
+                if sign == '-':
+                    res.tzoffset = -res.tzoffset
+
+        if not info.validate(res):
+            return None
+
+        return res
 
     def _parse(self, timestr, dayfirst=None, yearfirst=None, fuzzy=False,
                fuzzy_with_tokens=False):
@@ -651,20 +2206,83 @@ class parser(object):
                 >>> parse("Today is January 1, 2047 at 8:21:00AM", fuzzy_with_tokens=True)
                 (datetime.datetime(2047, 1, 1, 8, 21), (u'Today is ', u' ', u'at '))
 
+        :return:
+            Returns a tuple of the result and the skipped tokens (``None``
+            unless ``fuzzy_with_tokens`` is set) or, if the string can't be
+            parsed, of ``None`` and the reason, as listed in
+            :meth:`try_parse`.
+        """
+        if fuzzy_with_tokens:
+            fuzzy = True
+
+        info = self.info
+
+        if dayfirst is None:
+            dayfirst = info.dayfirst
+
+        if yearfirst is None:
+            yearfirst = info.yearfirst
+
+        scanned, reason = self._scan(timestr, dayfirst, yearfirst, fuzzy,
+                                     fuzzy_with_tokens)
+        if scanned is None:
+            return None, reason
+
+        res, ymd, mstridx, skipped_tokens, pending = scanned
+        reason = self._resolve(res, ymd, mstridx, dayfirst, yearfirst)
+        if reason is not None:
+            return None, reason
+
+        if pending is not None:
+            self._store_plan(*pending)
+
+        if fuzzy_with_tokens:
+            return res, tuple(skipped_tokens)
+        else:
+            return res, None
+
+    def _scan(self, timestr, dayfirst, yearfirst, fuzzy, fuzzy_with_tokens):
         """
-        if fuzzy_with_tokens:
-            fuzzy = True
+        Private method which does the first stage of ``_parse()``: reading
+        the fields of ``timestr`` token by token, except for the year, month
+        and day, whose values are gathered for ``_resolve()`` to place.
 
+        :return:
+            Returns a tuple of ``None`` and the reason the string can't be
+            parsed, or of a tuple and ``None``. The tuple holds the result so
+            far, the ``_ymd`` values, the index of the month name among them
+            (or -1), the skipped tokens, and the arguments of
+            ``_store_plan()`` to cache the plan with once the string is
+            resolved, or ``None``.
+        """
         info = self.info
 
-        if dayfirst is None:
-            dayfirst = info.dayfirst
+        # Strings shaped like one parsed before are read by replaying the
+        # steps recorded for it, anything else is recorded in plan.
+        key = plan = None
+        if self._plan_cache_size and not fuzzy_with_tokens:
+            key = self._plan_key(timestr, dayfirst, yearfirst, fuzzy)
 
-        if yearfirst is None:
-            yearfirst = info.yearfirst
+        if key is not None:
+            cached = self._plans.get(key)
+            if cached is not None:
+                self._plan_hits += 1
+                try:
+                    self._plans.move_to_end(key)
+                except KeyError:
+                    pass
+                replayed, reason = self._replay(cached, timestr, fuzzy)
+                if replayed is None:
+                    return None, reason
+                return replayed + ([], None), None
+
+            self._plan_misses += 1
+            plan = []
 
         res = self._result()
-        l = _timelex.split(timestr)         # Splits the timestr into tokens
+        # Splits the timestr into tokens, and classifies them
+        l, kinds, values, lowered = _timelex.split_typed(timestr)
+        vocab = info.lookup_all(lowered)
 
         # keep up with the last token skipped so we can recombine
         # consecutively skipped tokens (-2 for when i begins at 0).
@@ -673,7 +2291,7 @@ class parser(object):
 
         try:
             # year/month/day list
-            ymd = _ymd(timestr)
+            ymd = _ymd(timestr, tokens=l)
 
             # Index of the month string in ymd
             mstridx = -1
@@ -683,20 +2301,16 @@ class parser(object):
             while i < len_l:
 
                 # Check if it's a number
-                try:
+                if kinds[i] == _NUMBER:
+                    value_idx = i
                     value_repr = l[i]
-                    value = float(value_repr)
-                except ValueError:
-                    value = None
-
-                if value is not None:
-                    # Token is a number
+                    value = values[i]
                     len_li = len(l[i])
                     i += 1
 
                     if (len(ymd) == 3 and len_li in (2, 4)
                         and res.hour is None and (i >= len_l or (l[i] != ':' and
-                                                  info.hms(l[i]) is None))):
+                                                  vocab[i].hms is None))):
                         # 19990101T23[59]
                         s = l[i-1]
                         res.hour = int(s[:2])
@@ -704,6 +2318,12 @@ class parser(object):
                         if len_li == 4:
                             res.minute = int(s[2:])
 
+                        if plan is not None:
+                            plan.append((_OP_INT, value_idx, 0, 2, 'hour'))
+                            if len_li == 4:
+                                plan.append((_OP_INT, value_idx, 2, None,
+                                             'minute'))
+
                     elif len_li == 6 or (len_li > 6 and l[i-1].find('.') == 6):
                         # YYMMDD or HHMMSS[.ss]
                         s = l[i-1]
@@ -714,11 +2334,23 @@ class parser(object):
                             ymd.append(s[:2])
                             ymd.append(s[2:4])
                             ymd.append(s[4:])
+
+                            if plan is not None:
+                                plan.append((_OP_YMD, value_idx, 0, 2))
+                                plan.append((_OP_YMD, value_idx, 2, 4))
+                                plan.append((_OP_YMD, value_idx, 4, None))
                         else:
                             # 19990101T235959[.59]
                             res.hour = int(s[:2])
                             res.minute = int(s[2:4])
-                            res.second, res.microsecond = _parsems(s[4:])
+                            (res.second, res.microsecond,
+                             res.nanosecond) = _parsems(s[4:])
+
+                            if plan is not None:
+                                plan.append((_OP_INT, value_idx, 0, 2, 'hour'))
+                                plan.append((_OP_INT, value_idx, 2, 4,
+                                             'minute'))
+                                plan.append((_OP_SECONDS, value_idx, 4))
 
                     elif len_li in (8, 12, 14):
                         # YYYYMMDD
@@ -734,15 +2366,28 @@ class parser(object):
                             if len_li > 12:
                                 res.second = int(s[12:])
 
-                    elif ((i < len_l and info.hms(l[i]) is not None) or
+                        if plan is not None:
+                            plan.append((_OP_YMD, value_idx, 0, 4))
+                            plan.append((_OP_YMD, value_idx, 4, 6))
+                            plan.append((_OP_YMD, value_idx, 6, 8))
+                            if len_li > 8:
+                                plan.append((_OP_INT, value_idx, 8, 10,
+                                             'hour'))
+                                plan.append((_OP_INT, value_idx, 10, 12,
+                                             'minute'))
+                            if len_li > 12:
+                                plan.append((_OP_INT, value_idx, 12, None,
+                                             'second'))
+
+                    elif ((i < len_l and vocab[i].hms is not None) or
                           (i+1 < len_l and l[i] == ' ' and
-                           info.hms(l[i+1]) is not None)):
+                           vocab[i+1].hms is not None)):
 
                         # HH[ ]h or MM[ ]m or SS[.ss][ ]s
                         if l[i] == ' ':
                             i += 1
 
-                        idx = info.hms(l[i])
+                        idx = vocab[i].hms
 
                         while True:
                             if idx == 0:
@@ -751,41 +2396,50 @@ class parser(object):
                                 if value % 1:
                                     res.minute = int(60*(value % 1))
 
+                                if plan is not None:
+                                    plan.append((_OP_HOUR, value_idx))
+
                             elif idx == 1:
                                 res.minute = int(value)
 
                                 if value % 1:
                                     res.second = int(60*(value % 1))
 
+                                if plan is not None:
+                                    plan.append((_OP_MINUTE, value_idx))
+
                             elif idx == 2:
-                                res.second, res.microsecond = \
+                                res.second, res.microsecond, res.nanosecond = \
                                     _parsems(value_repr)
 
+                                if plan is not None:
+                                    plan.append((_OP_SECONDS, value_idx, 0))
+
                             i += 1
 
                             if i >= len_l or idx == 2:
                                 break
 
                             # 12h00
-                            try:
-                                value_repr = l[i]
-                                value = float(value_repr)
-                            except ValueError:
+                            if kinds[i] != _NUMBER:
                                 break
-                            else:
-                                i += 1
-                                idx += 1
 
-                                if i < len_l:
-                                    newidx = info.hms(l[i])
+                            value_idx = i
+                            value_repr = l[i]
+                            value = values[i]
+                            i += 1
+                            idx += 1
+
+                            if i < len_l:
+                                newidx = vocab[i].hms
 
-                                    if newidx is not None:
-                                        idx = newidx
+                                if newidx is not None:
+                                    idx = newidx
 
                     elif (i == len_l and l[i-2] == ' ' and
-                          info.hms(l[i-3]) is not None):
+                          vocab[i-3].hms is not None):
                         # X h MM or X m SS
-                        idx = info.hms(l[i-3]) + 1
+                        idx = vocab[i-3].hms + 1
 
                         if idx == 1:
                             res.minute = int(value)
@@ -793,24 +2447,39 @@ class parser(object):
                             if value % 1:
                                 res.second = int(60*(value % 1))
                             elif idx == 2:
-                                res.second, res.microsecond = \
+                                res.second, res.microsecond, res.nanosecond = \
                                     _parsems(value_repr)
                                 i += 1
 
+                            if plan is not None:
+                                plan.append((_OP_MINUTE, value_idx))
+
                     elif i+1 < len_l and l[i] == ':':
                         # HH:MM[:SS[.ss]]
                         res.hour = int(value)
                         i += 1
-                        value = float(l[i])
+                        if kinds[i] != _NUMBER:
+                            return None, "bad-time"
+
+                        value = values[i]
                         res.minute = int(value)
 
                         if value % 1:
                             res.second = int(60*(value % 1))
 
+                        if plan is not None:
+                            plan.append((_OP_TRUNC, value_idx, 'hour'))
+                            plan.append((_OP_MINUTE, i))
+
                         i += 1
 
                         if i < len_l and l[i] == ':':
-                            res.second, res.microsecond = _parsems(l[i+1])
+                            (res.second, res.microsecond,
+                             res.nanosecond) = _parsems(l[i+1])
+
+                            if plan is not None:
+                                plan.append((_OP_SECONDS, i+1, 0))
+
                             i += 2
 
                     elif i < len_l and l[i] in ('-', '/', '.'):
@@ -818,27 +2487,36 @@ class parser(object):
                         ymd.append(value_repr)
                         i += 1
 
-                        if i < len_l and not info.jump(l[i]):
-                            try:
+                        if plan is not None:
+                            plan.append((_OP_YMD, value_idx, 0, None))
+
+                        if i < len_l and not vocab[i].jump:
+                            if l[i].isdecimal():
                                 # 01-01[-01]
                                 ymd.append(l[i])
-                            except ValueError:
+
+                                if plan is not None:
+                                    plan.append((_OP_YMD, i, 0, None))
+                            else:
                                 # 01-Jan[-01]
-                                value = info.month(l[i])
+                                value = vocab[i].month
 
                                 if value is not None:
                                     ymd.append(value)
                                     assert mstridx == -1
                                     mstridx = len(ymd)-1
+
+                                    if plan is not None:
+                                        plan.append((_OP_YMD_CONST, value))
                                 else:
-                                    return None, None
+                                    return None, "unknown-token"
 
                             i += 1
 
                             if i < len_l and l[i] == sep:
                                 # We have three members
                                 i += 1
-                                value = info.month(l[i])
+                                value = vocab[i].month
 
                                 if value is not None:
                                     ymd.append(value)
@@ -847,53 +2525,74 @@ class parser(object):
                                 else:
                                     ymd.append(l[i])
 
+                                    if plan is not None:
+                                        plan.append((_OP_YMD, i, 0, None))
+
                                 i += 1
-                    elif i >= len_l or info.jump(l[i]):
-                        if i+1 < len_l and info.ampm(l[i+1]) is not None:
+                    elif i >= len_l or vocab[i].jump:
+                        if i+1 < len_l and vocab[i+1].ampm is not None:
                             # 12 am
                             res.hour = int(value)
 
-                            if res.hour < 12 and info.ampm(l[i+1]) == 1:
+                            if res.hour < 12 and vocab[i+1].ampm == 1:
                                 res.hour += 12
-                            elif res.hour == 12 and info.ampm(l[i+1]) == 0:
+                            elif res.hour == 12 and vocab[i+1].ampm == 0:
                                 res.hour = 0
 
+                            if plan is not None:
+                                plan.append((_OP_AMPM_HOUR, value_idx,
+                                             vocab[i+1].ampm))
+
                             i += 1
                         else:
                             # Year, month or day
                             ymd.append(value)
+
+                            if plan is not None:
+                                plan.append((_OP_YMD_NUMBER, value_idx))
                         i += 1
-                    elif info.ampm(l[i]) is not None:
+                    elif vocab[i].ampm is not None:
 
                         # 12am
                         res.hour = int(value)
 
-                        if res.hour < 12 and info.ampm(l[i]) == 1:
+                        if res.hour < 12 and vocab[i].ampm == 1:
                             res.hour += 12
-                        elif res.hour == 12 and info.ampm(l[i]) == 0:
+                        elif res.hour == 12 and vocab[i].ampm == 0:
                             res.hour = 0
+
+                        if plan is not None:
+                            plan.append((_OP_AMPM_HOUR, value_idx,
+                                         vocab[i].ampm))
                         i += 1
 
                     elif not fuzzy:
-                        return None, None
+                        return None, "unexpected-number"
                     else:
                         i += 1
                     continue
 
                 # Check weekday
-                value = info.weekday(l[i])
+                value = vocab[i].weekday
                 if value is not None:
                     res.weekday = value
+
+                    if plan is not None:
+                        plan.append((_OP_SET, 'weekday', value))
+
                     i += 1
                     continue
 
                 # Check month name
-                value = info.month(l[i])
+                value = vocab[i].month
                 if value is not None:
                     ymd.append(value)
                     assert mstridx == -1
                     mstridx = len(ymd)-1
 
+                    if plan is not None:
+                        plan.append((_OP_YMD_CONST, value))
+
                     i += 1
                     if i < len_l:
                         if l[i] in ('-', '/'):
@@ -901,16 +2600,24 @@ class parser(object):
                             sep = l[i]
                             i += 1
                             ymd.append(l[i])
+
+                            if plan is not None:
+                                plan.append((_OP_YMD, i, 0, None))
+
                             i += 1
 
                             if i < len_l and l[i] == sep:
                                 # Jan-01-99
                                 i += 1
                                 ymd.append(l[i])
+
+                                if plan is not None:
+                                    plan.append((_OP_YMD, i, 0, None))
+
                                 i += 1
 
                         elif (i+3 < len_l and l[i] == l[i+2] == ' '
-                              and info.pertain(l[i+1])):
+                              and vocab[i+1].pertain):
                             # Jan of 01
                             # In this case, 01 is clearly year
                             try:
@@ -921,44 +2628,19 @@ class parser(object):
                             else:
                                 # Convert it here to become unambiguous
                                 ymd.append(str(info.convertyear(value)))
+
+                                if plan is not None:
+                                    plan.append((_OP_YMD_YEAR, i+3))
                             i += 4
                     continue
 
                 # Check am/pm
-                value = info.ampm(l[i])
+                value = vocab[i].ampm
                 if value is not None:
-                    # For fuzzy parsing, 'a' or 'am' (both valid English words)
-                    # may erroneously trigger the AM/PM flag. Deal with that
-                    # here.
-                    val_is_ampm = True
-
-                    # If there's already an AM/PM flag, this one isn't one.
-                    if fuzzy and res.ampm is not None:
-                        val_is_ampm = False
-
-                    # If AM/PM is found and hour is not, raise a ValueError
-                    if res.hour is None:
-                        if fuzzy:
-                            val_is_ampm = False
-                        else:
-                            raise ValueError('No hour specified with ' +
-                                             'AM or PM flag.')
-                    elif not 0 <= res.hour <= 12:
-                        # If AM/PM is found, it's a 12 hour clock, so raise 
-                        # an error for invalid range
-                        if fuzzy:
-                            val_is_ampm = False
-                        else:
-                            raise ValueError('Invalid hour specified for ' +
-                                             '12-hour clock.')
-
-                    if val_is_ampm:
-                        if value == 1 and res.hour < 12:
-                            res.hour += 12
-                        elif value == 0 and res.hour == 12:
-                            res.hour = 0
+                    self._apply_ampm(res, value, fuzzy)
 
-                        res.ampm = value
+                    if plan is not None:
+                        plan.append((_OP_AMPM, value))
 
                     i += 1
                     continue
@@ -980,11 +2662,15 @@ class parser(object):
                     if i < len_l and l[i] in ('+', '-'):
                         l[i] = ('+', '-')[l[i] == '+']
                         res.tzoffset = None
-                        if info.utczone(res.tzname):
+                        if vocab[i-1].utczone:
                             # With something like GMT+3, the timezone
                             # is *not* GMT.
                             res.tzname = None
 
+                    if plan is not None:
+                        plan.append((_OP_SET, 'tzname', res.tzname))
+                        plan.append((_OP_SET, 'tzoffset', res.tzoffset))
+
                     continue
 
                 # Check for a numbered timezone
@@ -996,33 +2682,43 @@ class parser(object):
                     if len_li == 4:
                         # -0300
                         res.tzoffset = int(l[i][:2])*3600+int(l[i][2:])*60
+                        op = (_OP_TZOFFSET, i, 2, i, 2, signal)
                     elif i+1 < len_l and l[i+1] == ':':
                         # -03:00
                         res.tzoffset = int(l[i])*3600+int(l[i+2])*60
+                        op = (_OP_TZOFFSET, i, None, i+2, 0, signal)
                         i += 2
                     elif len_li <= 2:
                         # -[0]3
                         res.tzoffset = int(l[i][:2])*3600
+                        op = (_OP_TZOFFSET, i, 2, None, None, signal)
                     else:
-                        return None, None
+                        return None, "bad-tzoffset"
                     i += 1
 
                     res.tzoffset *= signal
 
+                    if plan is not None:
+                        plan.append(op)
+
                     # Look for a timezone name between parenthesis
                     if (i+3 < len_l and
-                        info.jump(l[i]) and l[i+1] == '(' and l[i+3] == ')' and
+                        vocab[i].jump and l[i+1] == '(' and l[i+3] == ')' and
                         3 <= len(l[i+2]) <= 5 and
                         not [x for x in l[i+2]
                              if x not in string.ascii_uppercase]):
                         # -0300 (BRST)
                         res.tzname = l[i+2]
+
+                        if plan is not None:
+                            plan.append((_OP_SET, 'tzname', res.tzname))
+
                         i += 4
                     continue
 
                 # Check jumps
-                if not (info.jump(l[i]) or fuzzy):
-                    return None, None
+                if not (vocab[i].jump or fuzzy):
+                    return None, "unknown-token"
 
                 if last_skipped_token_i == i - 1:
                     # recombine the tokens
@@ -1033,28 +2729,246 @@ class parser(object):
                 last_skipped_token_i = i
                 i += 1
 
-            # Process year/month/day
+        except IndexError:
+            return None, "truncated"
+        except (ValueError, AssertionError):
+            return None, "invalid"
+
+        pending = None
+        if plan is not None:
+            pending = (key, plan, timestr, l, kinds, mstridx)
+
+        return (res, ymd, mstridx, skipped_tokens, pending), None
+
+    def _resolve(self, res, ymd, mstridx, dayfirst, yearfirst):
+        """
+        Private method which does the second stage of ``_parse()``: placing
+        the year, month and day values gathered by ``_scan()`` in ``res``
+        (which uses up ``ymd``), and checking the result. Returns ``None``,
+        or the reason the string can't be parsed.
+        """
+        try:
             year, month, day = ymd.resolve_ymd(mstridx, yearfirst, dayfirst)
-            if year is not None:
-                res.year = year
-                res.century_specified = ymd.century_specified
+        except IndexError:
+            return "truncated"
+        except (ValueError, AssertionError):
+            return "invalid"
 
-            if month is not None:
-                res.month = month
+        if year is not None:
+            res.year = year
+            res.century_specified = ymd.century_specified
 
-            if day is not None:
-                res.day = day
+        if month is not None:
+            res.month = month
 
-        except (IndexError, ValueError, AssertionError):
-            return None, None
+        if day is not None:
+            res.day = day
 
-        if not info.validate(res):
-            return None, None
+        if not self.info.validate(res):
+            return "invalid"
 
-        if fuzzy_with_tokens:
-            return res, tuple(skipped_tokens)
-        else:
-            return res, None
+        return None
+
+    def _apply_ampm(self, res, value, fuzzy):
+        """
+        Private method which applies the AM/PM flag ``value`` of a word in the
+        string to the hour read so far.
+        """
+        # For fuzzy parsing, 'a' or 'am' (both valid English words)
+        # may erroneously trigger the AM/PM flag. Deal with that
+        # here.
+        val_is_ampm = True
+
+        # If there's already an AM/PM flag, this one isn't one.
+        if fuzzy and res.ampm is not None:
+            val_is_ampm = False
+
+        # If AM/PM is found and hour is not, raise a ValueError
+        if res.hour is None:
+            if fuzzy:
+                val_is_ampm = False
+            else:
+                raise ValueError('No hour specified with ' +
+                                 'AM or PM flag.')
+        elif not 0 <= res.hour <= 12:
+            # If AM/PM is found, it's a 12 hour clock, so raise
+            # an error for invalid range
+            if fuzzy:
+                val_is_ampm = False
+            else:
+                raise ValueError('Invalid hour specified for ' +
+                                 '12-hour clock.')
+
+        if val_is_ampm:
+            if value == 1 and res.hour < 12:
+                res.hour += 12
+            elif value == 0 and res.hour == 12:
+                res.hour = 0
+
+            res.ampm = value
+
+    def _plan_key(self, timestr, dayfirst, yearfirst, fuzzy):
+        """
+        Private method which returns the key under which the parse plan for
+        ``timestr`` is cached, or ``None`` if its plan can't be cached.
+
+        Two ASCII strings which only differ in their digits split into the
+        same tokens, with the same words, and ``_parse()`` takes the same
+        path through either of them, so their plans are the same.
+        """
+        if (not isinstance(timestr, str) or not timestr.isascii() or
+                '\x00' in timestr):
+            return None
+
+        return (timestr.encode('ascii').translate(_SHAPE_DIGITS),
+                dayfirst, yearfirst, fuzzy)
+
+    def _store_plan(self, key, plan, timestr, tokens, kinds, mstridx):
+        """
+        Private method which caches the steps ``plan`` which ``_parse()``
+        recorded while reading ``timestr``, pointing them at the positions of
+        the number tokens in the string.
+        """
+        spans = []
+        commas = []
+        numbers = {}
+        start = 0
+        for idx, token in enumerate(tokens):
+            stop = start + len(token)
+            if kinds[idx] == _NUMBER:
+                text = timestr[start:stop]
+                if text != token:
+                    if text.replace(',', '.') != token:
+                        return
+                    commas.append(len(spans))
+                numbers[idx] = len(spans)
+                spans.append((start, stop))
+            start = stop
+
+        if start != len(timestr):
+            return
+
+        ops = []
+        for op in plan:
+            if op[0] in _TOKEN_OPS:
+                if op[1] not in numbers:
+                    return
+                op = (op[0], numbers[op[1]]) + op[2:]
+
+                if op[0] == _OP_TZOFFSET and op[3] is not None:
+                    if op[3] not in numbers:
+                        return
+                    op = op[:3] + (numbers[op[3]],) + op[4:]
+            ops.append(op)
+
+        plans = self._plans
+        plans[key] = (tuple(ops), tuple(spans), tuple(commas), mstridx)
+        while len(plans) > self._plan_cache_size:
+            try:
+                plans.popitem(last=False)
+            except KeyError:
+                break
+
+    def _run_plan(self, plan, timestr, dayfirst, yearfirst, fuzzy):
+        """
+        Private method which reads ``timestr`` by replaying a parse plan
+        recorded by ``_parse()`` for another string of the same shape. Gives
+        the same result ``_parse()`` would, as a tuple of the result and the
+        reason for a failure.
+        """
+        replayed, reason = self._replay(plan, timestr, fuzzy)
+        if replayed is None:
+            return None, reason
+
+        res, ymd, mstridx = replayed
+        reason = self._resolve(res, ymd, mstridx, dayfirst, yearfirst)
+        if reason is not None:
+            return None, reason
+
+        return res, None
+
+    def _replay(self, plan, timestr, fuzzy):
+        """
+        Private method which does what ``_scan()`` does by replaying a parse
+        plan. Returns a tuple of the result so far, the ``_ymd`` values and
+        the index of the month name among them, and ``None``, or ``None``
+        and the reason the string can't be parsed.
+        """
+        ops, spans, commas, mstridx = plan
+        info = self.info
+        res = self._result()
+
+        tokens = [timestr[start:stop] for start, stop in spans]
+        for k in commas:
+            tokens[k] = tokens[k].replace(',', '.')
+
+        ymd = _ymd(timestr, tokens=tokens)
+
+        try:
+            for op in ops:
+                code = op[0]
+                if code == _OP_INT:
+                    setattr(res, op[4], int(tokens[op[1]][op[2]:op[3]]))
+                elif code == _OP_TRUNC:
+                    setattr(res, op[2], int(float(tokens[op[1]])))
+                elif code == _OP_HOUR:
+                    value = float(tokens[op[1]])
+                    res.hour = int(value)
+                    if value % 1:
+                        res.minute = int(60*(value % 1))
+                elif code == _OP_MINUTE:
+                    value = float(tokens[op[1]])
+                    res.minute = int(value)
+                    if value % 1:
+                        res.second = int(60*(value % 1))
+                elif code == _OP_SECONDS:
+                    res.second, res.microsecond, res.nanosecond = \
+                        _parsems(tokens[op[1]][op[2]:])
+                elif code == _OP_AMPM_HOUR:
+                    res.hour = int(float(tokens[op[1]]))
+                    if res.hour < 12 and op[2] == 1:
+                        res.hour += 12
+                    elif res.hour == 12 and op[2] == 0:
+                        res.hour = 0
+                elif code == _OP_YMD:
+                    ymd.append(tokens[op[1]][op[2]:op[3]])
+                elif code == _OP_YMD_NUMBER:
+                    ymd.append(float(tokens[op[1]]))
+                elif code == _OP_YMD_YEAR:
+                    ymd.append(str(info.convertyear(int(tokens[op[1]]))))
+                elif code == _OP_TZOFFSET:
+                    res.tzoffset = int(tokens[op[1]][:op[2]])*3600
+                    if op[3] is not None:
+                        res.tzoffset += int(tokens[op[3]][op[4]:])*60
+                    res.tzoffset *= op[5]
+                elif code == _OP_YMD_CONST:
+                    ymd.append(op[1])
+                elif code == _OP_AMPM:
+                    self._apply_ampm(res, op[1], fuzzy)
+                else:
+                    setattr(res, op[1], op[2])
+
+        except IndexError:
+            return None, "truncated"
+        except (ValueError, AssertionError):
+            return None, "invalid"
+
+        return (res, ymd, mstridx), None
+
+    def plan_cache_info(self):
+        """
+        Report on the cache of parse plans, as a named tuple of ``hits``,
+        ``misses``, ``maxsize`` and ``currsize``.
+        """
+        return _cacheinfo(self._plan_hits, self._plan_misses,
+                          self._plan_cache_size, len(self._plans))
+
+    def plan_cache_clear(self):
+        """
+        Empty the cache of parse plans, and reset its statistics.
+        """
+        self._plans.clear()
+        self._plan_hits = self._plan_misses = 0
 
 DEFAULTPARSER = parser()
 
@@ -1160,6 +3074,253 @@ def parse(timestr, parserinfo=None, **kwargs):
         return DEFAULTPARSER.parse(timestr, **kwargs)
 
 
+def try_parse(timestr, parserinfo=None, **kwargs):
+    """
+    Parse a string as :func:`parse` does, but report a string which can't be
+    parsed instead of raising an error for it.
+
+    :param timestr:
+        A string containing a date/time stamp.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the keyword arguments of :func:`parse`.
+
+    :return:
+        Returns a tuple of what :func:`parse` would return and ``None``, or of
+        ``None`` and the reason the string can't be parsed, as listed in
+        :meth:`parser.try_parse`.
+    """
+    if parserinfo:
+        return parser(parserinfo).try_parse(timestr, **kwargs)
+    else:
+        return DEFAULTPARSER.try_parse(timestr, **kwargs)
+
+
+def parse_epoch(timestr, unit="us", parserinfo=None, **kwargs):
+    """
+    Parse a string as :func:`parse` does, into the number of ``unit`` since
+    the Unix epoch.
+
+    .. doctest::
+
+        >>> from europarse.parser import parse_epoch
+        >>> parse_epoch("2003-09-25T10:49:41.123456789-03:00", unit="ns")
+        1064497781123456789
+
+    :param timestr:
+        A string containing a date/time stamp.
+
+    :param unit:
+        ``"s"``, ``"ms"``, ``"us"`` (the default) or ``"ns"``.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the keyword arguments of
+    :meth:`parser.parse_epoch`.
+
+    :return:
+        Returns an integer, as :meth:`parser.parse_epoch` does.
+    """
+    if parserinfo:
+        return parser(parserinfo).parse_epoch(timestr, unit, **kwargs)
+    else:
+        return DEFAULTPARSER.parse_epoch(timestr, unit, **kwargs)
+
+
+def parse_fields(timestrs, parserinfo=None, **kwargs):
+    """
+    Parse each of a batch of strings as :func:`parse` does, into parallel
+    arrays of the fields of the results.
+
+    .. doctest::
+
+        >>> from europarse.parser import parse_fields
+        >>> fields = parse_fields(["2003-09-25T10:49:41-03:00", "junk"])
+        >>> fields.year, fields.tzoffset, fields.valid
+        (array('h', [2003, 0]), array('l', [-10800, 0]), array('b', [1, 0]))
+
+    :param timestrs:
+        An iterable of date/time strings.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the keyword arguments of :func:`parse`,
+    except for ``fuzzy_with_tokens``.
+
+    :return:
+        Returns a named tuple of arrays, as listed in
+        :meth:`parser.parse_fields`.
+    """
+    if parserinfo:
+        return parser(parserinfo).parse_fields(timestrs, **kwargs)
+    else:
+        return DEFAULTPARSER.parse_fields(timestrs, **kwargs)
+
+
+def parse_column(values, parserinfo=None, **kwargs):
+    """
+    Parse a column of date/time strings as :func:`parse_many` does, parsing
+    each distinct string only once.
+
+    :param values:
+        An iterable of date/time strings.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the keyword arguments of
+    :func:`parse_many`.
+
+    :return:
+        Returns a list of the results, in the order of ``values``.
+    """
+    if parserinfo:
+        return parser(parserinfo).parse_column(values, **kwargs)
+    else:
+        return DEFAULTPARSER.parse_column(values, **kwargs)
+
+
+def parse_detect(timestrs, parserinfo=None, **kwargs):
+    """
+    Parse a column of date/time strings as :func:`parse_many` does, working
+    out from the column whether its ambiguous dates put the day or the month
+    first.
+
+    .. doctest::
+
+        >>> from europarse.parser import parse_detect
+        >>> found = parse_detect(["01/05/09", "25/12/09", "02/05/09"])
+        >>> found.dayfirst, found.conflicts
+        (True, [])
+        >>> found.results[0]
+        datetime.datetime(2009, 5, 1, 0, 0)
+
+    :param timestrs:
+        An iterable of date/time strings.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the keyword arguments of
+    :func:`parse_many`.
+
+    :return:
+        Returns a named tuple, as listed in :meth:`parser.parse_detect`.
+    """
+    if parserinfo:
+        return parser(parserinfo).parse_detect(timestrs, **kwargs)
+    else:
+        return DEFAULTPARSER.parse_detect(timestrs, **kwargs)
+
+
+def parse_candidates(timestr, parserinfo=None, **kwargs):
+    """
+    Parse the date/time string as :func:`parse` does, giving what it would
+    read with each of the ``dayfirst`` and ``yearfirst`` settings.
+
+    .. doctest::
+
+        >>> from europarse.parser import parse_candidates
+        >>> found = parse_candidates("01/05/09")
+        >>> found.ambiguous
+        True
+        >>> for result in found.results:
+        ...     print(result.datetime, result.settings)
+        2009-01-05 00:00:00 ((False, False),)
+        2009-05-01 00:00:00 ((True, False),)
+        2001-05-09 00:00:00 ((False, True), (True, True))
+
+    :param timestr:
+        Any date/time string using the supported formats.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the ``default``, ``ignoretz``,
+    ``tzinfos`` and ``fuzzy`` keyword arguments of :func:`parse`.
+
+    :return:
+        Returns a named tuple, as listed in :meth:`parser.parse_candidates`.
+    """
+    if parserinfo:
+        return parser(parserinfo).parse_candidates(timestr, **kwargs)
+    else:
+        return DEFAULTPARSER.parse_candidates(timestr, **kwargs)
+
+
+def parse_iter(lines, field=None, parserinfo=None, **kwargs):
+    """
+    Parse the date/time stamp in each of ``lines``, such as the lines of a log
+    file, using the ``parserinfo`` parameters, yielding the results as the
+    lines are read.
+
+    :param lines:
+        An iterable of lines, such as a file object, in either text or binary
+        mode.
+
+    :param field:
+        Where the date/time stamp is in each line: the whole line (``None``),
+        a column, or a regular expression; see :meth:`parser.parse_iter`.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the keyword arguments of
+    :meth:`parser.parse_iter`.
+
+    :return:
+        Returns a generator of the results, in the order of ``lines``.
+    """
+    if parserinfo:
+        return parser(parserinfo).parse_iter(lines, field, **kwargs)
+    else:
+        return DEFAULTPARSER.parse_iter(lines, field, **kwargs)
+
+
+def parse_many(timestrs, parserinfo=None, **kwargs):
+    """
+    Parse each of the date/time strings in ``timestrs``, using the
+    ``parserinfo`` parameters. Unlike calling :func:`parse` for each of them,
+    the parser is only set up once for the whole batch.
+
+    :param timestrs:
+        An iterable of date/time strings.
+
+    :param parserinfo:
+        A :class:`parserinfo` object containing parameters for the parser.
+        If ``None``, the default arguments to the :class:`parserinfo`
+        constructor are used.
+
+    The ``**kwargs`` parameter takes the keyword arguments of :func:`parse`,
+    and ``errors``, as described in :meth:`parser.parse_many`.
+
+    :return:
+        Returns a list of the results, in the order of ``timestrs``.
+    """
+    if parserinfo:
+        return parser(parserinfo).parse_many(timestrs, **kwargs)
+    else:
+        return DEFAULTPARSER.parse_many(timestrs, **kwargs)
+
+
 class _tzparser(object):
 
     class _result(_resultbase):
@@ -1340,13 +3501,21 @@ def _parsetz(tzstr):
     return DEFAULTTZPARSER.parse(tzstr)
 
 
+def _isdigits(token):
+    """Whether a token is all digits, disregarding dots and commas."""
+    return token.replace('.', '').replace(',', '').isdigit()
+
+
 def _parsems(value):
-    """Parse a I[.F] seconds value into (seconds, microseconds)."""
+    """
+    Parse a I[.F] seconds value into (seconds, microseconds, nanoseconds),
+    where the nanoseconds are those of F past its microseconds.
+    """
     if "." not in value:
-        return int(value), 0
+        return int(value), 0, 0
     else:
         i, f = value.split(".")
-        return int(i), int(f.ljust(6, "0")[:6])
+        return int(i), int(f.ljust(6, "0")[:6]), int(f[6:9].ljust(3, "0"))
 
 
 # vim:ts=4:sw=4:et
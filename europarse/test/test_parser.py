@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
+import itertools
+import re
 import unittest
 
 from datetime import datetime, timedelta
+from io import BytesIO, StringIO
 
-from europarse.tz import tzoffset
+from europarse.tz import tzoffset, tzutc
 from europarse.parser import *
+from europarse.parser import _timelex
 
 class ParserTest(unittest.TestCase):
 
@@ -725,6 +729,54 @@ class ParserTest(unittest.TestCase):
         dt = myparser.parse("01/Foo/2007")
         self.assertEqual(dt, datetime(2007, 1, 1))
 
+    def testCustomParserInfoJump(self):
+        from europarse.parser import parser
+
+        class myparserinfo(parserinfo):
+            JUMP = parserinfo.JUMP + ["um"]
+            HMS = [("h", "hour", "hours", "uhr"),
+                   ("m", "minute", "minutes"),
+                   ("s", "second", "seconds")]
+
+        myparser = parser(myparserinfo())
+        self.assertEqual(myparser.parse("um 10 Uhr, 25 Sep 2003"),
+                         datetime(2003, 9, 25, 10))
+        self.assertRaises(ValueError, parse, "um 10 Uhr, 25 Sep 2003")
+
+    def testCustomParserInfoMethods(self):
+        from europarse.parser import parser
+
+        class myparserinfo(parserinfo):
+            def jump(self, name):
+                return name == "le" or parserinfo.jump(self, name)
+
+            def month(self, name):
+                if name.startswith("brum"):
+                    return 2
+                return parserinfo.month(self, name)
+
+        myparser = parser(myparserinfo())
+        self.assertEqual(myparser.parse("le 3 brumaire 1799"),
+                         datetime(1799, 2, 3))
+        self.assertEqual(myparser.parse("le 4 brum 1799"),
+                         datetime(1799, 2, 4))
+        self.assertEqual(myparser.parse("25 Sep 2003"),
+                         datetime(2003, 9, 25))
+        le, foo = myparserinfo().lookup_all(["le", "foo"])
+        self.assertTrue(le.jump)
+        self.assertFalse(any(foo))
+
+    def testParserInfoLookup(self):
+        info = parserinfo()
+        self.assertEqual(info.lookup("sept").month, 9)
+        self.assertEqual(info.lookup("m").hms, 1)
+        self.assertTrue(info.lookup("m").jump)
+        self.assertTrue(info.lookup("of").pertain)
+        # Weekdays and months need at least three letters
+        self.assertIsNone(info.lookup("mo").weekday)
+        self.assertEqual(info.lookup_all(["foo", "pm"])[1].ampm, 1)
+        self.assertFalse(any(info.lookup("foo")))
+
     def testParseStr(self):
         self.assertEqual(parse(self.str_str),
                          parse(self.uni_str))
@@ -768,6 +820,1206 @@ class ParserTest(unittest.TestCase):
         self.assertEqual(parse('2022-04-08', dayfirst=True),
                          datetime(2022, 4, 8))
 
+    def testISOFormatDefault(self):
+        # Fields missing from an ISO string still come from the default
+        self.assertEqual(parse("2003-09-25T10:49",
+                               default=datetime(2000, 1, 1, 1, 2, 3, 4)),
+                         datetime(2003, 9, 25, 10, 49, 3, 4))
+        self.assertEqual(parse("2003-09-25T10:49:41",
+                               default=datetime(2000, 1, 1, 1, 2, 3, 4)),
+                         datetime(2003, 9, 25, 10, 49, 41))
+
+    def testISOFormatDayFirst(self):
+        self.assertEqual(parse("2003-09-05T10:49:41,25Z", dayfirst=True),
+                         datetime(2003, 9, 5, 10, 49, 41, 250000,
+                                  tzinfo=tzutc()))
+        self.assertEqual(parse("2003-09-05 10:49+0300", dayfirst=True,
+                               yearfirst=True),
+                         datetime(2003, 9, 5, 10, 49,
+                                  tzinfo=tzoffset(None, 10800)))
+
+    def testISOFormatTzinfos(self):
+        self.assertEqual(parse("2003-09-25T10:49:41-03:00",
+                               tzinfos=self.tzinfos, ignoretz=True),
+                         datetime(2003, 9, 25, 10, 49, 41))
+        self.assertEqual(parse("2003-09-25T10:49:41Z",
+                               tzinfos={"UTC": -10800}),
+                         datetime(2003, 9, 25, 10, 49, 41,
+                                  tzinfo=tzoffset("UTC", -10800)))
+
+    def testISOFormatCustomJump(self):
+        from europarse.parser import parser
+
+        class myparserinfo(parserinfo):
+            JUMP = [x for x in parserinfo.JUMP if x != "t"]
+
+        self.assertRaises(ValueError, parser(myparserinfo()).parse,
+                          "2003-09-25T10:49:41")
+
     def testInvalidNumericDate(self):
         with self.assertRaises(ValueError):
             parse("1991-93", dayfirst=True)
+
+
+class PlanCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        from europarse.parser import parser
+        self.parser = parser()
+        self.uncached = parser(plan_cache_size=0)
+
+    def assertSameParse(self, timestr, **kwargs):
+        kwargs.setdefault("default", datetime(2003, 9, 25))
+        try:
+            expected = self.uncached.parse(timestr, **kwargs)
+        except ValueError:
+            self.assertRaises(ValueError, self.parser.parse, timestr, **kwargs)
+        else:
+            self.assertEqual(self.parser.parse(timestr, **kwargs), expected)
+
+    def testReplay(self):
+        for timestr in ["25/09/2003 10:36:28", "01/02/2004 23:59:01",
+                        "31/12/1999 00:00:00"]:
+            self.assertSameParse(timestr, dayfirst=True)
+        info = self.parser.plan_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def testReplayFormats(self):
+        for fmt in ["Thu Sep %d 10:%d:28 BRST %d", "%d Sep %d at %d:36 pm",
+                    "%d.%d.%d", "%d-%d-%d T %d", "Sep %d %d 10:%d:28,1 -0300",
+                    "%dh%dm%ds", "%d %d %d 10:36:%d.5 GMT+3",
+                    "Sep of %d %d %d"]:
+            for values in [(25, 36, 2003, 10), (1, 0, 99, 23),
+                           (12, 12, 0, 7), (31, 59, 1, 5)]:
+                self.assertSameParse(fmt % values[:fmt.count("%")])
+
+    def testReplayKeyedOnOptions(self):
+        self.assertEqual(self.parser.parse("01/02/2003"),
+                         datetime(2003, 1, 2))
+        self.assertEqual(self.parser.parse("01/02/2003", dayfirst=True),
+                         datetime(2003, 2, 1))
+        self.assertEqual(self.parser.plan_cache_info().currsize, 2)
+
+    def testReplayInvalidValue(self):
+        self.assertSameParse("10 pm")
+        self.assertSameParse("13 pm")
+        self.assertSameParse("10:36 -0300")
+        self.assertSameParse("10:36 -03.0")
+        self.assertSameParse("35/15/2003")
+
+    def testReplayProbableYear(self):
+        self.assertSameParse("10-09-2003")
+        self.assertSameParse("10-09-0003")
+        self.assertSameParse("10-09-0010")
+
+    def testFuzzyWithTokensNotCached(self):
+        self.parser.parse("Today is 25 of September of 2003",
+                          fuzzy_with_tokens=True)
+        self.assertEqual(self.parser.plan_cache_info().misses, 0)
+
+    def testBounded(self):
+        from europarse.parser import parser
+        p = parser(plan_cache_size=2)
+        for timestr in ["2003", "10:36", "Sep 25", "2004"]:
+            p.parse(timestr)
+        info = p.plan_cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize,
+                          info.currsize), (0, 4, 2, 2))
+
+    def testClear(self):
+        self.parser.parse("10:36")
+        self.parser.parse("10:37")
+        self.parser.plan_cache_clear()
+        info = self.parser.plan_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+    def testDisabled(self):
+        self.uncached.parse("10:36")
+        self.uncached.parse("10:37")
+        info = self.uncached.plan_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        from europarse.parser import parser
+        self.parser = parser(cache_size=4)
+
+    def testHit(self):
+        dt = self.parser.parse("25 Sep 2003 10:36:28")
+        self.assertIs(self.parser.parse("25 Sep 2003 10:36:28"), dt)
+        info = self.parser.cache_info()
+        self.assertEqual(info, (1, 1, 4, 1))
+
+    def testKeyedOnOptions(self):
+        default = datetime(2003, 9, 25)
+        for kwargs in [{}, {"dayfirst": True}, {"yearfirst": True},
+                       {"default": default}, {"default": default.replace(
+                           tzinfo=tzutc())}]:
+            self.assertEqual(self.parser.parse("01/02/03 10:00", **kwargs),
+                             parse("01/02/03 10:00", **kwargs))
+        self.assertEqual(self.parser.cache_info().hits, 0)
+
+    def testKeyedOnIgnoreTz(self):
+        self.assertEqual(self.parser.parse("10:00 -0300").utcoffset(),
+                         timedelta(hours=-3))
+        self.assertIsNone(self.parser.parse("10:00 -0300",
+                                            ignoretz=True).tzinfo)
+
+    def testKeyedOnTzinfosIdentity(self):
+        brst = tzoffset("BRST", -10800)
+        dt = self.parser.parse("10:00 BRST", tzinfos={"BRST": brst})
+        self.assertEqual(dt.tzinfo, brst)
+        dt = self.parser.parse("10:00 BRST", tzinfos={"BRST": tzutc()})
+        self.assertEqual(dt.tzinfo, tzutc())
+        self.assertEqual(self.parser.cache_info().hits, 0)
+
+    def testDefaultOmitted(self):
+        # The date of the result follows today's date, which is part of the
+        # key when default is omitted
+        dt = self.parser.parse("10:36")
+        self.assertEqual(dt.date(), datetime.now().date())
+
+    def testFuzzyWithTokens(self):
+        expected = parse("Today is 25 of September of 2003",
+                         fuzzy_with_tokens=True)
+        for _ in range(2):
+            self.assertEqual(
+                self.parser.parse("Today is 25 of September of 2003",
+                                  fuzzy_with_tokens=True), expected)
+        self.assertEqual(self.parser.cache_info().hits, 1)
+
+    def testFailureNotCached(self):
+        for _ in range(2):
+            self.assertRaises(ValueError, self.parser.parse, "junk")
+        self.assertEqual(self.parser.cache_info(), (0, 2, 4, 0))
+
+    def testBounded(self):
+        for timestr in ["2001", "2002", "2003", "2004", "2005", "2001"]:
+            self.parser.parse(timestr)
+        self.assertEqual(self.parser.cache_info(), (0, 6, 4, 4))
+
+    def testClear(self):
+        self.parser.parse("2003")
+        self.parser.parse("2003")
+        self.parser.cache_clear()
+        self.assertEqual(self.parser.cache_info(), (0, 0, 4, 0))
+
+    def testDisabledByDefault(self):
+        from europarse.parser import parser
+        p = parser()
+        p.parse("2003")
+        p.parse("2003")
+        self.assertEqual(p.cache_info(), (0, 0, 0, 0))
+
+
+class ParseManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+
+    def testParseMany(self):
+        timestrs = ["Thu Sep 25 10:36:28 2003", "2003-09-25T10:49:41",
+                    "10:36", "25/09/2003"]
+        self.assertEqual(parse_many(timestrs, default=self.default),
+                         [parse(x, default=self.default) for x in timestrs])
+
+    def testOptions(self):
+        self.assertEqual(parse_many(iter(["01/02/03", "10/11/12"]),
+                                    dayfirst=True, yearfirst=True),
+                         [datetime(2001, 2, 3), datetime(2010, 11, 12)])
+
+    def testDefaultOmitted(self):
+        today = datetime.now().date()
+        self.assertEqual([dt.date() for dt in parse_many(["10:36", "11:00"])],
+                         [today, today])
+
+    def testParserInfo(self):
+        class myparserinfo(parserinfo):
+            MONTHS = parserinfo.MONTHS[:8] + [("Set", "Setembro")] + \
+                parserinfo.MONTHS[9:]
+
+        self.assertEqual(parse_many(["25 Set 2003"], myparserinfo()),
+                         [datetime(2003, 9, 25)])
+
+    def testErrorsRaise(self):
+        self.assertRaises(ValueError, parse_many, ["2003", "junk"])
+
+    def testErrorsCoerce(self):
+        self.assertEqual(parse_many(["2003", "junk", "Feb 30 2003"],
+                                    default=self.default, errors="coerce"),
+                         [datetime(2003, 9, 25), None, None])
+
+    def testErrorsReturn(self):
+        results = parse_many(["junk", "2003"], default=self.default,
+                             errors="return")
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1], datetime(2003, 9, 25))
+
+    def testBadErrors(self):
+        self.assertRaises(ValueError, parse_many, ["2003"], errors="ignore")
+
+    def testBadOption(self):
+        self.assertRaises(TypeError, parse_many, ["2003"], errors="coerce",
+                          dayfrist=True)
+
+
+class TryParseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+
+    def testSuccess(self):
+        self.assertEqual(try_parse("Thu Sep 25 10:36:28 2003"),
+                         (datetime(2003, 9, 25, 10, 36, 28), None))
+
+    def testSameAsParse(self):
+        for timestr in ["2003-09-25T10:49:41.5-03:00", "10:36 BRST",
+                        "25/09/2003", "Today is 25 of September, 10h36"]:
+            for kwargs in [{"fuzzy": True}, {"fuzzy_with_tokens": True},
+                           {"fuzzy": True, "dayfirst": True}]:
+                self.assertEqual(
+                    try_parse(timestr, default=self.default, **kwargs),
+                    (parse(timestr, default=self.default, **kwargs), None))
+
+    def testReasons(self):
+        for timestr, reason in [("junk", "unknown-token"),
+                                ("10:", "unexpected-number"),
+                                ("10:a", "bad-time"),
+                                ("10:36 +12345", "bad-tzoffset"),
+                                ("Sep-", "truncated"),
+                                ("am", "invalid"),
+                                ("1 2 3 4", "invalid"),
+                                ("", "no-date"),
+                                ("Feb 30 2003", "out-of-range"),
+                                ("99999999999999999999", "overflow"),
+                                ("inf", "overflow")]:
+            self.assertEqual(try_parse(timestr), (None, reason), timestr)
+            self.assertRaises((ValueError, OverflowError), parse, timestr)
+
+    def testParserInfo(self):
+        class myparserinfo(parserinfo):
+            JUMP = parserinfo.JUMP + ["um", "Uhr"]
+
+        self.assertEqual(try_parse("um 10:00 Uhr", myparserinfo(),
+                                   default=self.default),
+                         (datetime(2003, 9, 25, 10), None))
+        self.assertEqual(try_parse("um 10:00 Uhr"), (None, "unknown-token"))
+
+    def testCached(self):
+        from europarse.parser import parser
+        p = parser(cache_size=4)
+        self.assertEqual(p.try_parse("2003", default=self.default),
+                         (datetime(2003, 9, 25), None))
+        self.assertEqual(p.try_parse("2003", default=self.default),
+                         (datetime(2003, 9, 25), None))
+        self.assertEqual(p.try_parse("junk"), (None, "unknown-token"))
+        self.assertEqual(p.cache_info().hits, 1)
+
+
+class ScreenTest(unittest.TestCase):
+
+    def setUp(self):
+        from europarse.parser import parser
+        self.parser = parser(screen=True)
+        self.unscreened = parser()
+        self.default = datetime(2003, 9, 25)
+
+    def assertSameParse(self, timestr, **kwargs):
+        def run(p):
+            try:
+                return p.parse(timestr, default=self.default, **kwargs)
+            except (ValueError, OverflowError) as e:
+                return type(e), str(e)
+
+        self.assertEqual(run(self.parser), run(self.unscreened), timestr)
+        self.assertEqual(
+            self.parser.try_parse(timestr, default=self.default, **kwargs),
+            self.unscreened.try_parse(timestr, default=self.default, **kwargs))
+
+    def testScreenedOut(self):
+        for timestr in ["", "N/A", "null", "some free text", "a.m.", "at",
+                        "of the", " - ", "\t", "x\x00y"]:
+            self.assertIsNotNone(self.parser._screen_out(timestr, {}),
+                                 timestr)
+
+    def testNotScreenedOut(self):
+        for timestr in ["jan", "on Monday", "j\x00an", "inf", "NaN", "x12",
+                        "\u00b2"]:
+            self.assertIsNone(self.parser._screen_out(timestr, {}), timestr)
+
+    def testSameAsParse(self):
+        words = ["null", "N/A", "foo", "a.m.", "PM", "at", "of", "UTC", "Z",
+                 "h", "inf", "Jan", "monday", "j\x00an", "\u00b2", "\u00e9",
+                 "\t", " ", "-", "+", "(", ",", ".", ":"]
+        for n in range(1, 3):
+            for timestr in map("".join, itertools.product(words, repeat=n)):
+                for kwargs in [{}, {"fuzzy": True},
+                               {"fuzzy_with_tokens": True}]:
+                    self.assertSameParse(timestr, **kwargs)
+
+    def testMaxLength(self):
+        from europarse.parser import parser
+        p = parser(max_length=10)
+        self.assertEqual(p.parse("2003-09-25"), datetime(2003, 9, 25))
+        self.assertRaises(ValueError, p.parse, "2003-09-25T10:49")
+        self.assertEqual(p.try_parse("2003-09-25T10:49"), (None, "too-long"))
+
+    def testNullValues(self):
+        from europarse.parser import parser
+        p = parser(null_values=["", "N/A", "null"])
+        self.assertIsNone(p.parse(""))
+        self.assertIsNone(p.parse(" n/a "))
+        self.assertEqual(p.try_parse("NULL"), (None, None))
+        self.assertEqual(p.parse_many(["null", "2003-09-25"]),
+                         [None, datetime(2003, 9, 25)])
+        self.assertRaises(ValueError, p.parse, "nil")
+
+
+class ParallelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+        self.timestrs = ["25/09/2003 10:36:28", "junk", "10:36", "2003",
+                         "Thu Sep 25 10:36:28 BRST 2003"] * 5
+
+    def testPool(self):
+        from europarse.parallel import parsepool
+        with parsepool(2, chunksize=3, default=self.default, dayfirst=True,
+                       errors="coerce") as pool:
+            expected = [try_parse(x, default=self.default, dayfirst=True)[0]
+                        for x in self.timestrs]
+            self.assertEqual(pool.parse_many(self.timestrs), expected)
+            # The pool is reused
+            self.assertEqual(pool.parse_many(iter(self.timestrs[:4])),
+                             expected[:4])
+            self.assertEqual(pool.parse_many([]), [])
+
+    def testParseMany(self):
+        self.assertEqual(parse_many(self.timestrs, default=self.default,
+                                    errors="coerce", workers=2),
+                         parse_many(self.timestrs, default=self.default,
+                                    errors="coerce"))
+
+    def testParserConfig(self):
+        from europarse.parser import parser
+        p = parser(null_values=["junk"])
+        self.assertEqual(p.parse_many(["junk", "2003"], default=self.default,
+                                      workers=2),
+                         [None, datetime(2003, 9, 25)])
+
+    def testErrorsRaise(self):
+        self.assertRaises(ValueError, parse_many, self.timestrs, workers=2)
+
+    def testBadOptions(self):
+        from europarse.parallel import parsepool
+        self.assertRaises(TypeError, parsepool, 2, dayfrist=True)
+        self.assertRaises(ValueError, parsepool, 2, errors="ignore")
+        self.assertRaises(ValueError, parsepool, 2, chunksize=0)
+        # Which only the pool takes
+        self.assertRaises(ValueError, parse_many, self.timestrs, chunksize=3)
+
+
+class ParseIterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+
+    def testTextFile(self):
+        f = StringIO("2003-09-25T10:49:41\n25 Sep 2003\n\n10:36\n")
+        self.assertEqual(list(parse_iter(f, default=self.default,
+                                         errors="coerce")),
+                         [datetime(2003, 9, 25, 10, 49, 41),
+                          datetime(2003, 9, 25), None,
+                          datetime(2003, 9, 25, 10, 36)])
+
+    def testBinaryFile(self):
+        f = BytesIO(b"2003-09-25T10:49:41\r\n25 Sep 2003\r\n")
+        self.assertEqual(list(parse_iter(f)),
+                         [datetime(2003, 9, 25, 10, 49, 41),
+                          datetime(2003, 9, 25)])
+
+    def testColumn(self):
+        lines = ["1,25/09/2003,foo", "2,26/09/2003", "3"]
+        self.assertEqual(list(parse_iter(lines, 1, delimiter=",",
+                                         dayfirst=True, errors="coerce")),
+                         [datetime(2003, 9, 25), datetime(2003, 9, 26), None])
+
+    def testWhitespaceColumn(self):
+        lines = ["GET  10:36:28 /index.html"]
+        self.assertEqual(list(parse_iter(lines, 1, default=self.default)),
+                         [datetime(2003, 9, 25, 10, 36, 28)])
+
+    def testRegex(self):
+        lines = ['127.0.0.1 - [25/Sep/2003 10:36:28 -0300] "GET /"',
+                 '127.0.0.1 - "GET /"']
+        results = list(parse_iter(lines, r"\[([^]]+)\]", errors="return"))
+        self.assertEqual(results[0],
+                         datetime(2003, 9, 25, 10, 36, 28,
+                                  tzinfo=tzoffset(None, -10800)))
+        self.assertIsInstance(results[1], ValueError)
+
+    def testCompiledRegexWithoutGroups(self):
+        lines = ["at 2003-09-25 sharp"]
+        self.assertEqual(list(parse_iter(lines,
+                                         re.compile(r"\d{4}-\d\d-\d\d"))),
+                         [datetime(2003, 9, 25)])
+
+    def testErrorsRaise(self):
+        results = parse_iter(["2003", "junk", "2004"], default=self.default,
+                             batchsize=2)
+        self.assertEqual(next(results), datetime(2003, 9, 25))
+        self.assertRaises(ValueError, next, results)
+
+    def testLazy(self):
+        lines = itertools.cycle(["2003-09-25", "25 Sep 2003"])
+        results = parse_iter(lines, batchsize=3)
+        self.assertEqual(list(itertools.islice(results, 5)),
+                         [datetime(2003, 9, 25)] * 5)
+
+    def testBadOption(self):
+        # Checked when called, before the first line is read
+        self.assertRaises(TypeError, parse_iter, [], dayfrist=True)
+
+
+class Datetime64Test(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            import numpy
+            from europarse.numpy import parse_datetime64
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        self.np = numpy
+        self.parse = parse_datetime64
+        self.default = datetime(2003, 9, 25, 1, 2, 3, 4)
+
+    def expected(self, timestrs, unit="us", utc=False, **kwargs):
+        # What scalar parsing gives, one string at a time
+        values = []
+        for timestr in timestrs:
+            dt = try_parse(timestr, default=self.default, **kwargs)[0]
+            if dt is None:
+                values.append("NaT")
+                continue
+            if utc and dt.tzinfo is not None:
+                dt = dt - dt.utcoffset()
+            values.append(dt.replace(tzinfo=None).isoformat())
+        return self.np.array(values, dtype="datetime64[%s]" % unit)
+
+    def assertParses(self, timestrs, **kwargs):
+        result = self.parse(timestrs, default=self.default, **kwargs)
+        expected = self.expected(timestrs, **kwargs)
+        self.assertEqual(result.dtype, expected.dtype)
+        self.assertEqual(result.tolist(), expected.tolist())
+
+    def testISOColumn(self):
+        self.assertParses(["2003-09-25T10:49:41", "2003-09-26T00:00:59",
+                           "2003-02-29T10:49:41", "2003-09-25T24:49:41",
+                           "0031-09-25T10:49:41", "2003-09-25 10:49:41",
+                           "2003-09-25T10:49", "25 Sep 2003", "junk", ""])
+
+    def testISOColumnWithoutTime(self):
+        self.assertParses(["2003-09-25", "2004-02-29", "1970-01-01"])
+
+    def testISOColumnWithTimeZone(self):
+        timestrs = ["2003-09-25T10:49:41.502+03:00",
+                    "2003-09-25T10:49:41.5-03:30",
+                    "2003-09-25T10:49:41.123456789Z"]
+        self.assertParses(timestrs)
+        self.assertParses(timestrs, utc=True)
+        self.assertParses(timestrs, utc=True, ignoretz=True)
+
+    def testOffsetOutOfRange(self):
+        # datetime can't convert it to UTC
+        timestrs = ["2003-09-25T10:49:41+99:00"]
+        self.assertEqual(self.parse(timestrs).tolist(),
+                         [datetime(2003, 9, 25, 10, 49, 41)])
+        self.assertTrue(self.np.isnat(self.parse(timestrs, utc=True)).all())
+
+    def testNanoseconds(self):
+        self.assertParses(["2003-09-25T10:49:41.5", "2262-04-11T23:47:16.8",
+                           "Sep 25 2003"], unit="ns")
+        # Which a datetime can't hold, read directly and by the parser
+        timestrs = ["2003-09-25T10:49:41.123456789Z",
+                    "2003-09-25T10:49:41.1234567+02:00",
+                    "Sep 25 2003 10:49:41.987654321 -0300",
+                    "2003-09-25T10:49:41.5Z"]
+        for utc in (True, False):
+            result = self.parse(timestrs, unit="ns", utc=utc)
+            self.assertEqual(result.astype("int64").tolist(),
+                             [parse_epoch(timestr, "ns", ignoretz=not utc)
+                              for timestr in timestrs])
+            result = self.parse(timestrs[2:], unit="ns", utc=utc)
+            self.assertEqual(result.astype("int64").tolist(),
+                             [parse_epoch(timestr, "ns", ignoretz=not utc)
+                              for timestr in timestrs[2:]])
+
+    def testNanosecondsOutOfRange(self):
+        result = self.parse(["1500-09-25T10:49:41.5", "2262-04-11T23:47:17",
+                             "Sep 25 1500"], unit="ns")
+        self.assertTrue(self.np.isnat(result).all())
+
+    def testNotStrings(self):
+        result = self.parse(["2003-09-25", None, 5, b"2003-09-25"])
+        self.assertEqual(result.tolist(),
+                         [datetime(2003, 9, 25), None, None,
+                          datetime(2003, 9, 25)])
+
+    def testObjectArray(self):
+        # Strings longer than the first one in an object array
+        timestrs = ["2003-09-25", "2003-09-26T10:49:41",
+                    "2003-09-27 23:59 junk", "2003-09-28junk"]
+        result = self.parse(self.np.array(timestrs, dtype=object),
+                            default=self.default)
+        self.assertEqual(result.tolist(),
+                         self.parse(timestrs, default=self.default).tolist())
+        self.assertEqual(result.tolist(), self.expected(timestrs).tolist())
+
+    def testShape(self):
+        timestrs = self.np.array([["2003-09-25", "junk"],
+                                  ["25 Sep 2003", "2003-09-26"]])
+        result = self.parse(timestrs)
+        self.assertEqual(result.shape, (2, 2))
+        self.assertEqual(result[1, 1], self.np.datetime64("2003-09-26"))
+
+    def testOut(self):
+        out = self.np.zeros(4, dtype="datetime64[ns]")
+        result = self.parse(["2003-09-25", "junk"], unit="ns", out=out[::2])
+        self.assertEqual(out.tolist()[::2], [1064448000000000000, None])
+        self.assertEqual(out.tolist()[1::2], [0, 0])
+        self.assertIsNot(result, out)
+
+    def testBadOptions(self):
+        self.assertRaises(ValueError, self.parse, ["2003"], unit="s")
+        self.assertRaises(ValueError, self.parse, ["2003"],
+                          out=self.np.zeros(2, dtype="datetime64[us]"))
+        self.assertRaises(TypeError, self.parse, ["2003"], dayfrist=True)
+        self.assertRaises(TypeError, self.parse, ["2003"],
+                          fuzzy_with_tokens=True)
+
+
+class ParseEpochTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+        self.epoch = datetime(1970, 1, 1, tzinfo=tzutc())
+
+    def expected(self, timestr, **kwargs):
+        dt = parse(timestr, default=self.default, **kwargs)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=tzutc())
+        return (dt - self.epoch) // timedelta(microseconds=1)
+
+    def testFormats(self):
+        for timestr in ["2003-09-25T10:49:41.5-03:00", "25/09/2003 10:36",
+                        "Thu Sep 25 10:36:28 BRST 2003", "10:36:28 UTC",
+                        "Thursday", "Feb 2003", "1969-07-20 20:17:40"]:
+            self.assertEqual(parse_epoch(timestr, default=self.default),
+                             self.expected(timestr), timestr)
+
+    def testUnits(self):
+        timestr = "2003-09-25T10:49:41.123456789Z"
+        self.assertEqual(parse_epoch(timestr, "ns"), 1064486981123456789)
+        self.assertEqual(parse_epoch(timestr), 1064486981123456)
+        self.assertEqual(parse_epoch(timestr, "ms"), 1064486981123)
+        self.assertEqual(parse_epoch(timestr, "s"), 1064486981)
+
+    def testNanosecondsGeneralFormat(self):
+        self.assertEqual(parse_epoch("Sep 25 2003 10:49:41.0000019 -0300",
+                                     "ns"),
+                         1064497781000001900)
+        self.assertEqual(parse_epoch("10:49:41.987654321", "ns",
+                                     default=self.default),
+                         1064486981987654321)
+
+    def testBeforeEpoch(self):
+        self.assertEqual(parse_epoch("1969-12-31T23:59:59.5", "s"), -1)
+
+    def testAssumeTz(self):
+        self.assertEqual(parse_epoch("2003-09-25 10:49:41", "s",
+                                     assume_tz=tzoffset(None, 3600)),
+                         1064483381)
+        # Only for times without a time zone
+        self.assertEqual(parse_epoch("2003-09-25 10:49:41Z", "s",
+                                     assume_tz=tzoffset(None, 3600)),
+                         1064486981)
+
+    def testTzinfos(self):
+        tzinfos = {"BRST": -10800}
+        timestr = "Thu Sep 25 10:36:28 BRST 2003"
+        self.assertEqual(parse_epoch(timestr, tzinfos=tzinfos),
+                         self.expected(timestr, tzinfos=tzinfos))
+        self.assertEqual(parse_epoch(timestr, tzinfos=tzinfos, ignoretz=True),
+                         self.expected(timestr, ignoretz=True))
+
+    def testAwareDefault(self):
+        default = datetime(2003, 9, 25, tzinfo=tzoffset(None, 7200))
+        self.assertEqual(parse_epoch("10:49", "s", default=default),
+                         1064479740)
+
+    def testFuzzyWithTokens(self):
+        self.assertEqual(parse_epoch("Today is 2003-09-25", "s",
+                                     fuzzy_with_tokens=True),
+                         (1064448000, ("Today is ",)))
+
+    def testErrors(self):
+        self.assertRaises(ValueError, parse_epoch, "junk")
+        self.assertRaises(ValueError, parse_epoch, "Feb 30 2003")
+        self.assertRaises(ValueError, parse_epoch, "2003", unit="m")
+
+
+class ParseFieldsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+
+    def assertFields(self, fields, expected):
+        self.assertEqual([tuple(column) for column in fields],
+                         [tuple(column) for column in zip(*expected)])
+
+    def testFields(self):
+        fields = parse_fields(["2003-09-25T10:49:41.5-03:00", "junk",
+                               "Thu Sep 25 10:36:28 2003", "Monday", ""],
+                              default=self.default)
+        self.assertFields(fields,
+                          [(2003, 9, 25, 10, 49, 41, 500000, -10800, 1, 1),
+                           (0,)*10,
+                           (2003, 9, 25, 10, 36, 28, 0, 0, 0, 1),
+                           (2003, 9, 29, 0, 0, 0, 0, 0, 0, 1),
+                           (0,)*10])
+
+    def testTypecodes(self):
+        fields = parse_fields(["2003-09-25"])
+        self.assertEqual([column.typecode for column in fields],
+                         list("hbbbbbllbb"))
+        self.assertEqual(fields._fields,
+                         ("year", "month", "day", "hour", "minute", "second",
+                          "microsecond", "tzoffset", "aware", "valid"))
+
+    def testUTC(self):
+        fields = parse_fields(["10:36 UTC"], default=self.default)
+        self.assertFields(fields, [(2003, 9, 25, 10, 36, 0, 0, 0, 1, 1)])
+
+    def testIgnoreTz(self):
+        fields = parse_fields(["10:36 -0300"], default=self.default,
+                              ignoretz=True)
+        self.assertFields(fields, [(2003, 9, 25, 10, 36, 0, 0, 0, 0, 1)])
+
+    def testTzinfos(self):
+        fields = parse_fields(["10:36 BRST"], default=self.default,
+                              tzinfos={"BRST": -7200})
+        self.assertFields(fields, [(2003, 9, 25, 10, 36, 0, 0, -7200, 1, 1)])
+
+    def testAwareDefault(self):
+        default = datetime(2003, 9, 25, tzinfo=tzoffset(None, 3600))
+        fields = parse_fields(["10:36", "10:36 -0300"], default=default)
+        self.assertFields(fields, [(2003, 9, 25, 10, 36, 0, 0, 3600, 1, 1),
+                                   (2003, 9, 25, 10, 36, 0, 0, -10800, 1, 1)])
+
+    def testNullValues(self):
+        from europarse.parser import parser
+        fields = parser(null_values=["-"]).parse_fields(["-"])
+        self.assertEqual(tuple(fields.valid), (0,))
+
+    def testBadOptions(self):
+        self.assertRaises(TypeError, parse_fields, [], dayfrist=True)
+        self.assertRaises(TypeError, parse_fields, [],
+                          fuzzy_with_tokens=True)
+
+
+class LazyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+        self.tzinfos = {"BRST": -10800}
+
+    def testFields(self):
+        dt = parse("Thu Sep 25 10:36:28.5 BRST 2003", lazy=True,
+                   tzinfos=self.tzinfos)
+        self.assertEqual((dt.year, dt.month, dt.day, dt.hour, dt.minute,
+                          dt.second, dt.microsecond),
+                         (2003, 9, 25, 10, 36, 28, 500000))
+        self.assertEqual(dt.date(), datetime(2003, 9, 25).date())
+        self.assertEqual(dt.time(), datetime(2003, 9, 25, 10, 36, 28,
+                                             500000).time())
+
+    def testDeferred(self):
+        def tzinfos(name, offset):
+            calls.append(name)
+            return offset
+
+        calls = []
+        dt = parse("10:36:28 -0300", default=self.default, lazy=True,
+                   tzinfos=tzinfos)
+        self.assertEqual(dt.hour, 10)
+        self.assertEqual(calls, [])
+        self.assertEqual(dt.tzinfo, tzoffset(None, -10800))
+        self.assertEqual(dt.utcoffset(), timedelta(hours=-3))
+        self.assertEqual(calls, [None])
+
+    def testDatetime(self):
+        timestr = "Thu Sep 25 10:36:28 BRST 2003"
+        expected = parse(timestr, tzinfos=self.tzinfos)
+        dt = parse(timestr, tzinfos=self.tzinfos, lazy=True)
+        self.assertEqual(dt.datetime(), expected)
+        self.assertIs(dt.datetime(), dt.datetime())
+        self.assertEqual(dt.isoformat(), expected.isoformat())
+        self.assertEqual(str(dt), str(expected))
+        self.assertEqual(repr(dt), "parseddate(%r)" % (expected,))
+
+    def testCompare(self):
+        timestr = "2003-09-25T10:49:41-03:00"
+        expected = parse(timestr)
+        dt = parse(timestr, lazy=True)
+        self.assertEqual(dt, expected)
+        self.assertEqual(expected, dt)
+        self.assertEqual(hash(dt), hash(expected))
+        self.assertEqual(dt, parse("2003-09-25T13:49:41Z", lazy=True))
+        self.assertEqual(len({dt, expected}), 1)
+        self.assertLess(dt, parse("2003-09-25T14:00Z", lazy=True))
+        self.assertGreater(dt, parse("2003-09-25T13:00Z"))
+        self.assertLess(parse("2003-09-25T13:00Z"), dt)
+        self.assertNotEqual(dt, expected.replace(second=0))
+
+    def testArithmetic(self):
+        dt = parse("2003-09-25T10:49:41", lazy=True)
+        self.assertEqual(dt + timedelta(days=1),
+                         datetime(2003, 9, 26, 10, 49, 41))
+        self.assertEqual(dt - parse("2003-09-25", lazy=True),
+                         timedelta(hours=10, minutes=49, seconds=41))
+        self.assertEqual(datetime(2003, 9, 26, 10, 49, 41) - dt,
+                         timedelta(days=1))
+
+    def testDefaultAndWeekday(self):
+        dt = parse("Monday 10:00", default=self.default, lazy=True)
+        self.assertEqual((dt.year, dt.month, dt.day), (2003, 9, 29))
+        self.assertEqual(dt, parse("Monday 10:00", default=self.default))
+
+    def testFuzzyWithTokens(self):
+        dt, tokens = parse("Today is 2003-09-25", fuzzy_with_tokens=True,
+                           lazy=True)
+        self.assertEqual(dt, datetime(2003, 9, 25))
+        self.assertEqual(tokens, ("Today is ",))
+
+    def testInvalid(self):
+        self.assertRaises(ValueError, parse, "junk", lazy=True)
+        self.assertRaises(ValueError, parse, "Feb 30 2003", lazy=True)
+
+
+class ParseColumnTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+        self.values = ["25/09/2003 10:36", "junk", "10:36",
+                       "25/09/2003 10:36", "junk"] * 3
+
+    def testColumn(self):
+        results = parse_column(self.values, default=self.default,
+                               dayfirst=True, errors="coerce")
+        self.assertEqual(results, parse_many(self.values,
+                                             default=self.default,
+                                             dayfirst=True, errors="coerce"))
+        # Equal strings share a result
+        self.assertIs(results[0], results[3])
+        self.assertIs(results[0], results[8])
+
+    def testParsedOnce(self):
+        calls = []
+
+        def tzinfos(name, offset):
+            calls.append(name)
+            return offset
+
+        parse_column(["10:36 UTC"] * 100, tzinfos=tzinfos)
+        self.assertEqual(calls, ["UTC"])
+
+    def testErrors(self):
+        self.assertRaises(ValueError, parse_column, self.values)
+        results = parse_column(self.values, errors="return")
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIs(results[1], results[4])
+
+    def testIterable(self):
+        self.assertEqual(parse_column(iter(["2003-09-25"] * 3)),
+                         [datetime(2003, 9, 25)] * 3)
+        self.assertEqual(parse_column([]), [])
+
+
+class ParseDetectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+
+    def testDayFirst(self):
+        values = ["01/05/2009", "25/12/2009", "02/05/2009 10:36"]
+        found = parse_detect(values, default=self.default)
+        self.assertTrue(found.dayfirst)
+        self.assertEqual(found.conflicts, [])
+        self.assertEqual(found.results,
+                         parse_many(values, default=self.default,
+                                    dayfirst=True))
+
+    def testMonthFirst(self):
+        values = ["01/05/09", "12/25/09", "02/05/09"]
+        found = parse_detect(values, default=self.default, dayfirst=True)
+        self.assertFalse(found.dayfirst)
+        self.assertEqual(found.results[0], datetime(2009, 1, 5))
+
+    def testConflicts(self):
+        values = ["13/01/2009", "01/13/2009", "01/14/2009", "01/02/2009"]
+        found = parse_detect(values)
+        self.assertFalse(found.dayfirst)
+        self.assertEqual(found.conflicts, [0])
+        self.assertEqual(found.results[0], datetime(2009, 1, 13))
+
+    def testTie(self):
+        values = ["01/05/2009", "Sep 25 2003", "2003-09-25"]
+        self.assertFalse(parse_detect(values).dayfirst)
+        self.assertTrue(parse_detect(values, dayfirst=True).dayfirst)
+        self.assertTrue(parse_detect(values,
+                                     parserinfo=parserinfo(dayfirst=True))
+                        .dayfirst)
+
+    def testYearFirst(self):
+        # Years of three or more digits and yearfirst dates don't vote
+        found = parse_detect(["2009/01/13", "09/05/13"], yearfirst=True)
+        self.assertEqual(found.conflicts, [])
+        self.assertEqual(found.results[1].date(), datetime(2009, 5, 13).date())
+
+    def testErrors(self):
+        values = ["25/09/2003", "junk", "32/13/2003", ""]
+        self.assertRaises(ValueError, parse_detect, values)
+        found = parse_detect(values, errors="coerce")
+        self.assertEqual(found.results,
+                         [datetime(2003, 9, 25), None, None, None])
+        found = parse_detect(values, errors="return")
+        self.assertTrue(found.dayfirst)
+        self.assertIsInstance(found.results[1], ValueError)
+        self.assertIsInstance(found.results[2], ValueError)
+        self.assertIsInstance(found.results[3], ValueError)
+
+    def testArguments(self):
+        self.assertRaises(ValueError, parse_detect, [], errors="ignore")
+        self.assertRaises(TypeError, parse_detect, [], fuzzy_with_tokens=True)
+        self.assertRaises(TypeError, parse_detect, [], lazy=True)
+
+
+class ParseCandidatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = datetime(2003, 9, 25)
+
+    def assertCandidates(self, timestr, **kwargs):
+        # Each setting gives what parse() gives with it
+        found = parse_candidates(timestr, default=self.default, **kwargs)
+        given = {}
+        for result in found.results:
+            for dayfirst, yearfirst in result.settings:
+                given[dayfirst, yearfirst] = result.datetime
+
+        self.assertEqual(len(given), 4)
+        for (dayfirst, yearfirst), dt in given.items():
+            self.assertEqual(dt, parse(timestr, default=self.default,
+                                       dayfirst=dayfirst, yearfirst=yearfirst,
+                                       **kwargs))
+        self.assertEqual(found.ambiguous, len(found.results) > 1)
+        return found
+
+    def testAmbiguous(self):
+        found = self.assertCandidates("01/05/09 10:36")
+        self.assertTrue(found.ambiguous)
+        self.assertEqual([result.datetime for result in found.results],
+                         [datetime(2009, 1, 5, 10, 36),
+                          datetime(2009, 5, 1, 10, 36),
+                          datetime(2001, 5, 9, 10, 36)])
+        self.assertEqual(found.results[2].settings,
+                         ((False, True), (True, True)))
+
+    def testUnambiguous(self):
+        for timestr in ["25/09/2003", "Sep 25 2003", "2003-09-25T10:49:41",
+                        "10:36", "Thursday"]:
+            found = self.assertCandidates(timestr)
+            self.assertFalse(found.ambiguous)
+
+    def testTwoNumbers(self):
+        found = self.assertCandidates("05/09")
+        self.assertEqual(len(found.results), 2)
+
+    def testTimeZone(self):
+        found = self.assertCandidates("01/02/03 10:00 +0100")
+        self.assertEqual(found.results[0].datetime.tzinfo,
+                         tzoffset(None, 3600))
+        self.assertEqual(len(found.results), 3)
+
+    def testFuzzy(self):
+        self.assertCandidates("Today is 01/05/09", fuzzy=True)
+
+    def testSomeSettingsFail(self):
+        # The 30th of February, read year first
+        found = parse_candidates("02/02/30", default=self.default)
+        self.assertFalse(found.ambiguous)
+        self.assertEqual(found.results,
+                         [(datetime(2030, 2, 2), ((False, False),
+                                                  (True, False)))])
+
+    def testErrors(self):
+        self.assertRaises(ValueError, parse_candidates, "junk")
+        self.assertRaises(ValueError, parse_candidates, "31/02/2001")
+        self.assertRaises(ValueError, parse_candidates, "")
+        self.assertRaises(TypeError, parse_candidates, "01/05/09",
+                          dayfirst=True)
+
+
+class MainTest(unittest.TestCase):
+
+    def run_main(self, argv, text):
+        from europarse.__main__ import main
+        stdout, stderr = StringIO(), StringIO()
+        status = main(argv, StringIO(text), stdout, stderr)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def testLines(self):
+        status, out, _ = self.run_main(
+            ["--dayfirst"], "25/09/2003 10:49\n2003-09-25T10:49:41+02:00\n")
+        self.assertEqual(status, 0)
+        self.assertEqual(out, "2003-09-25T10:49:00\n"
+                              "2003-09-25T10:49:41+02:00\n")
+
+    def testTimeZone(self):
+        _, out, _ = self.run_main(["--tz", "UTC"],
+                                  "Sep 25 2003 10:49\n"
+                                  "2003-09-25T10:49:41+02:00\n")
+        self.assertEqual(out, "2003-09-25T10:49:00+00:00\n"
+                              "2003-09-25T08:49:41+00:00\n")
+
+    def testEpoch(self):
+        _, out, _ = self.run_main(["--epoch", "s"],
+                                  "1970-01-02\n1970-01-01T01:00+01:00\n")
+        self.assertEqual(out, "86400\n0\n")
+
+    def testColumn(self):
+        text = 'id,when\n1,"Sep 25, 2003"\n2\n3,25/09/2003\n'
+        _, out, _ = self.run_main(["--column", "1", "--header", "--on-error",
+                                   "keep", "--dayfirst"], text)
+        self.assertEqual(out, "id,when\n1,2003-09-25T00:00:00\n2\n"
+                              "3,2003-09-25T00:00:00\n")
+
+        _, out, _ = self.run_main(["--column", "1", "--delimiter", "\\t"],
+                                  "1\tSep 25 2003\n")
+        self.assertEqual(out, "1\t2003-09-25T00:00:00\n")
+
+    def testColumnMissing(self):
+        text = "1,Sep 25 2003\n2\n"
+        self.assertEqual(self.run_main(["--column", "1", "--on-error",
+                                        "empty"], text),
+                         (0, "1,2003-09-25T00:00:00\n2,\n", ""))
+        self.assertEqual(self.run_main(["--column", "1", "--on-error",
+                                        "skip"], text),
+                         (0, "1,2003-09-25T00:00:00\n", ""))
+        self.assertEqual(self.run_main(["--column", "1"], text),
+                         (1, "1,2003-09-25T00:00:00\n",
+                          "europarse: -:2: Row has no column 1\n"))
+
+    def testOnError(self):
+        text = "Sep 25 2003\njunk\nSep 26 2003\n"
+        expected = {"skip": "2003-09-25T00:00:00\n2003-09-26T00:00:00\n",
+                    "empty": "2003-09-25T00:00:00\n\n2003-09-26T00:00:00\n",
+                    "keep": "2003-09-25T00:00:00\njunk\n"
+                            "2003-09-26T00:00:00\n"}
+        for on_error, out in expected.items():
+            self.assertEqual(self.run_main(["--on-error", on_error], text),
+                             (0, out, ""))
+
+        status, out, err = self.run_main([], text)
+        self.assertEqual(status, 1)
+        self.assertEqual(out, "2003-09-25T00:00:00\n")
+        self.assertEqual(err, "europarse: -:2: Unknown string format\n")
+
+    def testWorkers(self):
+        text = "".join("Sep %d 2003\n" % day for day in range(1, 31))
+        self.assertEqual(self.run_main(["--workers", "2", "--chunksize", "4"],
+                                       text),
+                         self.run_main([], text))
+
+
+class InferFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        from europarse import infer_format
+        self.infer_format = infer_format
+        self.default = datetime(2003, 9, 25)
+
+    def testInfer(self):
+        fmt = self.infer_format(["25/09/2003 10:36", "26/09/2003 11:02",
+                                 "Sep 27 2003", "junk"], dayfirst=True)
+        self.assertEqual(fmt.shape, "00/00/0000 00:00")
+        self.assertEqual(fmt.order, "DMY")
+        self.assertEqual(fmt.matched, 0.5)
+
+    def testParse(self):
+        fmt = self.infer_format(["25/09/2003 10:36"], dayfirst=True)
+        timestrs = ["27/09/2003 09:15", "Sep 28 2003", "10:36",
+                    "01/02/2003 00:00"]
+        self.assertEqual(fmt.parse_many(timestrs, default=self.default),
+                         parse_many(timestrs, default=self.default,
+                                    dayfirst=True))
+        self.assertEqual(fmt.parse("27/09/2003 09:15"),
+                         datetime(2003, 9, 27, 9, 15))
+
+    def testOrderOfColumn(self):
+        fmt = self.infer_format(["99.12.31", "98.01.15"])
+        self.assertEqual(fmt.order, "YMD")
+        # Which parse() would read as MDY on its own
+        self.assertEqual(fmt.parse("05.01.12"), datetime(2005, 1, 12))
+        # Which can't be YMD, so is left to parse()
+        self.assertEqual(fmt.parse("12.31.05"), datetime(2005, 12, 31))
+
+    def testMonthName(self):
+        fmt = self.infer_format(["Sep 25 2003 10:36:28"])
+        self.assertEqual(fmt.order, "MDY")
+        self.assertEqual(fmt.parse("Oct 01 2004 00:00:01"),
+                         datetime(2004, 10, 1, 0, 0, 1))
+
+    def testWords(self):
+        # Strings which only differ in their month and weekday names are of
+        # one shape, which the names of months not in the sample are read as
+        fmt = self.infer_format(["Thu Sep 25 10:36:28 2003",
+                                 "Wed Oct 01 09:00:00 2003",
+                                 "Mon Nov 17 23:59:59 2003", "junk"])
+        self.assertEqual(fmt.shape, "%a %b 00 00:00:00 0000")
+        self.assertEqual(fmt.matched, 0.75)
+        self.assertEqual(fmt.parse("Sat Feb 28 12:00:00 2004"),
+                         datetime(2004, 2, 28, 12))
+        self.assertIn(fmt._parser._plan_key("Sat Feb 28 12:00:00 2004",
+                                            False, False, False), fmt._plans)
+
+    def testOffsetSign(self):
+        timestrs = ["2003-09-25T10:49:41+02:00", "2003-09-25T10:49:41-05:00"]
+        fmt = self.infer_format(timestrs)
+        self.assertEqual(fmt.shape, "0000-00-00T00:00:00\u00b100:00")
+        self.assertEqual(fmt.matched, 1.0)
+        self.assertEqual(fmt.parse_many(timestrs), parse_many(timestrs))
+
+    def testExplicitDayfirst(self):
+        # A column of MM/DD/YY, which parse() reads day first where it can
+        timestrs = ["09/25/93", "10/13/93", "01/05/93", "02/03/94"]
+        fmt = self.infer_format(timestrs, dayfirst=True)
+        self.assertEqual(fmt.order, "MDY")
+        self.assertEqual(fmt.parse_many(timestrs, default=self.default),
+                         parse_many(timestrs, default=self.default,
+                                    dayfirst=True))
+
+        timestrs = ["25/09/93", "13/10/93", "01/05/93", "02/03/94"]
+        fmt = self.infer_format(timestrs, dayfirst=False)
+        self.assertEqual(fmt.order, "DMY")
+        self.assertEqual(fmt.parse_many(timestrs, default=self.default),
+                         parse_many(timestrs, default=self.default,
+                                    dayfirst=False))
+
+    def testAmbiguousSample(self):
+        # Nothing in the sample shows the order, which is parse()'s
+        fmt = self.infer_format(["01/05/03", "02/03/04"])
+        self.assertEqual(fmt.order, "MDY")
+        self.assertEqual(fmt.parse("05/01/03"), datetime(2003, 5, 1))
+        fmt = self.infer_format(["01/05/03", "02/03/04"], dayfirst=True)
+        self.assertEqual(fmt.order, "DMY")
+        self.assertEqual(fmt.parse("05/01/03"), datetime(2003, 1, 5))
+
+    def testISO(self):
+        fmt = self.infer_format(["2003-09-25T10:49:41"])
+        self.assertEqual(fmt.shape, "0000-00-00T00:00:00")
+        self.assertIsNone(fmt.order)
+        self.assertEqual(fmt.parse("2004-10-01T00:00:01"),
+                         datetime(2004, 10, 1, 0, 0, 1))
+
+    def testErrors(self):
+        fmt = self.infer_format(["25/09/2003"])
+        self.assertRaises(ValueError, fmt.parse, "35/09/2003")
+        self.assertEqual(fmt.parse_many(["35/09/2003", "junk"],
+                                        errors="coerce"), [None, None])
+        results = fmt.parse_many(["35/09/2003"], errors="return")
+        self.assertIsInstance(results[0], ValueError)
+
+    def testNullValues(self):
+        from europarse.parser import parser
+        fmt = self.infer_format(["25/09/2003"],
+                                parser=parser(null_values=["01/01/1900"]))
+        self.assertEqual(fmt.parse_many(["01/01/1900", "02/01/1900"]),
+                         [None, datetime(1900, 1, 2)])
+
+    def testNothingParsed(self):
+        fmt = self.infer_format(["junk", ""])
+        self.assertIsNone(fmt.shape)
+        self.assertEqual(fmt.matched, 0.0)
+        self.assertEqual(fmt.parse("2003-09-25"), datetime(2003, 9, 25))
+
+    def testBadOptions(self):
+        self.assertRaises(TypeError, self.infer_format, [], dayfrist=True)
+        self.assertRaises(TypeError, self.infer_format, [],
+                          fuzzy_with_tokens=True)
+
+
+class TimelexTest(unittest.TestCase):
+
+    def assertSameTokens(self, s):
+        self.assertEqual(_timelex.split(s), list(_timelex(s)), repr(s))
+
+    def testParserTestCorpus(self):
+        # Every string literal in this module should lex the same way with
+        # both engines.
+        import ast
+        import tokenize
+
+        with open(__file__, 'rb') as f:
+            for tok in tokenize.tokenize(f.readline):
+                if tok.type == tokenize.STRING:
+                    value = ast.literal_eval(tok.string)
+                    if isinstance(value, (str, bytes)):
+                        self.assertSameTokens(value)
+
+    def testGeneratedFormats(self):
+        delta = timedelta(days=365+31+1, seconds=1+60+60*60, microseconds=17)
+        dt = datetime(1900, 1, 1, 0, 0, 0, 0)
+        for i in range(200):
+            self.assertSameTokens(dt.ctime())
+            self.assertSameTokens(dt.isoformat())
+            self.assertSameTokens(dt.strftime("%d.%m.%Y %H.%M.%S,%f"))
+            dt += delta
+
+    def testDecimalSplitting(self):
+        for s in ["4:30:21.447", "4:30:21,447", "Sep.20.2009", "a.m.",
+                  "1,5", "12,5", "12,5,3", "12,", "12.", "1.2.3", "10.a",
+                  "10.a ", "10.ab", "1.a.1", "a.1", "a.1.", "a1.1",
+                  "5.a.b", "12,.5", "..", ".5", "\t10:36\n", "²1.5",
+                  "Ⅷ.2", "١٢.٥"]:
+            self.assertSameTokens(s)
+
+    def testLegacyEngine(self):
+        class legacy(_timelex):
+            engine = "legacy"
+
+        self.assertEqual(legacy.split("10:36:28.5 A.M."),
+                         ['10', ':', '36', ':', '28.5', ' ',
+                          'A', '.', 'M', '.'])
+
+    def testSplitTyped(self):
+        from europarse.parser import _NUMBER, _WORD, _SEPARATOR, _SPACE
+
+        tokens, kinds, values, lowered = _timelex.split_typed("Sep 25 10:36,5")
+        self.assertEqual(tokens, ['Sep', ' ', '25', ' ', '10', ':', '36.5'])
+        self.assertEqual(kinds, [_WORD, _SPACE, _NUMBER, _SPACE, _NUMBER,
+                                 _SEPARATOR, _NUMBER])
+        self.assertEqual(values, [None, None, 25.0, None, 10.0, None, 36.5])
+        self.assertEqual(lowered, ['sep', ' ', '25', ' ', '10', ':', '36.5'])
+
+    def testSplitTypedNonNumbers(self):
+        from europarse.parser import _NUMBER, _WORD
+
+        # Only what float() accepts counts as a number
+        tokens, kinds, values, lowered = _timelex.split_typed("3 10.a")
+        self.assertEqual(tokens, ['3', ' ', '10.a'])
+        self.assertEqual(kinds[2], _WORD)
+        tokens, kinds, values, lowered = _timelex.split_typed("NaN")
+        self.assertEqual(kinds, [_NUMBER])
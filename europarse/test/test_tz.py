@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import gzip
+import os
+import pickle
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from contextlib import closing
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from europarse.tz import tzfile, tzutc
+from europarse.tz.tz import _ttinfo
+from europarse.zoneinfo import ZoneInfoFile, getzoneinfofile_stream, gettz
+from europarse.zoneinfo.rebuild import flatten
+
+
+def _tzif(transitions, types, abbrs):
+    """
+    A version 1 tzfile of the ``transitions`` (pairs of the UTC time and the
+    index of a type), ``types`` (triples of the UTC offset, isdst and the
+    index of the abbreviation in ``abbrs``) and ``abbrs``.
+    """
+    data = b"TZif" + b"\x00"*16
+    data += struct.pack(">6l", 0, 0, 0, len(transitions), len(types),
+                        len(abbrs))
+    data += b"".join(struct.pack(">l", time) for time, _ in transitions)
+    data += bytes(bytearray(idx for _, idx in transitions))
+    data += b"".join(struct.pack(">lbb", *tti) for tti in types)
+    data += abbrs
+    return BytesIO(data)
+
+
+class ImportTest(unittest.TestCase):
+
+    def testNoParser(self):
+        # The time zones don't need the parser
+        code = ("import sys, europarse.tz, europarse.zoneinfo; "
+                "print('europarse.parser' in sys.modules)")
+        out = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual(out.strip(), b"False")
+
+
+class TzFileTest(unittest.TestCase):
+
+    def setUp(self):
+        # Standard time, then summer time, then double summer time, then
+        # standard time again
+        self.tz = tzfile(_tzif([(0, 0), (1000000, 1), (2000000, 2),
+                                (3000000, 0)],
+                               [(3600, 0, 0), (7200, 1, 4), (10800, 1, 8)],
+                               b"STD\x00SUM\x00DBL\x00"), "test")
+
+    def assertZone(self, dt, offset, dst, name):
+        dt = dt.replace(tzinfo=self.tz)
+        self.assertEqual(dt.utcoffset(), timedelta(seconds=offset))
+        self.assertEqual(dt.dst(), timedelta(seconds=dst))
+        self.assertEqual(dt.tzname(), name)
+
+    def at(self, timestamp):
+        # The wall time of the UTC timestamp, in standard time
+        return datetime(1970, 1, 1) + timedelta(seconds=timestamp + 3600)
+
+    def testTransitions(self):
+        self.assertZone(self.at(-1), 3600, 0, "STD")
+        self.assertZone(self.at(0), 3600, 0, "STD")
+        self.assertZone(self.at(999999), 3600, 0, "STD")
+        self.assertZone(self.at(1000000), 7200, 3600, "SUM")
+        self.assertZone(self.at(1999999), 7200, 3600, "SUM")
+        # Walks back past the summer time to the standard time
+        self.assertZone(self.at(2000000), 10800, 7200, "DBL")
+        self.assertZone(self.at(2999999), 10800, 7200, "DBL")
+        self.assertZone(self.at(3000000), 3600, 0, "STD")
+        self.assertZone(datetime(2100, 1, 1), 3600, 0, "STD")
+
+    def testOrder(self):
+        # The same answers in any order of lookups
+        times = [self.at(t) for t in range(-5000000, 5000000, 250000)]
+        expected = [(dt.replace(tzinfo=self.tz).utcoffset(),
+                     dt.replace(tzinfo=self.tz).dst()) for dt in times]
+        for dt, (offset, dst) in reversed(list(zip(times, expected))):
+            dt = dt.replace(tzinfo=self.tz)
+            self.assertEqual((dt.utcoffset(), dt.dst()), (offset, dst))
+
+    def testNoTransitions(self):
+        tz = tzfile(_tzif([], [(-18000, 0, 0)], b"EST\x00"), "test")
+        dt = datetime(2003, 9, 25, tzinfo=tz)
+        self.assertEqual(dt.utcoffset(), timedelta(hours=-5))
+        self.assertEqual(dt.dst(), timedelta(0))
+        self.assertEqual(dt.tzname(), "EST")
+
+    def testNewYork(self):
+        tz = gettz("America/New_York")
+        for dt, offset, name in [
+                (datetime(1800, 1, 1), -5, "EST"),
+                (datetime(2007, 3, 11, 1, 59), -5, "EST"),
+                (datetime(2007, 3, 11, 2, 0), -4, "EDT"),
+                (datetime(2007, 11, 4, 0, 59), -4, "EDT"),
+                (datetime(2007, 11, 4, 1, 0), -5, "EST"),
+                (datetime(2003, 7, 1), -4, "EDT"),
+                (datetime(2100, 7, 1), -5, "EST")]:
+            dt = dt.replace(tzinfo=tz)
+            self.assertEqual(dt.utcoffset(), timedelta(hours=offset))
+            self.assertEqual(dt.dst(), timedelta(hours=offset + 5))
+            self.assertEqual(dt.tzname(), name)
+
+    def testFromUTC(self):
+        def local(timestamp):
+            utc = datetime(1970, 1, 1) + timedelta(seconds=timestamp)
+            dt = self.tz.fromutc(utc.replace(tzinfo=self.tz))
+            self.assertIs(dt.tzinfo, self.tz)
+            return dt.replace(tzinfo=None) - utc
+
+        self.assertEqual(local(-1), timedelta(hours=1))
+        self.assertEqual(local(999999), timedelta(hours=1))
+        self.assertEqual(local(1000000), timedelta(hours=2))
+        self.assertEqual(local(2000000), timedelta(hours=3))
+        self.assertEqual(local(2999999), timedelta(hours=3))
+        self.assertEqual(local(3000000), timedelta(hours=1))
+        self.assertEqual(local(10**9), timedelta(hours=1))
+
+    def testFromUTCStandardChange(self):
+        # A change of standard time, which the generic tzinfo.fromutc()
+        # gets wrong, as it works from the wall time
+        tz = tzfile(_tzif([(0, 0), (1000000, 1)],
+                          [(3600, 0, 0), (9000, 0, 4)],
+                          b"ONE\x00TWO\x00"), "test")
+        utc = datetime(1970, 1, 1, tzinfo=tzutc()) + timedelta(seconds=1000000)
+        self.assertEqual(utc.astimezone(tz).replace(tzinfo=None),
+                         datetime(1970, 1, 12, 16, 16, 40))
+        self.assertEqual((utc - timedelta(seconds=1)).astimezone(tz)
+                         .replace(tzinfo=None),
+                         datetime(1970, 1, 12, 14, 46, 39))
+
+    def testFromUTCArguments(self):
+        self.assertRaises(TypeError, self.tz.fromutc, datetime(2003, 9, 25)
+                          .date())
+        self.assertRaises(ValueError, self.tz.fromutc, datetime(2003, 9, 25))
+
+    def testEquality(self):
+        def zone(offset):
+            return tzfile(_tzif([(0, 0), (1000000, 1)],
+                                [(3600, 0, 0), (offset, 1, 4)],
+                                b"STD\x00SUM\x00"), "test")
+
+        self.assertEqual(zone(7200), zone(7200))
+        self.assertNotEqual(zone(7200), zone(10800))
+        # The same transitions, with the types in another order
+        swapped = tzfile(_tzif([(0, 1), (1000000, 0)],
+                               [(7200, 1, 4), (3600, 0, 0)],
+                               b"STD\x00SUM\x00"), "test")
+        self.assertEqual(swapped._trans_ttinfos(),
+                         zone(7200)._trans_ttinfos())
+
+    def testSharedTtinfo(self):
+        tz = gettz("Europe/London")
+        other = gettz("Europe/Dublin")
+        gmt = [tti for tti in tz._ttinfo_list if tti.abbr == "GMT"][0]
+        self.assertIn(gmt, other._ttinfo_list)
+        self.assertTrue(any(tti is gmt for tti in other._ttinfo_list))
+
+    def testPickle(self):
+        tz = gettz("America/New_York")
+        copy = pickle.loads(pickle.dumps(tz))
+        self.assertEqual(copy, tz)
+        dt = datetime(2003, 7, 1)
+        self.assertEqual(dt.replace(tzinfo=copy).utcoffset(),
+                         dt.replace(tzinfo=tz).utcoffset())
+
+        tti = tz._ttinfo_list[0]
+        self.assertEqual(pickle.loads(pickle.dumps(tti)), tti)
+        self.assertIsInstance(pickle.loads(pickle.dumps(tti)), _ttinfo)
+
+
+class ZoneInfoFileTest(unittest.TestCase):
+
+    def testLazy(self):
+        zones = ZoneInfoFile(getzoneinfofile_stream()).zones
+        self.assertIn("Europe/London", zones)
+        self.assertNotIn("Europe/Nowhere", zones)
+        self.assertEqual(len(zones), len(list(zones)))
+        self.assertEqual(zones._zones, {})
+
+        tz = zones["Europe/London"]
+        self.assertIs(zones["Europe/London"], tz)
+        # The zone, and the name of the file it is in (the tarball has
+        # Europe/London as a link)
+        self.assertEqual(set(zones._zones), {"Europe/London", "GB-Eire"})
+        self.assertIsNone(zones.get("Europe/Nowhere"))
+        self.assertRaises(KeyError, zones.__getitem__, "Europe/Nowhere")
+
+    def testLinks(self):
+        zones = ZoneInfoFile(getzoneinfofile_stream()).zones
+        link = zones["GB"]
+        self.assertIs(zones["Europe/London"], link)
+        self.assertIs(zones["GB-Eire"], link)
+        self.assertEqual(link._filename, "GB-Eire")
+
+    def testUncompressed(self):
+        data = gzip.decompress(getzoneinfofile_stream().read())
+        plain = ZoneInfoFile(BytesIO(data))
+        zones = ZoneInfoFile(getzoneinfofile_stream())
+        self.assertEqual(sorted(plain.zones), sorted(zones.zones))
+        self.assertEqual(plain.zones["Asia/Tokyo"], zones.zones["Asia/Tokyo"])
+        self.assertEqual(plain.metadata, zones.metadata)
+
+
+class FlatZoneInfoFileTest(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.filename = os.path.join(tmpdir, "zoneinfo.db")
+        # Of the bundled tarball
+        flatten(target=self.filename)
+        self.tar = ZoneInfoFile(getzoneinfofile_stream())
+
+    def assertSameZones(self, flat):
+        self.assertEqual(sorted(flat.zones), sorted(self.tar.zones))
+        self.assertEqual(flat.metadata, self.tar.metadata)
+        for name in ("Europe/London", "Asia/Tokyo", "America/New_York",
+                     "UTC"):
+            self.assertEqual(flat.zones[name], self.tar.zones[name])
+            self.assertEqual(flat.zones[name]._filename,
+                             self.tar.zones[name]._filename)
+
+    def testMapped(self):
+        with open(self.filename, "rb") as f:
+            flat = ZoneInfoFile(f)
+        # Still readable once the file is closed
+        self.assertSameZones(flat)
+        self.assertIsInstance(flat.zones._files["Europe/Paris"], memoryview)
+
+    def testStream(self):
+        with open(self.filename, "rb") as f:
+            flat = ZoneInfoFile(BytesIO(f.read()))
+        self.assertSameZones(flat)
+
+    def testLinks(self):
+        with open(self.filename, "rb") as f:
+            zones = ZoneInfoFile(f).zones
+        self.assertIs(zones["GB"], zones["Europe/London"])
+        self.assertIs(zones["GB-Eire"], zones["Europe/London"])
+        self.assertEqual(zones["GB"]._filename, "GB-Eire")
+        self.assertNotIn("METADATA", zones)
+
+    def testOpen(self):
+        import europarse.zoneinfo as zoneinfo
+
+        # An absolute name of the database, which stands in for the
+        # bundled one
+        self.addCleanup(setattr, zoneinfo, "ZONEDBFILENAME",
+                        zoneinfo.ZONEDBFILENAME)
+        zoneinfo.ZONEDBFILENAME = self.filename
+        with closing(zoneinfo.getzoneinfofile()) as zonefile:
+            self.assertEqual(zonefile.name, self.filename)
+
+        # One written from another tarball, which the bundled one replaced
+        with open(self.filename, "r+b") as f:
+            f.seek(16)
+            f.write(b"\x00\x00\x00\x00")
+        with closing(zoneinfo.getzoneinfofile()) as zonefile:
+            self.assertIsInstance(zonefile, BytesIO)
+            self.assertSameZones(ZoneInfoFile(zonefile))
+
+        zoneinfo.ZONEDBFILENAME = self.filename + ".missing"
+        with closing(zoneinfo.getzoneinfofile()) as zonefile:
+            self.assertIsInstance(zonefile, BytesIO)
+
+    def testVersion(self):
+        with open(self.filename, "rb") as f:
+            data = bytearray(f.read())
+        data[5] = 99
+        self.assertRaises(ValueError, ZoneInfoFile, BytesIO(bytes(data)))
@@ -7,8 +7,10 @@ environment string (in all known formats), given ranges (with help from
 relative deltas), local machine timezone, fixed offset timezone, and UTC
 timezone.
 """
+import bisect
 import datetime
 import struct
+from array import array
 import time
 import sys
 import os
@@ -24,6 +26,10 @@ rrule = None
 
 ZERO = datetime.timedelta(0)
 EPOCHORDINAL = datetime.datetime.utcfromtimestamp(0).toordinal()
+_INFINITY = float("inf")
+
+# The ttinfos of the tzfiles read so far, so that equal ones are shared
+_TTINFOS = {}
 
 class tzutc(datetime.tzinfo):
 
@@ -157,6 +163,10 @@ class _ttinfo(object):
         for attr in self.__slots__:
             setattr(self, attr, None)
 
+    def _key(self):
+        return (self.offset, self.delta, self.isdst, self.abbr, self.isstd,
+                self.isgmt)
+
     def __repr__(self):
         l = []
         for attr in self.__slots__:
@@ -218,7 +228,9 @@ class tzfile(datetime.tzinfo):
         # ``standard'' byte order (the high-order  byte
         # of the value is written first).
         try:
-            if fileobj.read(4).decode() != "TZif":
+            # The reads may give bytes, or views of a buffer (see
+            # europarse.zoneinfo), which are copied only where kept
+            if fileobj.read(4) != b"TZif":
                 raise ValueError("magic not found")
 
             fileobj.read(16)
@@ -255,11 +267,8 @@ class tzfile(datetime.tzinfo):
             # time(2)) at which the rules for computing local time
             # change.
 
-            if timecnt:
-                self._trans_list = struct.unpack(">%dl" % timecnt,
-                                                 fileobj.read(timecnt*4))
-            else:
-                self._trans_list = []
+            self._trans_list = array("q", struct.unpack(
+                ">%dl" % timecnt, fileobj.read(timecnt*4)))
 
             # Next come tzh_timecnt one-byte values of type unsigned
             # char; each one tells which of the different types of
@@ -268,11 +277,7 @@ class tzfile(datetime.tzinfo):
             # serve as indices into an array of ttinfo structures that
             # appears next in the file.
 
-            if timecnt:
-                self._trans_idx = struct.unpack(">%dB" % timecnt,
-                                                fileobj.read(timecnt))
-            else:
-                self._trans_idx = []
+            self._trans_idx = bytes(fileobj.read(timecnt))
 
             # Each ttinfo structure is written as a four-byte value
             # for tt_gmtoff  of  type long,  in  a  standard  byte
@@ -290,7 +295,7 @@ class tzfile(datetime.tzinfo):
             for i in range(typecnt):
                 ttinfo.append(struct.unpack(">lbb", fileobj.read(6)))
 
-            abbr = fileobj.read(charcnt).decode()
+            abbr = bytes(fileobj.read(charcnt)).decode()
 
             # Then there are tzh_leapcnt pairs of four-byte
             # values, written in  standard byte  order;  the
@@ -335,8 +340,9 @@ class tzfile(datetime.tzinfo):
             if file_opened_here:
                 fileobj.close()
 
-        # Build ttinfo list
-        self._ttinfo_list = []
+        # Build ttinfo list. Equal ttinfos, which many zones share, are one
+        # object.
+        ttinfo_list = []
         for i in range(typecnt):
             gmtoff, isdst, abbrind = ttinfo[i]
             # Round to full-minutes if that's not the case. Python's
@@ -350,13 +356,14 @@ class tzfile(datetime.tzinfo):
             tti.abbr = abbr[abbrind:abbr.find('\x00', abbrind)]
             tti.isstd = (ttisstdcnt > i and isstd[i] != 0)
             tti.isgmt = (ttisgmtcnt > i and isgmt[i] != 0)
-            self._ttinfo_list.append(tti)
+            ttinfo_list.append(_TTINFOS.setdefault(tti._key(), tti))
+        self._ttinfo_list = tuple(ttinfo_list)
 
-        # Replace ttinfo indexes for ttinfo objects.
-        trans_idx = []
-        for idx in self._trans_idx:
-            trans_idx.append(self._ttinfo_list[idx])
-        self._trans_idx = tuple(trans_idx)
+        # _trans_idx holds the index in _ttinfo_list of the ttinfo of each
+        # transition.
+        if len(self._trans_idx) != timecnt or (
+                timecnt and max(self._trans_idx) >= typecnt):
+            raise ValueError("invalid transition types")
 
         # Set standard, dst, and before ttinfos. before will be
         # used when a given time is before any transitions,
@@ -370,7 +377,7 @@ class tzfile(datetime.tzinfo):
                 self._ttinfo_std = self._ttinfo_first = self._ttinfo_list[0]
             else:
                 for i in range(timecnt-1, -1, -1):
-                    tti = self._trans_idx[i]
+                    tti = ttinfo_list[self._trans_idx[i]]
                     if not self._ttinfo_std and not tti.isdst:
                         self._ttinfo_std = tti
                     elif not self._ttinfo_dst and tti.isdst:
@@ -395,10 +402,13 @@ class tzfile(datetime.tzinfo):
         # isgmt are off, so it should be in wall time. OTOH, it's
         # always in gmt time. Let me know if you have comments
         # about this.
+        # fromutc() looks up the transitions in UTC, as they are in the file.
+        self._trans_list_utc = self._trans_list
+        self._trans_list = array("q", self._trans_list_utc)
+
         laststdoffset = 0
-        self._trans_list = list(self._trans_list)
         for i in range(len(self._trans_list)):
-            tti = self._trans_idx[i]
+            tti = ttinfo_list[self._trans_idx[i]]
             if not tti.isdst:
                 # This is std time.
                 self._trans_list[i] += tti.offset
@@ -406,32 +416,64 @@ class tzfile(datetime.tzinfo):
             else:
                 # This is dst time. Convert to std.
                 self._trans_list[i] += laststdoffset
-        self._trans_list = tuple(self._trans_list)
+
+        # The (start, end, idx) of the interval between transitions the last
+        # lookup fell in; times converted in order mostly fall in it again.
+        self._last_interval = (0, 0, 0)
 
     def _find_ttinfo(self, dt, laststd=0):
         timestamp = ((dt.toordinal() - EPOCHORDINAL) * 86400
                      + dt.hour * 3600
                      + dt.minute * 60
                      + dt.second)
-        idx = 0
-        for trans in self._trans_list:
-            if timestamp < trans:
-                break
-            idx += 1
-        else:
+        # idx is the number of transitions at or before timestamp
+        start, end, idx = self._last_interval
+        if not start <= timestamp < end:
+            trans_list = self._trans_list
+            idx = bisect.bisect_right(trans_list, timestamp)
+            start = trans_list[idx-1] if idx else -_INFINITY
+            end = trans_list[idx] if idx < len(trans_list) else _INFINITY
+            self._last_interval = (start, end, idx)
+
+        if idx == len(self._trans_list):
             return self._ttinfo_std
         if idx == 0:
             return self._ttinfo_before
         if laststd:
             while idx > 0:
-                tti = self._trans_idx[idx-1]
+                tti = self._ttinfo_list[self._trans_idx[idx-1]]
                 if not tti.isdst:
                     return tti
                 idx -= 1
             else:
                 return self._ttinfo_std
         else:
-            return self._trans_idx[idx-1]
+            return self._ttinfo_list[self._trans_idx[idx-1]]
+
+    def fromutc(self, dt):
+        # The generic tzinfo.fromutc() calls utcoffset() and dst(), which
+        # look up wall times; here the UTC time is looked up directly.
+        if not isinstance(dt, datetime.datetime):
+            raise TypeError("fromutc() requires a datetime argument")
+        if dt.tzinfo is not self:
+            raise ValueError("dt.tzinfo is not self")
+
+        if not self._ttinfo_std:
+            return dt
+
+        timestamp = ((dt.toordinal() - EPOCHORDINAL) * 86400
+                     + dt.hour * 3600
+                     + dt.minute * 60
+                     + dt.second)
+        idx = bisect.bisect_right(self._trans_list_utc, timestamp)
+        if idx == len(self._trans_list_utc):
+            tti = self._ttinfo_std
+        elif idx == 0:
+            tti = self._ttinfo_before
+        else:
+            tti = self._ttinfo_list[self._trans_idx[idx-1]]
+
+        return dt + tti.delta
 
     def utcoffset(self, dt):
         if dt is None:
@@ -469,9 +511,13 @@ class tzfile(datetime.tzinfo):
         if not isinstance(other, tzfile):
             return False
         return (self._trans_list == other._trans_list and
-                self._trans_idx == other._trans_idx and
+                self._trans_ttinfos() == other._trans_ttinfos() and
                 self._ttinfo_list == other._ttinfo_list)
 
+    def _trans_ttinfos(self):
+        # The ttinfo of each transition
+        return [self._ttinfo_list[idx] for idx in self._trans_idx]
+
     def __ne__(self, other):
         return not self.__eq__(other)
 
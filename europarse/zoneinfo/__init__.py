@@ -1,16 +1,21 @@
 # -*- coding: utf-8 -*-
+import gzip
 import logging
+import mmap
 import os
+import struct
 import warnings
 import tempfile
 import shutil
 import json
+import zlib
 
 from subprocess import check_call
 from tarfile import TarFile
 from pkgutil import get_data
 from io import BytesIO
 from contextlib import closing
+from collections.abc import Mapping
 
 from europarse.tz import tzfile
 
@@ -19,6 +24,18 @@ __all__ = ["gettz", "gettz_db_metadata", "rebuild"]
 ZONEFILENAME = "europarse-zoneinfo.tar.gz"
 METADATA_FN = 'METADATA'
 
+# The flat zone database rebuild() writes next to the tarball: a header of
+# the magic, format version, number of names, and size and CRC-32 of the
+# tarball it was written from, then a table of an entry for each name in
+# sorted order (the length of the name, the index of the entry of the file
+# it is a link to, or its own, and the offset and size of the file), then
+# the names, and then the files.
+ZONEDBFILENAME = "europarse-zoneinfo.db"
+_FLAT_MAGIC = b"EPZI"
+_FLAT_VERSION = 1
+_FLAT_HEADER = struct.Struct(">4sHHIII")
+_FLAT_ENTRY = struct.Struct(">HHII")
+
 
 class tzfile(tzfile):
     def __reduce__(self):
@@ -33,35 +50,209 @@ def getzoneinfofile_stream():
         return None
 
 
+def getzoneinfofile():
+    """
+    Open the flat zone database, which :class:`ZoneInfoFile` maps into
+    memory, or if there isn't one written from the bundled tarball (e.g. in a
+    zipped package, or once the tarball is updated), the tarball.
+    """
+    tarball = getzoneinfofile_stream()
+    try:
+        zonefile = open(os.path.join(os.path.dirname(__file__),
+                                     ZONEDBFILENAME), "rb")
+    except (IOError, OSError):
+        return tarball
+
+    if tarball is not None:
+        header = zonefile.read(_FLAT_HEADER.size)
+        zonefile.seek(0)
+        if (len(header) != _FLAT_HEADER.size or
+                _FLAT_HEADER.unpack(header)[4:] !=
+                _tarball_stamp(tarball.getvalue())):
+            zonefile.close()
+            return tarball
+
+    return zonefile
+
+
+def _tarball_stamp(data):
+    """
+    The size and CRC-32 of the bytes of a tarball, which the flat zone
+    database written from it records.
+    """
+    return len(data), zlib.crc32(data)
+
+
 class ZoneInfoFile(object):
     def __init__(self, zonefile_stream=None):
         if zonefile_stream is not None:
-            with TarFile.open(fileobj=zonefile_stream, mode='r') as tf:
-                self.zones = {
-                    zf.name: tzfile(tf.extractfile(zf), filename=zf.name)
-                    for zf in tf.getmembers()
-                    if zf.isfile() and zf.name != METADATA_FN
-                }
-                # deal with links: They'll point to their parent object. Less
-                # waste of memory
-                # links = {zl.name: self.zones[zl.linkname]
-                #        for zl in tf.getmembers() if zl.islnk() or zl.issym()}
-                links = dict((zl.name, self.zones[zl.linkname])
-                             for zl in tf.getmembers() if
-                             zl.islnk() or zl.issym())
-                self.zones.update(links)
-                try:
-                    metadata_json = tf.extractfile(tf.getmember(METADATA_FN))
-                    metadata_str = metadata_json.read().decode('UTF-8')
-                    self.metadata = json.loads(metadata_str)
-                except KeyError:
-                    # no metadata in tar file
-                    self.metadata = None
+            if _is_flat(zonefile_stream):
+                files, links, metadata = _read_flat(zonefile_stream)
+            else:
+                files, links, metadata = _read_tarball(zonefile_stream)
+            self.zones = _zonemap(files, links)
+            self.metadata = metadata
         else:
             self.zones = dict()
             self.metadata = None
 
 
+def _is_flat(stream):
+    """
+    Whether the stream is a flat zone database rather than a tarball.
+    """
+    magic = stream.read(len(_FLAT_MAGIC))
+    stream.seek(-len(magic), os.SEEK_CUR)
+    return magic == _FLAT_MAGIC
+
+
+def _read_flat(stream):
+    """
+    Index a flat zone database. A file is mapped into memory, so that the
+    processes reading it share its pages; each zone is a view of the map.
+    Returns the files and links to give :class:`_zonemap`, and the metadata.
+    """
+    try:
+        data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, IOError, OSError, ValueError):
+        # Not a file, e.g. a BytesIO
+        data = stream.read()
+    view = memoryview(data)
+
+    magic, version, _, count, _, _ = _FLAT_HEADER.unpack_from(view)
+    if version != _FLAT_VERSION:
+        raise ValueError("unsupported zone database version %d" % version)
+
+    start = _FLAT_HEADER.size
+    stop = start + _FLAT_ENTRY.size * count
+    entries = list(_FLAT_ENTRY.iter_unpack(view[start:stop]))
+
+    names = []
+    for length, _, _, _ in entries:
+        names.append(str(view[stop:stop + length], "utf-8"))
+        stop += length
+
+    files = {}
+    links = {}
+    metadata = None
+    for i, (name, (_, target, offset, size)) in enumerate(zip(names,
+                                                              entries)):
+        if name == METADATA_FN:
+            metadata = json.loads(str(view[offset:offset + size], "utf-8"))
+        elif target != i:
+            links[name] = names[target]
+        else:
+            files[name] = view[offset:offset + size]
+
+    return files, links, metadata
+
+
+def _read_tarball(stream):
+    """
+    Index a zone tarball. Returns the files and links to give
+    :class:`_zonemap`, and the metadata.
+    """
+    # A gzipped tarball is decompressed at once, rather than a block at a
+    # time as tarfile reads it, and its files are sliced out of the result.
+    data = stream.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+        tarball = data
+    else:
+        tarball = None
+
+    with TarFile.open(fileobj=BytesIO(data), mode='r') as tf:
+        # Only the names of the zones, and the bytes of their files, are
+        # read here; each zone is parsed on first request.
+        files = {}
+        links = {}
+        for zf in tf.getmembers():
+            if zf.isfile() and zf.name != METADATA_FN:
+                if tarball is not None:
+                    files[zf.name] = tarball[zf.offset_data:
+                                             zf.offset_data + zf.size]
+                else:
+                    files[zf.name] = tf.extractfile(zf).read()
+            elif zf.islnk() or zf.issym():
+                links[zf.name] = zf.linkname
+        try:
+            metadata_json = tf.extractfile(tf.getmember(METADATA_FN))
+            metadata_str = metadata_json.read().decode('UTF-8')
+            metadata = json.loads(metadata_str)
+        except KeyError:
+            # no metadata in tar file
+            metadata = None
+
+    return files, links, metadata
+
+
+class _viewfile(object):
+    """
+    A file of the bytes of a zone, as :class:`tzfile` reads it, whose reads
+    are views of those bytes rather than copies.
+    """
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def read(self, size):
+        data = self._view[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data
+
+
+class _zonemap(Mapping):
+    """
+    The zones of a :class:`ZoneInfoFile` by name, each read from the bytes of
+    its file (or a view of them) when it is first looked up. Links (and the
+    zone they point to) give the same object.
+    """
+    def __init__(self, files, links):
+        self._files = files
+        self._zones = {}
+        # The name of the file each link points to, through other links
+        self._targets = dict((name, name) for name in files)
+        for name in links:
+            target = name
+            seen = set()
+            while target in links and target not in seen:
+                seen.add(target)
+                target = links[target]
+            if target in files:
+                self._targets[name] = target
+
+    def __getitem__(self, name):
+        try:
+            return self._zones[name]
+        except KeyError:
+            pass
+
+        target = self._targets[name]
+        zone = self._zones.get(target)
+        if zone is None:
+            data = self._files.get(target)
+            if data is None:
+                # Read by another thread in the meantime
+                zone = self._zones[target]
+            else:
+                zone = tzfile(_viewfile(data), filename=target)
+                zone = self._zones.setdefault(target, zone)
+                # The bytes of the file aren't needed any more
+                self._files.pop(target, None)
+
+        self._zones[name] = zone
+        return zone
+
+    def __iter__(self):
+        return iter(self._targets)
+
+    def __len__(self):
+        return len(self._targets)
+
+    def __contains__(self, name):
+        return name in self._targets
+
+
 # The current API has gettz as a module function, although in fact it taps into
 # a stateful class. So as a workaround for now, without changing the API, we
 # will create a new "global" class instance the first time a user requests a
@@ -71,10 +262,19 @@ class ZoneInfoFile(object):
 _CLASS_ZONE_INSTANCE = list()
 
 
-def gettz(name):
+def _zone_instance():
     if len(_CLASS_ZONE_INSTANCE) == 0:
-        _CLASS_ZONE_INSTANCE.append(ZoneInfoFile(getzoneinfofile_stream()))
-    return _CLASS_ZONE_INSTANCE[0].zones.get(name)
+        zonefile = getzoneinfofile()
+        if zonefile is None:
+            _CLASS_ZONE_INSTANCE.append(ZoneInfoFile())
+        else:
+            with closing(zonefile):
+                _CLASS_ZONE_INSTANCE.append(ZoneInfoFile(zonefile))
+    return _CLASS_ZONE_INSTANCE[0]
+
+
+def gettz(name):
+    return _zone_instance().zones.get(name)
 
 
 def gettz_db_metadata():
@@ -84,8 +284,6 @@ def gettz_db_metadata():
 
     :returns: A dictionary with the database metadata
     """
-    if len(_CLASS_ZONE_INSTANCE) == 0:
-        _CLASS_ZONE_INSTANCE.append(ZoneInfoFile(getzoneinfofile_stream()))
-    return _CLASS_ZONE_INSTANCE[0].metadata
+    return _zone_instance().metadata
 
 
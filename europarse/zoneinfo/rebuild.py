@@ -5,15 +5,23 @@ import shutil
 import json
 from subprocess import check_call
 from tarfile import TarFile
+from io import BytesIO
 
-from europarse.zoneinfo import METADATA_FN, ZONEFILENAME
+from europarse.zoneinfo import (METADATA_FN, ZONEFILENAME, ZONEDBFILENAME,
+                                 _FLAT_MAGIC, _FLAT_VERSION, _FLAT_HEADER,
+                                 _FLAT_ENTRY, _tarball_stamp)
 
 
-def rebuild(filename, tag=None, format="gz", zonegroups=[], metadata=None):
+def rebuild(filename, tag=None, format="gz", zonegroups=[], metadata=None,
+            flat=True):
     """Rebuild the internal timezone info in europarse/zoneinfo/zoneinfo*tar*
 
     filename is the timezone tarball from ftp.iana.org/tz.
 
+    If flat is true, the flat zone database is written from the new tarball
+    too (see flatten()); otherwise any old one is removed, so that it isn't
+    read instead of the tarball.
+
     """
     tmpdir = tempfile.mkdtemp()
     zonedir = os.path.join(tmpdir, "zoneinfo")
@@ -39,6 +47,89 @@ def rebuild(filename, tag=None, format="gz", zonegroups=[], metadata=None):
     finally:
         shutil.rmtree(tmpdir)
 
+    if flat:
+        flatten(target)
+    else:
+        try:
+            os.remove(os.path.join(moduledir, ZONEDBFILENAME))
+        except OSError:
+            pass
+
+
+def flatten(filename=None, target=None):
+    """Write the flat zone database of a zoneinfo tarball
+
+    filename is the tarball, by default europarse/zoneinfo/zoneinfo*tar*, and
+    target the file to write, by default europarse/zoneinfo/zoneinfo*db
+    beside it. The database holds the same files, which ZoneInfoFile maps
+    into memory rather than decompressing, and the size and CRC-32 of the
+    tarball, which it is only read instead of if they match.
+
+    """
+    moduledir = os.path.dirname(__file__)
+    if filename is None:
+        filename = os.path.join(moduledir, ZONEFILENAME)
+    if target is None:
+        target = os.path.join(moduledir, ZONEDBFILENAME)
+
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    files = {}
+    links = {}
+    with TarFile.open(fileobj=BytesIO(data)) as tf:
+        for zf in tf.getmembers():
+            if zf.isfile():
+                files[zf.name] = tf.extractfile(zf).read()
+            elif zf.islnk() or zf.issym():
+                links[zf.name] = zf.linkname
+
+    # Each link points straight at the entry of its file
+    targets = dict((name, name) for name in files)
+    for name in links:
+        linkname = name
+        seen = set()
+        while linkname in links and linkname not in seen:
+            seen.add(linkname)
+            linkname = links[linkname]
+        if linkname in files:
+            targets[name] = linkname
+
+    names = sorted(targets)
+    index = dict((name, i) for i, name in enumerate(names))
+    encoded = [name.encode("utf-8") for name in names]
+
+    offset = (_FLAT_HEADER.size + _FLAT_ENTRY.size * len(names) +
+              sum(len(name) for name in encoded))
+    offsets = {}
+    blobs = []
+    for name in names:
+        if targets[name] == name:
+            offsets[name] = offset
+            blobs.append(files[name])
+            offset += len(files[name])
+
+    chunks = [_FLAT_HEADER.pack(_FLAT_MAGIC, _FLAT_VERSION, 0, len(names),
+                                *_tarball_stamp(data))]
+    for name, name_bytes in zip(names, encoded):
+        filename = targets[name]
+        chunks.append(_FLAT_ENTRY.pack(len(name_bytes), index[filename],
+                                       offsets[filename],
+                                       len(files[filename])))
+    chunks.extend(encoded)
+    chunks.extend(blobs)
+
+    # Replaced at once, as other processes may have the old one mapped
+    fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(target) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(chunks)
+        os.chmod(tmpname, 0o644)
+        os.replace(tmpname, target)
+    except BaseException:
+        os.remove(tmpname)
+        raise
+
 def _print_on_nosuchfile(e):
     """Print helpful troubleshooting message
 
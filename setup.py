@@ -5,6 +5,7 @@ import os
 import re
 
 from setuptools import setup
+from setuptools.command.build_py import build_py
 
 
 if isfile("MANIFEST"):
@@ -17,6 +18,23 @@ VERSION = re.search('__version__ = "([^"]+)"',
                                 encoding='utf-8').read()).group(1)
 
 
+class build_py_zonedb(build_py):
+    """
+    Also writes the flat zone database europarse.zoneinfo reads, from the
+    bundled tarball.
+    """
+    def run(self):
+        build_py.run(self)
+        if self.dry_run:
+            return
+
+        from europarse.zoneinfo import ZONEFILENAME, ZONEDBFILENAME
+        from europarse.zoneinfo.rebuild import flatten
+        flatten(os.path.join(TOPDIR, "europarse", "zoneinfo", ZONEFILENAME),
+                os.path.join(self.build_lib, "europarse", "zoneinfo",
+                             ZONEDBFILENAME))
+
+
 setup(name="europarse",
     version=VERSION,
     description="dateutil.parser, but not broken",
@@ -30,6 +48,8 @@ A fork of dateutil.parser from before it broke the semantics of the
 """,
     packages=["europarse", "europarse.zoneinfo", "europarse.tz"],
     package_data={"europarse.zoneinfo": ["europarse-zoneinfo.tar.gz"]},
+    cmdclass={"build_py": build_py_zonedb},
+    extras_require={"numpy": ["numpy"]},
     zip_safe=True,
     classifiers=[
         'Development Status :: 5 - Production/Stable',